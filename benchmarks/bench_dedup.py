@@ -0,0 +1,57 @@
+"""
+time of the cross-site deduplication of merged search results
+
+every posting is listed a second time under another site with a company
+suffix, different casing and a slightly edited description, so half of
+the rows are expected to be merged away.
+
+    python benchmarks/bench_dedup.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+
+from career_finder_app.jobspymodule.dedup import deduplicate_jobs
+from fixtures import make_jobs_frame
+
+SIZES = [100, 1000, 5000, 20000]
+
+
+def make_duplicated_frame(rows):
+    """
+    build rows unique postings plus an edited copy of each from another site
+
+    :param rows: number of unique postings
+    :return: dataframe of 2 * rows jobs
+    """
+    original = make_jobs_frame(rows, description_words=200)
+    # unique company per posting, the fixture only has a few
+    original["company"] = original["company"] + " " + original.index.astype(str)
+
+    copy = original.copy()
+    copy["site"] = "linkedin"
+    copy["job_url"] = "https://linkedin.example/jobs/" + copy.index.astype(str)
+    copy["company"] = copy["company"].str.upper() + " GmbH"
+    copy["title"] = copy["title"] + " (m/w/d)"
+    copy["description"] = copy["description"].str.rsplit(" ", n=5).str[0]
+    return pd.concat([original, copy], ignore_index=True)
+
+
+def main():
+    print(f"{'rows':>8} {'kept':>8} {'dedup ms':>10}")
+    for rows in SIZES:
+        df = make_duplicated_frame(rows)
+
+        started = time.perf_counter()
+        result = deduplicate_jobs(df)
+        elapsed = time.perf_counter() - started
+
+        print(f"{len(df):>8} {len(result):>8} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
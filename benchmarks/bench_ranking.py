@@ -0,0 +1,33 @@
+"""
+time of ranking search results against keywords and a sample letter
+
+    python benchmarks/bench_ranking.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from career_finder_app.jobspymodule.ranking import rank_jobs
+from fixtures import WORDS, make_jobs_frame
+
+SIZES = [100, 1000, 5000]
+KEYWORDS = ["python", "machine learning", "kubernetes"]
+SAMPLE_LETTER = " ".join(WORDS * 10)
+
+
+def main():
+    print(f"{'rows':>8} {'rank ms':>10}")
+    for rows in SIZES:
+        df = make_jobs_frame(rows)
+
+        started = time.perf_counter()
+        rank_jobs(df, KEYWORDS, SAMPLE_LETTER, rerank_model="")
+        elapsed = time.perf_counter() - started
+
+        print(f"{rows:>8} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+time and memory of building the ResultScreen job list
+
+run from the repository root, on a machine without a display use the
+offscreen SDL driver:
+
+    SDL_VIDEODRIVER=offscreen python benchmarks/bench_resultlist.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivymd.app import MDApp
+from kivymd.uix.screenmanager import MDScreenManager
+
+from career_finder_app.jobspymodule.jobrecords import records_from_frame
+from career_finder_app.ui.resultscreen import ResultScreen
+from fixtures import make_jobs_frame
+
+SIZES = [10, 100, 1000, 10000]
+
+
+def build_list(screen, df):
+    """
+    show df in the result list and lay out the first frame
+
+    :param screen: ResultScreen
+    :param df: jobs dataframe
+    """
+    screen.jobs = records_from_frame(df)
+    screen.display_table()
+    # two ticks: data refresh, then view layout
+    Clock.tick()
+    Clock.tick()
+
+
+def main():
+    app = MDApp()
+    sm = MDScreenManager()
+    screen = ResultScreen(name="result")
+    sm.add_widget(screen)
+    Window.add_widget(sm)
+    Clock.tick()
+
+    print(f"{'rows':>8} {'build ms':>10} {'peak KiB':>10} {'views':>6} {'frame KiB':>10} {'held KiB':>9}")
+    for rows in SIZES:
+        df = make_jobs_frame(rows, description_words=400)
+
+        started = time.perf_counter()
+        build_list(screen, df)
+        elapsed = time.perf_counter() - started
+
+        # separate pass, tracemalloc slows down allocation heavy code a lot
+        tracemalloc.start()
+        build_list(screen, df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # what the screen keeps per listed job, against the scraped frame
+        tracemalloc.start()
+        records = records_from_frame(df)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+        frame = df.memory_usage(deep=True).sum()
+
+        views = len(screen.rv.layout_manager.children)
+        print(
+            f"{rows:>8} {elapsed * 1000:>10.1f} {peak / 1024:>10.0f} {views:>6}"
+            f" {frame / 1024:>10.0f} {held / 1024:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
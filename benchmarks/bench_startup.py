@@ -0,0 +1,107 @@
+"""
+cold start time of the app
+
+reports the slowest imports of career_finder_app.mainapp from
+python -X importtime and the time from process start to the first frame.
+Run from the repository root:
+
+    python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+FIRST_FRAME_SCRIPT = """
+from kivy.core.window import Window
+from career_finder_app.mainapp import MyApp
+
+app = MyApp()
+
+def on_flip(window):
+    print("first-frame", flush=True)
+    Window.unbind(on_flip=on_flip)
+    app.stop()
+
+Window.bind(on_flip=on_flip)
+app.run()
+"""
+
+
+def child_env():
+    """
+    environment for the measured interpreter
+
+    :return: environment dict
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC + os.pathsep + env.get("PYTHONPATH", "")
+    env.setdefault("KIVY_NO_ARGS", "1")
+    env.setdefault("KIVY_LOG_MODE", "PYTHON")
+    return env
+
+
+def import_times(top=15):
+    """
+    cumulative import times of mainapp
+
+    :param top: number of slowest imports to return
+    :return: (total seconds, list of (seconds, module))
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import career_finder_app.mainapp"],
+        env=child_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # nested imports are indented below the single separating space
+        times.append((int(cumulative) / 1e6, module[1:].rstrip()))
+
+    total = sum(t for t, module in times if not module.startswith(" "))
+    return total, sorted(times, reverse=True)[:top]
+
+
+def time_to_first_frame():
+    """
+    seconds from starting the interpreter to the first drawn frame
+
+    :return: seconds
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT],
+        env=child_env(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+    for line in process.stdout:
+        if line.strip() == "first-frame":
+            elapsed = time.perf_counter() - started
+            break
+    else:
+        raise RuntimeError("app exited before drawing a frame")
+    process.wait()
+    return elapsed
+
+
+def main():
+    total, slowest = import_times()
+    print(f"import career_finder_app.mainapp: {total:.3f} s")
+    for seconds, module in slowest:
+        print(f"  {seconds:8.3f} s {module}")
+
+    print(f"time to first frame: {time_to_first_frame():.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import os
+import random
+
+import pandas as pd
+
+from career_finder_app.jobspymodule import COLUMNS
+
+SITES = ["indeed", "linkedin", "google"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer", "DevOps Engineer"]
+LOCATIONS = ["Berlin, Germany", "Vienna, Austria", "Zurich, Switzerland", "Munich, Germany"]
+WORDS = (
+    "python machine learning scalable services team experience cloud kubernetes "
+    "requirements responsibilities benefits equal opportunity employer data pipelines "
+    "design review testing communication english german remote hybrid office"
+).split()
+# distinct words of the synthetic descriptions, real postings use about as many
+VOCABULARY_SIZE = 20000
+
+
+def make_vocabulary(size=VOCABULARY_SIZE, seed=0):
+    """
+    WORDS followed by made up words, in order of frequency
+
+    :param size: number of distinct words
+    :param seed: random seed
+    :return: list of words
+    """
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = dict.fromkeys(WORDS)
+    while len(words) < size:
+        words["".join(rng.choice(letters) for _ in range(rng.randint(3, 12)))] = None
+    return list(words)
+
+
+def random_words(rng, count, vocabulary):
+    """
+    words drawn with zipf frequencies, a few common words and a long tail
+
+    :param rng: random.Random
+    :param count: number of words
+    :param vocabulary: make_vocabulary result
+    :return: list of words
+    """
+    weights = _zipf_weights(len(vocabulary))
+    return rng.choices(vocabulary, cum_weights=weights, k=count)
+
+
+def _zipf_weights(size, _cache={}):
+    """
+    cumulative zipf weights of size ranks
+
+    :param size: number of ranks
+    :return: list of cumulative weights
+    """
+    if size not in _cache:
+        total = 0.0
+        weights = []
+        for rank in range(1, size + 1):
+            total += 1 / rank
+            weights.append(total)
+        _cache[size] = weights
+    return _cache[size]
+
+
+def make_jobs_frame(rows, seed=0, description_words=400, vocabulary_size=VOCABULARY_SIZE):
+    """
+    build a dataframe shaped like get_jobs output
+
+    :param rows: number of jobs
+    :param seed: random seed
+    :param description_words: words per description
+    :param vocabulary_size: distinct words of the descriptions
+    :return: dataframe with COLUMNS
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(vocabulary_size)
+    records = []
+    for i in range(rows):
+        site = SITES[i % len(SITES)]
+        records.append({
+            "id": f"{site}-{i}",
+            "site": site,
+            "job_url": f"https://{site}.example/jobs/{i}",
+            "job_url_direct": f"https://careers.example/{i}",
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "date_posted": pd.Timestamp("2025-01-01") + pd.Timedelta(hours=i),
+            "job_type": "fulltime",
+            "description": " ".join(random_words(rng, description_words, vocabulary)),
+        })
+    return pd.DataFrame(records, columns=COLUMNS)
+
+
+def make_description(words, seed=0):
+    """
+    markdown job description with the usual sections and boilerplate
+
+    :param words: approximate number of words
+    :param seed: random seed
+    :return: description string
+    """
+    rng = random.Random(seed)
+    headings = ["**About Us**", "**Your Responsibilities:**", "**Requirements**", "**What we offer**", "**Equal Opportunity**"]
+    per_section = max(1, words // len(headings))
+    sections = []
+    for heading in headings:
+        lines = [
+            "- " + " ".join(rng.choice(WORDS) for _ in range(10))
+            for _ in range(max(1, per_section // 10))
+        ]
+        sections.append(heading + "\n" + "\n".join(lines))
+    return "\n\n".join(sections)
+
+
+# recorded scrape_jobs results, written by record_fixtures.py
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded")
+
+# scrape_jobs columns the app drops again, kept so replays carry their weight
+RAW_EXTRA_COLUMNS = {
+    "salary_source": None,
+    "interval": "yearly",
+    "min_amount": 50000.0,
+    "max_amount": 80000.0,
+    "currency": "EUR",
+    "is_remote": False,
+    "job_level": "mid-senior level",
+    "job_function": "Engineering",
+    "listing_type": None,
+    "emails": None,
+    "company_industry": "Software Development",
+    "company_url": "https://company.example",
+    "company_logo": "https://company.example/logo.png",
+    "company_url_direct": None,
+    "company_addresses": None,
+    "company_num_employees": "51-200",
+    "company_revenue": None,
+    "company_description": "We build software. " * 20,
+    "skills": None,
+    "experience_range": None,
+    "company_rating": None,
+    "company_reviews_count": None,
+    "vacancy_count": None,
+    "work_from_home_type": None,
+}
+
+
+def recorded_path(site, rows):
+    """
+    file of a recorded scrape
+
+    :param site: site name
+    :param rows: number of postings
+    :return: path
+    """
+    return os.path.join(RECORDED_DIR, f"{site}-{rows}.json.gz")
+
+
+def load_scrape(site, rows, seed=0):
+    """
+    scrape_jobs result of one site, recorded if available, else synthetic
+
+    :param site: site name
+    :param rows: number of postings
+    :param seed: random seed of the synthetic frame
+    :return: dataframe shaped like scrape_jobs output
+    """
+    path = recorded_path(site, rows)
+    if os.path.exists(path):
+        return pd.read_json(path, orient="split", compression="gzip")
+
+    df = make_jobs_frame(rows, seed=seed)
+    df["site"] = site
+    df["id"] = site + "-" + df.index.astype(str)
+    df["job_url"] = f"https://{site}.example/jobs/" + df.index.astype(str)
+    for column, value in RAW_EXTRA_COLUMNS.items():
+        df[column] = value
+    return df
+
+
+def save_scrape(df, site, rows):
+    """
+    write a scrape_jobs result for load_scrape
+
+    :param df: scrape_jobs dataframe
+    :param site: site name
+    :param rows: number of postings asked for
+    """
+    os.makedirs(RECORDED_DIR, exist_ok=True)
+    df.to_json(recorded_path(site, rows), orient="split", date_format="iso", compression="gzip")
@@ -0,0 +1,134 @@
+"""
+local stand-in for the chat completions router
+
+answers every POST with a fixed letter after a configurable latency,
+streamed as server-sent events when the payload asks for it. Point the app
+at it with HF_API_URL:
+
+    python benchmarks/mockrouter.py --latency 0.5 --port 8765
+    HF_API_URL=http://127.0.0.1:8765/v1/chat/completions HF_TOKEN=x python src/career_finder_app/mainapp.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LETTER = (
+    "Dear hiring team,\n\nI am a software engineer with experience in Python and "
+    "machine learning and would like to join your team. "
+) * 8 + "\n\nKind regards"
+
+# words per server-sent event
+CHUNK_WORDS = 4
+
+
+class MockRouter(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, token_delay=0.0, letter=LETTER):
+        """
+        chat completions server on localhost
+
+        :param self: object
+        :param port: tcp port, 0 picks a free one
+        :param latency: seconds before the first byte of an answer
+        :param token_delay: seconds between two streamed chunks
+        :param letter: answer text
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.letter = letter
+        self.requests = 0
+
+    @property
+    def url(self):
+        """
+        chat completions url of the server
+
+        :param self: object
+        :return: url string
+        """
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/chat/completions"
+
+    def start(self):
+        """
+        serve on a daemon thread
+
+        :param self: object
+        :return: self
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        stop serving and close the socket
+
+        :param self: object
+        """
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate writes, do not wait for a delayed ack
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        if payload.get("stream"):
+            self._stream()
+            return
+
+        body = json.dumps({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.server.letter}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        words = self.server.letter.split(" ")
+        for start in range(0, len(words), CHUNK_WORDS):
+            text = " ".join(words[start:start + CHUNK_WORDS]) + " "
+            event = {"choices": [{"index": 0, "delta": {"content": text}}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.server.token_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fixed cover letter like the chat completions router.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before an answer starts")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    router = MockRouter(args.port, args.latency, args.token_delay)
+    print(f"Serving on {router.url}")
+    try:
+        router.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
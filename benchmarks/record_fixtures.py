@@ -0,0 +1,41 @@
+"""
+record real scrape_jobs results for the benchmark suite
+
+needs network access, run once from the repository root. suite.py replays
+the recorded frames offline and falls back to synthetic ones for sizes
+that were not recorded.
+
+    python benchmarks/record_fixtures.py --location Germany python
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from career_finder_app.jobspymodule import SITES, _scrape
+from fixtures import save_scrape
+
+SIZES = [20, 100]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record scrape_jobs results for benchmarks/suite.py.")
+    parser.add_argument("keywords", nargs="+", help="keywords, quote keywords with spaces")
+    parser.add_argument("--location", required=True, help="country to search in")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="postings per site to record")
+    args = parser.parse_args(argv)
+
+    for rows in args.sizes:
+        for site in SITES:
+            try:
+                df = _scrape([site], args.location, ", ".join(args.keywords), rows, 0)
+            except Exception as e:
+                print(f"{site} {rows}: failed: {e}")
+                continue
+            save_scrape(df, site, rows)
+            print(f"{site} {rows}: {len(df)} postings recorded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+offline benchmark suite of the search, job list and inference paths
+
+replays scrape_jobs results (recorded by record_fixtures.py, synthetic
+otherwise) through the get_jobs post-processing, dedup and ranking, builds
+the job list and keyword chips in a headless window and sends queries to
+a local mock router. Every case is run until it has both MIN_ROUNDS rounds
+and MIN_TIME seconds, the statistics are written to a JSON file so runs
+can be compared across commits. Run from the repository root:
+
+    SDL_VIDEODRIVER=offscreen python benchmarks/suite.py
+    python benchmarks/suite.py -k dedup -k ranking
+    python benchmarks/suite.py --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_LOG_MODE", "PYTHON")
+os.environ.setdefault("HF_TOKEN", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pandas as pd
+
+from fixtures import load_scrape
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# postings per site of the replayed scrapes
+SIZES = [20, 100, 1000]
+KEYWORD_COUNTS = [5, 20, 50]
+# words of the job descriptions fitted into a prompt
+DESCRIPTION_WORDS = [300, 3000]
+# seconds the mock router waits before answering
+LATENCIES = [0.0, 0.05]
+
+MIN_ROUNDS = 5
+MIN_TIME = 0.5
+# a single slow case is not repeated beyond this
+MAX_TIME = 10
+
+CASES = []
+
+
+def case(group, params=(None,)):
+    """
+    register a benchmark case, run once per parameter
+
+    the case is called with a Benchmark and the parameter and calls the
+    benchmark with the code to time.
+
+    :param group: group name, also matched by -k
+    :param params: parameter values
+    :return: decorator
+    """
+    def register(function):
+        CASES.append((group, function, list(params)))
+        return function
+    return register
+
+
+class Benchmark:
+    def __init__(self, min_rounds=MIN_ROUNDS, min_time=MIN_TIME, max_time=MAX_TIME):
+        """
+        repeated timing of one callable, like the pytest-benchmark fixture
+
+        :param self: object
+        :param min_rounds: rounds run at least
+        :param min_time: seconds run at least
+        :param max_time: seconds after which no further round starts
+        """
+        self.min_rounds = min_rounds
+        self.min_time = min_time
+        self.max_time = max_time
+        self.durations = []
+        self.extra = {}
+
+    def __call__(self, function, *args, **kwargs):
+        """
+        time function(*args, **kwargs) after one warm up call
+
+        :param self: object
+        :param function: callable to time
+        :return: result of the last call
+        """
+        result = function(*args, **kwargs)
+        started = time.perf_counter()
+        while True:
+            round_started = time.perf_counter()
+            result = function(*args, **kwargs)
+            self.durations.append(time.perf_counter() - round_started)
+
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.max_time:
+                break
+            if len(self.durations) >= self.min_rounds and elapsed >= self.min_time:
+                break
+        return result
+
+    def stats(self):
+        """
+        summary of the timed rounds
+
+        :param self: object
+        :return: dict of seconds, rounds and ops per second
+        """
+        durations = sorted(self.durations)
+        quartiles = statistics.quantiles(durations, n=4) if len(durations) > 1 else [durations[0]] * 3
+        mean = statistics.fmean(durations)
+        return {
+            "min": durations[0],
+            "max": durations[-1],
+            "mean": mean,
+            "stddev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+            "median": statistics.median(durations),
+            "iqr": quartiles[2] - quartiles[0],
+            "rounds": len(durations),
+            "ops": 1 / mean if mean else 0.0,
+        }
+
+
+def replay_scrapes(rows):
+    """
+    serve recorded scrapes from jobspy.scrape_jobs
+
+    :param rows: postings per site
+    """
+    import jobspy
+    from career_finder_app.jobspymodule import SITES, siteguard
+
+    frames = {site: load_scrape(site, rows, seed=i) for i, site in enumerate(SITES)}
+
+    def scrape_jobs(site_name, **kwargs):
+        return pd.concat([frames[site] for site in site_name], ignore_index=True)
+
+    jobspy.scrape_jobs = scrape_jobs
+    # replays are not rate limited and leave the app's site state alone
+    siteguard._default_guard = siteguard.SiteGuard(
+        path=os.path.join(tempfile.gettempdir(), "career-finder-bench-sites.json"),
+        rates=dict.fromkeys(SITES, (1e9, 1e9))
+    )
+
+
+def merged_jobs(rows):
+    """
+    replayed scrapes of all sites with the app's columns, before dedup
+
+    :param rows: postings per site
+    :return: dataframe
+    """
+    from career_finder_app.jobspymodule import COLUMNS, SITES
+
+    frames = [load_scrape(site, rows, seed=i) for i, site in enumerate(SITES)]
+    return pd.concat(frames, ignore_index=True).reindex(columns=COLUMNS)
+
+
+@case("get_jobs", SIZES)
+def bench_get_jobs(benchmark, rows):
+    from career_finder_app.jobspymodule import get_jobs
+
+    replay_scrapes(rows)
+    df = benchmark(get_jobs, "Germany", "python", fan_out=False)
+    benchmark.extra["jobs"] = len(df)
+
+
+@case("get_jobs_fan_out", SIZES)
+def bench_get_jobs_fan_out(benchmark, rows):
+    from career_finder_app.jobspymodule import get_jobs
+
+    replay_scrapes(rows)
+    df = benchmark(get_jobs, "Germany", "python", fan_out=True)
+    benchmark.extra["jobs"] = len(df)
+
+
+@case("get_jobs_expanded", SIZES)
+def bench_get_jobs_expanded(benchmark, rows):
+    from career_finder_app.jobspymodule import get_jobs
+
+    # 2 keywords x 3 locations x every site, all replaying the same postings
+    replay_scrapes(rows)
+    df = benchmark(get_jobs, ["Germany", "Austria", "Switzerland"], ["python", "java"])
+    benchmark.extra["jobs"] = len(df)
+
+
+@case("dedup", SIZES)
+def bench_dedup(benchmark, rows):
+    from career_finder_app.jobspymodule.dedup import deduplicate_jobs
+
+    df = benchmark(deduplicate_jobs, merged_jobs(rows))
+    benchmark.extra["jobs"] = len(df)
+
+
+@case("ranking", SIZES)
+def bench_ranking(benchmark, rows):
+    from career_finder_app.jobspymodule.ranking import rank_jobs
+
+    letter = "I am a software engineer with experience in python and machine learning."
+    benchmark(rank_jobs, merged_jobs(rows), ["python", "machine learning"], letter)
+
+
+@case("fit_prompt", DESCRIPTION_WORDS)
+def bench_fit_prompt(benchmark, words):
+    from career_finder_app.aiintegration.huggingfaceinference import MODEL
+    from career_finder_app.aiintegration.promptbuilder import fit_prompt
+    from fixtures import make_description
+
+    description = make_description(words)
+    benchmark(fit_prompt, description, "I am a software engineer with experience in python.", MODEL)
+
+
+@case("display_table", SIZES)
+def bench_display_table(benchmark, rows):
+    from kivy.clock import Clock
+    from career_finder_app.jobspymodule.dedup import deduplicate_jobs
+    from career_finder_app.jobspymodule.jobrecords import records_from_frame
+
+    screen = ui_screen("result")
+    screen.jobs = records_from_frame(deduplicate_jobs(merged_jobs(rows)))
+
+    def build():
+        screen.display_table()
+        # two ticks: data refresh, then view layout
+        Clock.tick()
+        Clock.tick()
+
+    benchmark(build)
+    benchmark.extra["views"] = len(screen.rv.layout_manager.children)
+
+
+@case("show_description", [300, 10000])
+def bench_show_description(benchmark, words):
+    from kivy.clock import Clock
+    from fixtures import make_description
+
+    screen = ui_screen("result")
+    description = make_description(words)
+
+    def show():
+        screen.show_description(description)
+        Clock.tick()
+        Clock.tick()
+        screen.description_viewer.dismiss()
+
+    benchmark(show)
+    benchmark.extra["views"] = len(screen.description_viewer.rv.layout_manager.children)
+
+
+@case("rebuild_chips", KEYWORD_COUNTS)
+def bench_rebuild_chips(benchmark, count):
+    from kivy.clock import Clock
+
+    screen = ui_screen("form")
+    screen.keywords = [f"keyword {i}" for i in range(count)]
+
+    def rebuild():
+        screen._rebuild_chips()
+        Clock.tick()
+
+    benchmark(rebuild)
+
+
+@case("query", LATENCIES)
+def bench_query(benchmark, latency):
+    from career_finder_app.aiintegration.huggingfaceinference import build_payload, query
+
+    with use_router(latency) as router:
+        benchmark(query, build_payload("job description", "sample letter"))
+        benchmark.extra["requests"] = router.requests
+
+
+@case("stream_chat", LATENCIES)
+def bench_stream_chat(benchmark, latency):
+    from career_finder_app.aiintegration.huggingfaceinference import build_payload, get_client
+
+    def stream():
+        return "".join(get_client().stream_chat(build_payload("job description", "sample letter")))
+
+    with use_router(latency):
+        benchmark(stream)
+
+
+@contextmanager
+def use_router(latency):
+    """
+    point the shared inference client at a mock router for a with block
+
+    :param latency: seconds before the router answers
+    :return: context manager yielding the MockRouter
+    """
+    from career_finder_app.aiintegration import huggingfaceinference
+    from mockrouter import MockRouter
+
+    router = MockRouter(latency=latency).start()
+    url = huggingfaceinference.API_URL
+    huggingfaceinference.API_URL = router.url
+    huggingfaceinference._client = None
+    try:
+        yield router
+    finally:
+        huggingfaceinference.get_client().close()
+        huggingfaceinference._client = None
+        huggingfaceinference.API_URL = url
+        router.stop()
+
+
+_ui = {}
+
+
+def ui_screen(name):
+    """
+    app screen shown in a headless window, built on first use
+
+    :param name: "form" or "result"
+    :return: screen
+    """
+    from kivy.clock import Clock
+
+    if "manager" not in _ui:
+        from kivy.core.window import Window
+        from kivy.uix.screenmanager import NoTransition
+        from kivymd.app import MDApp
+        from kivymd.uix.screenmanager import MDScreenManager
+
+        # theme_cls of the widgets needs an app instance
+        _ui["app"] = MDApp()
+        _ui["manager"] = MDScreenManager(transition=NoTransition())
+        Window.add_widget(_ui["manager"])
+
+    sm = _ui["manager"]
+    if not sm.has_screen(name):
+        if name == "form":
+            from career_finder_app.ui.formscreen import FormScreen as Screen
+        else:
+            from career_finder_app.ui.resultscreen import ResultScreen as Screen
+        sm.add_widget(Screen(name=name))
+
+    # only the measured screen is laid out and drawn
+    sm.current = name
+    Clock.tick()
+    return sm.get_screen(name)
+
+
+def case_name(function, param):
+    """
+    name of a case run, like the pytest parametrize ids
+
+    :param function: case function
+    :param param: parameter value or None
+    :return: string
+    """
+    return function.__name__ if param is None else f"{function.__name__}[{param}]"
+
+
+def git_commit():
+    """
+    commit of the working tree
+
+    :return: dict with id and dirty
+    """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"id": None, "dirty": None}
+    return {"id": commit, "dirty": dirty}
+
+
+def compare(results, path):
+    """
+    print the median change of every case found in an earlier run
+
+    :param results: list of result dicts of this run
+    :param path: json file of the earlier run
+    """
+    with open(path, encoding="utf-8") as f:
+        earlier = {b["fullname"]: b["stats"]["median"] for b in json.load(f)["benchmarks"]}
+
+    print(f"\n{'case':<40} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for result in results:
+        before = earlier.get(result["fullname"])
+        if before is None:
+            continue
+        after = result["stats"]["median"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{result['fullname']:<40} {before * 1000:>10.2f} {after * 1000:>10.2f} {change:>+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("-k", dest="filters", action="append", help="only cases whose name contains this, repeatable")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds each case runs at least")
+    parser.add_argument("-o", "--output", help="result file, defaults to a new file in benchmarks/results")
+    parser.add_argument("--compare", help="earlier result file to compare medians with")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        action="append",
+        help=f"mock router latency in seconds, repeatable (default {' '.join(map(str, LATENCIES))})"
+    )
+    args = parser.parse_args(argv)
+    if args.latency:
+        params_of = {"query": args.latency, "stream_chat": args.latency}
+    else:
+        params_of = {}
+
+    commit = git_commit()
+    results = []
+    print(f"{'case':<40} {'median ms':>10} {'min ms':>10} {'stddev':>8} {'rounds':>7}")
+    runs = [
+        (group, function, param)
+        for group, function, params in CASES
+        for param in params_of.get(group, params)
+    ]
+    for group, function, param in runs:
+        name = case_name(function, param)
+        if args.filters and not any(f in name or f == group for f in args.filters):
+            continue
+
+        benchmark = Benchmark(args.min_rounds, args.min_time)
+        try:
+            function(benchmark, param)
+        except Exception as e:
+            print(f"{name:<40} failed: {e}")
+            continue
+
+        stats = benchmark.stats()
+        results.append({
+            "group": group,
+            "name": name,
+            "fullname": f"{group}::{name}",
+            "param": param,
+            "stats": stats,
+            "extra_info": benchmark.extra,
+        })
+        print(
+            f"{name:<40} {stats['median'] * 1000:>10.2f} {stats['min'] * 1000:>10.2f}"
+            f" {stats['stddev'] * 1000:>8.2f} {stats['rounds']:>7}"
+        )
+
+    now = datetime.now(timezone.utc)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{now:%Y%m%d-%H%M%S}-{(commit['id'] or 'unknown')[:8]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "machine_info": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+            },
+            "commit_info": commit,
+            "datetime": now.isoformat(),
+            "benchmarks": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
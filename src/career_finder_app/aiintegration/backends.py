@@ -0,0 +1,337 @@
+import os
+from abc import ABC, abstractmethod
+from threading import Event, Lock, Thread
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "router" sends letters to the Hugging Face router, "local" runs a small
+# model on this machine so job descriptions never leave it
+BACKEND = os.environ.get("CAREER_FINDER_BACKEND", "router")
+# router model, kept here so choosing a backend imports no client code
+MODEL = "ServiceNow-AI/Apriel-1.6-15b-Thinker:together"
+LOCAL_MODEL = os.environ.get("CAREER_FINDER_LOCAL_MODEL", "Qwen/Qwen2.5-0.5B-Instruct")
+LOCAL_QUANTIZE = os.environ.get("CAREER_FINDER_LOCAL_QUANTIZE", "0") == "1"
+LOCAL_MAX_NEW_TOKENS = int(os.environ.get("CAREER_FINDER_LOCAL_MAX_NEW_TOKENS", 700))
+
+_backend = None
+_backend_lock = Lock()
+
+
+class CoverLetterBackend(ABC):
+    model = ""
+
+    def warm_up(self):
+        """
+        prepare the backend ahead of the first generation, must not block
+
+        :param self: object
+        """
+
+    @abstractmethod
+    def complete(self, payload):
+        """
+        run a chat completion
+
+        :param self: object
+        :param payload: chat completion payload dict
+        :return: generated text
+        """
+
+    @abstractmethod
+    def stream(self, payload):
+        """
+        run a streamed chat completion
+
+        :param self: object
+        :param payload: chat completion payload dict
+        :return: stream of text chunks with close() and completed
+        """
+
+
+class RouterBackend(CoverLetterBackend):
+    def __init__(self, model):
+        """
+        generation through the Hugging Face router
+
+        :param self: object
+        :param model: router model id
+        """
+        self.model = model
+
+    def complete(self, payload):
+        from career_finder_app.aiintegration.huggingfaceinference import query
+
+        response = query(payload)
+        return response["choices"][0]["message"]["content"]
+
+    def stream(self, payload):
+        from career_finder_app.aiintegration.huggingfaceinference import get_client
+
+        return get_client().stream_chat(payload)
+
+
+class LocalBackend(CoverLetterBackend):
+    def __init__(self, model=LOCAL_MODEL, quantize=LOCAL_QUANTIZE, max_new_tokens=LOCAL_MAX_NEW_TOKENS):
+        """
+        generation with a local transformers model on the CPU
+
+        the model is loaded once on a background thread and shared by all
+        generations, which run one at a time with the kv cache enabled.
+        quantize applies int8 dynamic quantization to the linear layers.
+
+        :param self: object
+        :param model: model id or path
+        :param quantize: quantize linear layers to int8
+        :param max_new_tokens: generation length limit
+        """
+        self.model = model
+        self.quantize = quantize
+        self.max_new_tokens = max_new_tokens
+        self._tokenizer = None
+        self._model = None
+        self._load_error = None
+        self._loading = False
+        self._loaded = Event()
+        self._load_lock = Lock()
+        self._generate_lock = Lock()
+
+    def warm_up(self):
+        """
+        start loading the model on a background thread
+
+        :param self: object
+        """
+        with self._load_lock:
+            if self._loading:
+                return
+            self._loading = True
+        Thread(target=self._load, name="local-model-load", daemon=True).start()
+
+    def _load(self):
+        """
+        load tokenizer and model, runs on the warm-up thread
+
+        :param self: object
+        """
+        try:
+            import torch
+            from transformers import AutoModelForCausalLM, AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(self.model)
+            model = AutoModelForCausalLM.from_pretrained(self.model)
+            model.eval()
+            if self.quantize:
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            self._tokenizer = tokenizer
+            self._model = model
+        except Exception as e:
+            self._load_error = e
+        finally:
+            self._loaded.set()
+
+    def _ensure_loaded(self):
+        """
+        wait for the model, loading it now if warm_up was not called
+
+        :param self: object
+        """
+        self.warm_up()
+        self._loaded.wait()
+        if self._load_error is not None:
+            raise RuntimeError(f"Local model {self.model} failed to load: {self._load_error}")
+
+    def _inputs(self, payload):
+        """
+        tokenize the payload messages with the model's chat template
+
+        :param self: object
+        :param payload: chat completion payload dict
+        :return: dict of input tensors
+        """
+        messages = [
+            {"role": message["role"], "content": _message_text(message["content"])}
+            for message in payload["messages"]
+        ]
+        return self._tokenizer.apply_chat_template(
+            messages,
+            add_generation_prompt=True,
+            return_tensors="pt",
+            return_dict=True
+        )
+
+    def _generate(self, payload, **kwargs):
+        """
+        run model.generate, one generation at a time
+
+        :param self: object
+        :param payload: chat completion payload dict
+        :param kwargs: additional generate arguments
+        :return: (prompt length, generated token ids including the prompt)
+        """
+        import torch
+
+        inputs = self._inputs(payload)
+        with self._generate_lock, torch.inference_mode():
+            output = self._model.generate(
+                **inputs,
+                max_new_tokens=self.max_new_tokens,
+                do_sample=False,
+                use_cache=True,
+                **kwargs
+            )
+        return inputs["input_ids"].shape[1], output
+
+    def complete(self, payload):
+        self._ensure_loaded()
+        prompt_length, output = self._generate(payload)
+        return self._tokenizer.decode(output[0][prompt_length:], skip_special_tokens=True)
+
+    def stream(self, payload):
+        self._ensure_loaded()
+        return LocalStream(self, payload)
+
+
+class LocalStream:
+    def __init__(self, backend, payload):
+        """
+        text chunks of a local generation running on a worker thread
+
+        :param self: object
+        :param backend: loaded LocalBackend
+        :param payload: chat completion payload dict
+        """
+        from transformers import TextIteratorStreamer
+
+        self.closed = False
+        self.completed = False
+        self._error = None
+        self._stop = Event()
+        self._streamer = TextIteratorStreamer(
+            backend._tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        Thread(
+            target=self._run,
+            args=(backend, payload),
+            name="local-generate",
+            daemon=True
+        ).start()
+
+    def _run(self, backend, payload):
+        """
+        generate into the streamer, runs on the worker thread
+
+        :param self: object
+        :param backend: loaded LocalBackend
+        :param payload: chat completion payload dict
+        """
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList
+
+        stop = self._stop
+
+        class StopOnClose(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full((input_ids.shape[0],), stop.is_set(), dtype=torch.bool)
+
+        try:
+            backend._generate(
+                payload,
+                streamer=self._streamer,
+                stopping_criteria=StoppingCriteriaList([StopOnClose()])
+            )
+        except Exception as e:
+            self._error = e
+            # unblock the consumer
+            self._streamer.end()
+
+    def __iter__(self):
+        for text in self._streamer:
+            if self.closed:
+                break
+            if text:
+                yield text
+
+        if self._error is not None:
+            raise self._error
+        self.completed = not self.closed
+
+    def close(self):
+        """
+        stop the generation after the current token
+
+        :param self: object
+        """
+        self.closed = True
+        self._stop.set()
+
+
+def _message_text(content):
+    """
+    flatten chat content parts into a plain string
+
+    :param content: string or list of {"type": "text"} parts
+    :return: string
+    """
+    if isinstance(content, str):
+        return content
+    return "\n".join(part.get("text", "") for part in content if part.get("type") == "text")
+
+
+def get_backend():
+    """
+    backend selected by CAREER_FINDER_BACKEND, created on first use
+
+    :return: CoverLetterBackend
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _create_backend(BACKEND)
+        return _backend
+
+
+def set_backend(backend):
+    """
+    replace the shared backend
+
+    :param backend: CoverLetterBackend or backend name
+    """
+    global _backend
+    if isinstance(backend, str):
+        backend = _create_backend(backend)
+    with _backend_lock:
+        _backend = backend
+
+
+def warm_up():
+    """
+    start preparing the shared backend without blocking
+
+    only the local backend has anything to prepare, the router backend
+    is not created here so startup imports no client code.
+    """
+    with _backend_lock:
+        backend = _backend
+    if backend is None:
+        if BACKEND != "local":
+            return
+        backend = get_backend()
+    backend.warm_up()
+
+
+def _create_backend(name):
+    """
+    create a backend by name
+
+    :param name: "router" or "local"
+    :return: CoverLetterBackend
+    """
+    if name == "local":
+        return LocalBackend()
+    if name == "router":
+        return RouterBackend(MODEL)
+    raise ValueError(f"Unknown cover letter backend: {name}")
@@ -0,0 +1,108 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Event
+
+from platformdirs import user_documents_dir
+
+from career_finder_app.aiintegration.huggingfaceinference import get_modified_coverletter
+
+# letters generated at the same time, CAREER_FINDER_LETTER_CONCURRENCY overrides it
+DEFAULT_CONCURRENCY = int(os.environ.get("CAREER_FINDER_LETTER_CONCURRENCY", 4))
+
+QUEUED = "queued"
+GENERATING = "generating"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def default_output_dir():
+    """
+    new timestamped folder for a batch below the user's documents
+
+    :return: path string
+    """
+    return os.path.join(
+        user_documents_dir(),
+        "CareerFinderApp",
+        "cover_letters",
+        time.strftime("%Y%m%d-%H%M%S")
+    )
+
+
+def letter_filename(index, job):
+    """
+    file name of a job's letter
+
+    :param index: position of the job in the batch
+    :param job: job data dictionary
+    :return: file name string
+    """
+    name = f"{job.get('company', '')} {job.get('title', '')}"
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")[:80] or "job"
+    return f"{index + 1:03d}_{slug}.txt"
+
+
+def generate_letters(jobs, sample_coverletter, folder=None, max_concurrency=DEFAULT_CONCURRENCY, on_progress=None, cancel_event=None, regenerate=False):
+    """
+    generate a tailored letter for every job and write them to a folder
+
+    letters are generated concurrently on a bounded thread pool. on_progress
+    is called from the worker threads as on_progress(index, status, detail)
+    with status QUEUED, GENERATING, DONE (detail is the file path), FAILED
+    (detail is the exception) or SKIPPED after cancel_event was set.
+
+    :param jobs: list of job data dictionaries
+    :param sample_coverletter: user's sample cover letter string
+    :param folder: output folder, defaults to default_output_dir()
+    :param max_concurrency: letters generated at the same time
+    :param on_progress: progress callback or None
+    :param cancel_event: threading.Event that stops jobs not started yet
+    :param regenerate: skip the letter cache
+    :return: list of (status, detail) in job order
+    """
+    folder = folder or default_output_dir()
+    os.makedirs(folder, exist_ok=True)
+    cancel_event = cancel_event or Event()
+    results = [(QUEUED, None)] * len(jobs)
+
+    def report(index, status, detail=None):
+        results[index] = (status, detail)
+        if on_progress:
+            on_progress(index, status, detail)
+
+    def generate(index, job):
+        if cancel_event.is_set():
+            report(index, SKIPPED)
+            return
+
+        report(index, GENERATING)
+        letter = get_modified_coverletter(
+            job.get("description", "") or "",
+            sample_coverletter,
+            regenerate=regenerate
+        )
+        if not letter:
+            raise ValueError("AI service returned no content.")
+
+        path = os.path.join(folder, letter_filename(index, job))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(letter)
+        report(index, DONE, path)
+
+    for index in range(len(jobs)):
+        report(index, QUEUED)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="letter") as pool:
+        futures = {
+            pool.submit(generate, index, job): index
+            for index, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                report(futures[future], FAILED, error)
+
+    return results
@@ -1,43 +1,192 @@
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import os
-import requests
+from threading import Lock
 from dotenv import load_dotenv
 
+from career_finder_app.aiintegration.backends import MODEL, get_backend
+from career_finder_app.aiintegration.inferenceclient import InferenceClient
+from career_finder_app.aiintegration.lettercache import CachedStream, RecordingStream, SharedStream, default_letter_cache
+from career_finder_app.aiintegration.promptbuilder import INSTRUCTION, PROMPT_TOKENS, fit_prompt, tokenizer_name
+from career_finder_app.singleflight import SingleFlight
+from career_finder_app.tracing import span
+
 load_dotenv()
 
-API_URL = "https://router.huggingface.co/v1/chat/completions"
-headers = {
-    "Authorization": f"Bearer {os.environ['HF_TOKEN']}",
-}
+# HF_API_URL can point the app at a local stand-in server
+API_URL = os.environ.get("HF_API_URL", "https://router.huggingface.co/v1/chat/completions")
+
+_client = None
+_client_lock = Lock()
+
+# letters being generated right now, by cache key
+_letters = SingleFlight("letter")
+# letters being streamed right now, by (cache key, regenerate)
+_streams = {}
+_streams_lock = Lock()
+
+def get_client():
+    """
+    shared inference client, created on first use
+
+    :return: InferenceClient
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = InferenceClient(API_URL, os.environ['HF_TOKEN'])
+        return _client
 
 def query(payload):
-    response = requests.post(API_URL, headers=headers, json=payload)
-    return response.json()
+    with span("query"):
+        return get_client().chat(payload)
+
+def build_payload(description, sample_coverletter, model=MODEL, budget=PROMPT_TOKENS):
+    """
+    chat completion payload asking to tailor the sample letter to the job
 
-def get_modified_coverletter(description, sample_coverletter):
-    description = "We need a professional software engineer skilled in Python and machine learning to join our dynamic team. The ideal candidate will have experience in developing scalable applications and a strong understanding of AI technologies."
-    sample_coverletter= "i am a software engineer with experience in python and machine learning..."
-    response = query({
+    the description is cut down to its relevant sections so description
+    and letter fit the token budget, see fit_prompt.
+
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param model: model id of the backend
+    :param budget: tokens for description and letter together
+    :return: payload dict
+    """
+    with span("prompt.fit", chars=len(description or "")):
+        description, sample_coverletter = fit_prompt(description, sample_coverletter, model, budget)
+    return {
         "messages": [
             {
                 "role": "user",
                 "content": [
                     {
                         "type": "text",
-                        "text": "Modify the <sample_coverletter> to better fit the <job_description>. Do not add fluff or unnecessary information. "
+                        "text": INSTRUCTION
                     },
                     {
                         "type": "text",
-                        "text": f"Job Description: {description.strip()}"
+                        "text": f"Job Description: {description}"
                     },
                     {
                         "type": "text",
-                        "text": f"Sample Coverletter: {sample_coverletter.strip()}"
+                        "text": f"Sample Coverletter: {sample_coverletter}"
                     }
                 ]
             }
         ],
-        "model": "ServiceNow-AI/Apriel-1.6-15b-Thinker:together"
-    })
-    return response["choices"][0]["message"]["content"]
+        "model": model
+    }
+
+def letter_request(description, sample_coverletter, model, budget=PROMPT_TOKENS):
+    """
+    everything a generated letter depends on, keys the letter cache
+
+    holds the raw description and letter instead of the fitted prompt,
+    so a cached letter is found without loading the tokenizer.
+
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param model: model id of the backend
+    :param budget: tokens for description and letter together
+    :return: json serializable dict
+    """
+    return {
+        "instruction": INSTRUCTION,
+        "description": description or "",
+        "sample_coverletter": sample_coverletter or "",
+        "model": model,
+        "tokenizer": tokenizer_name(model),
+        "budget": budget,
+    }
+
+def get_modified_coverletter(description, sample_coverletter, regenerate=False):
+    """
+    tailor the sample letter to the job, answered from the letter cache if possible
+
+    the letter is generated by the backend selected with CAREER_FINDER_BACKEND.
+
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param regenerate: skip the cache lookup and generate a new letter
+    :return: cover letter string
+    """
+    backend = get_backend()
+    cache = default_letter_cache()
+    key = cache.make_key(letter_request(description, sample_coverletter, backend.model))
+
+    # a letter for the same prompt that is already being generated is
+    # waited for, e.g. the same job in a batch twice
+    return _letters.do(
+        (key, regenerate),
+        lambda flight: _complete(backend, description, sample_coverletter, cache, key, regenerate)
+    )
+
+def _complete(backend, description, sample_coverletter, cache, key, regenerate):
+    """
+    answer a letter request from the cache or generate it
+
+    :param backend: letter backend
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param cache: letter cache
+    :param key: cache key of the request
+    :param regenerate: skip the cache lookup
+    :return: cover letter string
+    """
+    if not regenerate:
+        cached = cache.lookup(key)
+        if cached is not None:
+            return cached
+
+    payload = build_payload(description, sample_coverletter, model=backend.model)
+    with span("letter.complete", backend=type(backend).__name__):
+        letter = backend.complete(payload)
+    cache.store(key, letter)
+    return letter
+
+def stream_modified_coverletter(description, sample_coverletter, regenerate=False):
+    """
+    stream the tailored cover letter as it is generated
+
+    a cached letter is replayed as a single chunk, a completed stream is
+    stored in the cache.
+
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param regenerate: skip the cache lookup and generate a new letter
+    :return: stream of text chunks, close() stops the generation
+    """
+    backend = get_backend()
+    cache = default_letter_cache()
+    key = cache.make_key(letter_request(description, sample_coverletter, backend.model))
+
+    if not regenerate:
+        cached = cache.lookup(key)
+        if cached is not None:
+            return CachedStream(cached)
+
+    # the same letter asked for while it streams, e.g. a double click on
+    # Generate, reads along instead of starting a second generation
+    flight = (key, regenerate)
+    with _streams_lock:
+        shared = _streams.get(flight)
+        if shared is None or shared.finished:
+            shared = _streams[flight] = SharedStream(
+                lambda: RecordingStream(
+                    backend.stream(build_payload(description, sample_coverletter, model=backend.model)),
+                    lambda letter: cache.store(key, letter)
+                ),
+                on_finish=lambda: _end_stream(flight, shared)
+            )
+        return shared.reader()
+
+def _end_stream(flight, shared):
+    """
+    forget a shared letter stream once it ended
 
+    :param flight: (cache key, regenerate)
+    :param shared: SharedStream
+    """
+    with _streams_lock:
+        if _streams.get(flight) is shared:
+            del _streams[flight]
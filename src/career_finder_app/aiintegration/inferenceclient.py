@@ -0,0 +1,217 @@
+import json
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from career_finder_app.tracing import span
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class InferenceClient:
+    def __init__(self, api_url, token, connect_timeout=5, read_timeout=120, max_retries=3, backoff=1.0, max_backoff=30, max_retry_after=300, pool_size=4):
+        """
+        keep-alive http client for the chat completions endpoint
+
+        one pooled session is reused for every request, so only the first
+        generation pays for the TLS handshake. 429 and 5xx answers and
+        failed connects are retried with exponential backoff. A Retry-After
+        header is waited for in full instead, an answer asking to wait
+        longer than max_retry_after is not retried but raised.
+
+        :param self: object
+        :param api_url: chat completions url
+        :param token: bearer token
+        :param connect_timeout: seconds to establish a connection
+        :param read_timeout: seconds to wait for response data
+        :param max_retries: retries after the first attempt
+        :param backoff: delay before the first retry in seconds, doubled per retry
+        :param max_backoff: upper bound of a single computed delay in seconds
+        :param max_retry_after: longest Retry-After in seconds that is waited for
+        :param pool_size: connections kept alive
+        """
+        self.api_url = api_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def post(self, payload, stream=False):
+        """
+        post a payload, retrying transient failures
+
+        :param self: object
+        :param payload: json payload dict
+        :param stream: stream the response body
+        :return: requests response with a 2xx status
+        """
+        attempt = 0
+        while True:
+            try:
+                # until the response headers, i.e. connection setup and queueing
+                with span("inference.post", stream=stream, attempt=attempt):
+                    response = self.session.post(
+                        self.api_url,
+                        json=payload,
+                        timeout=self.timeout,
+                        stream=stream
+                    )
+            except requests.ConnectionError:
+                # includes connect timeouts, nothing reached the server yet
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = _retry_after(response)
+                if delay is None or delay <= self.max_retry_after:
+                    if delay is None:
+                        delay = self._delay(attempt)
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+            response.raise_for_status()
+            return response
+
+    def chat(self, payload):
+        """
+        run a chat completion
+
+        :param self: object
+        :param payload: chat completion payload dict
+        :return: decoded json response
+        """
+        return self.post(payload).json()
+
+    def stream_chat(self, payload):
+        """
+        run a streamed chat completion
+
+        :param self: object
+        :param payload: chat completion payload dict, "stream" is set to True
+        :return: ChatStream yielding content deltas
+        """
+        response = self.post(dict(payload, stream=True), stream=True)
+        return ChatStream(response)
+
+    def close(self):
+        """
+        close pooled connections
+
+        :param self: object
+        """
+        self.session.close()
+
+    def _delay(self, attempt):
+        """
+        exponential backoff with jitter
+
+        :param self: object
+        :param attempt: number of the failed attempt, starting at 0
+        :return: seconds to wait
+        """
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1)
+
+
+class ChatStream:
+    def __init__(self, response):
+        """
+        content deltas of a server-sent events chat completion
+
+        iterate to receive text chunks as the model produces them, close()
+        may be called from another thread to stop the stream early.
+        completed tells whether the whole answer was received, i.e. the
+        server sent [DONE] or a finish_reason. A connection that just ends
+        leaves it False.
+
+        :param self: object
+        :param response: streamed requests response
+        """
+        self._response = response
+        self.closed = False
+        self.completed = False
+
+    def __iter__(self):
+        """
+        yield content deltas until the stream ends or is closed
+
+        :param self: object
+        :return: generator of text chunks
+        """
+        finished = False
+        try:
+            for line in self._response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    finished = True
+                    break
+
+                choices = json.loads(data).get("choices") or []
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+                if choices[0].get("finish_reason"):
+                    finished = True
+
+            # a stream closed early may also just run out of lines
+            self.completed = finished and not self.closed
+        except Exception:
+            # reading a response closed from another thread fails in
+            # various ways, that is the expected end of a stopped stream
+            if not self.closed:
+                raise
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        stop the stream and release its connection
+
+        :param self: object
+        """
+        self.closed = True
+        self._response.close()
+
+
+def _retry_after(response):
+    """
+    parse the Retry-After header
+
+    :param response: requests response
+    :return: seconds to wait or None
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+from threading import Condition, Lock
+
+from career_finder_app.diskcache import DiskCache, cache_dir
+
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+_default_cache = None
+_default_cache_lock = Lock()
+
+
+class LetterCache:
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        on-disk cache of generated cover letters
+
+        entries are keyed by a hash of the letter request, i.e. model,
+        tokenizer, instruction, job description, sample letter and prompt
+        budget, so any change to one of them is a miss.
+
+        :param self: object
+        :param path: sqlite file, defaults to letters.sqlite3 in the user cache dir
+        :param max_bytes: size bound of the cache file contents
+        """
+        self._store = DiskCache(
+            path or os.path.join(cache_dir(), "letters.sqlite3"),
+            max_bytes
+        )
+
+    @staticmethod
+    def make_key(request):
+        """
+        build the cache key of a letter request
+
+        :param request: request dict, see letter_request
+        :return: key string
+        """
+        raw = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """
+        look up a generated letter
+
+        :param self: object
+        :param key: key from make_key
+        :return: letter string or None
+        """
+        hit = self._store.get(key)
+        return None if hit is None else hit[0]
+
+    def store(self, key, letter):
+        """
+        store a generated letter
+
+        :param self: object
+        :param key: key from make_key
+        :param letter: letter string
+        """
+        if letter:
+            self._store.set(key, letter)
+
+
+def default_letter_cache():
+    """
+    shared letter cache in the user cache dir
+
+    :return: LetterCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LetterCache()
+        return _default_cache
+
+
+class CachedStream:
+    def __init__(self, text):
+        """
+        stream stand-in replaying a cached letter in one chunk
+
+        :param self: object
+        :param text: cached letter string
+        """
+        self.text = text
+        self.completed = True
+
+    def __iter__(self):
+        yield self.text
+
+    def close(self):
+        pass
+
+
+class RecordingStream:
+    def __init__(self, stream, on_complete):
+        """
+        pass a stream through and hand its full text to on_complete
+
+        on_complete is only called if the stream ran to its end, a stopped
+        or failed stream is not recorded.
+
+        :param self: object
+        :param stream: stream of text chunks with close() and completed
+        :param on_complete: callback receiving the full text
+        """
+        self._stream = stream
+        self._on_complete = on_complete
+
+    def __iter__(self):
+        chunks = []
+        for chunk in self._stream:
+            chunks.append(chunk)
+            yield chunk
+
+        if self._stream.completed:
+            self._on_complete("".join(chunks))
+
+    def close(self):
+        self._stream.close()
+
+
+class SharedStream:
+    def __init__(self, open_stream, on_finish=None):
+        """
+        one stream read by several readers, e.g. the same letter asked for twice
+
+        the stream is opened by the first reader that asks for a chunk and
+        pulled by whichever reader is ahead, every reader gets every chunk.
+        It is closed once all readers closed theirs. on_finish is called
+        once when the stream ended, failed or was closed.
+
+        :param self: object
+        :param open_stream: function returning a stream with close() and completed
+        :param on_finish: callback without arguments, or None
+        """
+        self._open_stream = open_stream
+        self._on_finish = on_finish
+        self._stream = None
+        self._iterator = None
+        self._chunks = []
+        self._error = None
+        self._done = False
+        self._pulling = False
+        self._readers = 0
+        self._condition = Condition()
+
+    @property
+    def completed(self):
+        """
+        whether the stream ran to its end
+
+        :param self: object
+        :return: bool
+        """
+        return self._done and self._stream is not None and self._stream.completed
+
+    def reader(self):
+        """
+        new reader starting at the first chunk
+
+        :param self: object
+        :return: SharedStreamReader
+        """
+        with self._condition:
+            self._readers += 1
+        return SharedStreamReader(self)
+
+    def _chunk(self, index):
+        """
+        chunk at index, pulling it from the stream if no reader did yet
+
+        :param self: object
+        :param index: chunk position
+        :return: chunk string, None once the stream ended
+        """
+        with self._condition:
+            while True:
+                if index < len(self._chunks):
+                    return self._chunks[index]
+                if self._error is not None:
+                    raise self._error
+                if self._done:
+                    return None
+                if not self._pulling:
+                    self._pulling = True
+                    break
+                self._condition.wait()
+
+        # pulled outside the lock, the other readers wait for the chunk
+        chunk, error = None, None
+        try:
+            if self._iterator is None:
+                self._stream = self._open_stream()
+                self._iterator = iter(self._stream)
+            chunk = next(self._iterator)
+        except StopIteration:
+            pass
+        except Exception as e:
+            error = e
+
+        finished = False
+        with self._condition:
+            self._pulling = False
+            if chunk is not None:
+                self._chunks.append(chunk)
+            else:
+                self._error = error
+                finished = self._finish()
+            self._condition.notify_all()
+        if finished and self._on_finish:
+            self._on_finish()
+        return self._chunk(index)
+
+    def _close_reader(self):
+        """
+        a reader is done, close the stream when it was the last one
+
+        :param self: object
+        """
+        with self._condition:
+            self._readers -= 1
+            if self._readers > 0 or self._done:
+                return
+            self._finish()
+            self._condition.notify_all()
+        if self._on_finish:
+            self._on_finish()
+        if self._stream is not None:
+            self._stream.close()
+
+    @property
+    def finished(self):
+        """
+        whether the stream ended, failed or was closed
+
+        :param self: object
+        :return: bool
+        """
+        return self._done
+
+    def _finish(self):
+        """
+        mark the stream as ended, hold the lock and call on_finish after releasing it
+
+        :param self: object
+        :return: False if it had ended before
+        """
+        if self._done:
+            return False
+        self._done = True
+        return True
+
+
+class SharedStreamReader:
+    def __init__(self, shared):
+        """
+        one reader of a SharedStream, iterates and closes like a stream
+
+        :param self: object
+        :param shared: SharedStream
+        """
+        self._shared = shared
+        self._closed = False
+
+    @property
+    def completed(self):
+        return self._shared.completed
+
+    def __iter__(self):
+        index = 0
+        try:
+            while not self._closed:
+                chunk = self._shared._chunk(index)
+                if chunk is None:
+                    return
+                index += 1
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._shared._close_reader()
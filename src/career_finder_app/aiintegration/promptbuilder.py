@@ -0,0 +1,251 @@
+import logging
+import os
+import re
+from threading import Lock
+
+# tokens the job description and sample letter may take in a prompt together
+PROMPT_TOKENS = int(os.environ.get("CAREER_FINDER_PROMPT_TOKENS", 1500))
+# share of the budget the sample letter may take before it is cut
+LETTER_SHARE = 0.4
+# tokenizer to count with, defaults to the one of the generating model
+TOKENIZER = os.environ.get("CAREER_FINDER_TOKENIZER", "")
+# characters per token assumed while no tokenizer can be loaded
+CHARS_PER_TOKEN = 4
+
+INSTRUCTION = (
+    "Modify the <sample_coverletter> to better fit the <job_description>. "
+    "Do not add fluff or unnecessary information. "
+)
+
+# section headings, matched case-insensitively against the heading text
+RESPONSIBILITY_HEADINGS = (
+    "responsibilit", "what you'll do", "what you will do", "what you’ll do", "your role",
+    "the role", "role description", "duties", "your tasks", "tasks", "day to day",
+    "day-to-day", "your mission", "aufgaben",
+)
+REQUIREMENT_HEADINGS = (
+    "requirement", "qualification", "what you bring", "what you'll bring", "who you are",
+    "skills", "experience", "must have", "must-have", "nice to have", "nice-to-have",
+    "your profile", "profile", "looking for", "you have", "you are", "about you", "ihr profil",
+    "dein profil", "anforderungen",
+)
+BOILERPLATE_HEADINGS = (
+    "benefit", "perks", "what we offer", "we offer", "compensation", "salary", "pay range",
+    "equal opportunity", "equal employment", "eeo", "diversity", "inclusion", "privacy",
+    "disclaimer", "how to apply", "application process", "about us", "about the company",
+    "who we are", "why join", "why work", "our culture", "wir bieten",
+)
+
+# paragraphs dropped wherever they are, e.g. EEO statements without a heading
+BOILERPLATE_PATTERN = re.compile(
+    r"equal (employment )?opportunity|without regard to|protected veteran|"
+    r"reasonable accommodation|e-verify|background check|privacy (notice|policy)|"
+    r"applicants? (will|shall) receive consideration",
+    re.IGNORECASE
+)
+
+# a markdown heading, a bold line or a short line ending with a colon
+_HEADING = re.compile(r"^\s*(#{1,6}\s+.+|\*\*[^*]{2,80}\*\*:?|[^\n.!?]{2,60}:)\s*$")
+
+RESPONSIBILITIES = "responsibilities"
+REQUIREMENTS = "requirements"
+OTHER = "other"
+BOILERPLATE = "boilerplate"
+
+# sections are given room tier by tier, boilerplate never is
+TIERS = ((RESPONSIBILITIES, REQUIREMENTS), (OTHER,))
+
+log = logging.getLogger(__name__)
+
+_tokenizers = {}
+_tokenizer_lock = Lock()
+
+
+def tokenizer_name(model):
+    """
+    tokenizer of a model id
+
+    :param model: model id, a router provider suffix like ":together" is ignored
+    :return: tokenizer id or path
+    """
+    return TOKENIZER or model.split(":")[0]
+
+
+def count_tokens(texts, model):
+    """
+    token counts of texts
+
+    :param texts: list of strings
+    :param model: model id, see tokenizer_name
+    :return: list of token counts
+    """
+    tokenizer = _tokenizer(tokenizer_name(model))
+    if tokenizer is None:
+        return [-(-len(text) // CHARS_PER_TOKEN) for text in texts]
+    if not texts:
+        return []
+    return [len(ids) for ids in tokenizer(list(texts), add_special_tokens=False)["input_ids"]]
+
+
+def truncate(text, tokens, model):
+    """
+    cut text to a number of tokens at a word boundary
+
+    :param text: string
+    :param tokens: token limit
+    :param model: model id, see tokenizer_name
+    :return: string of at most tokens tokens
+    """
+    if tokens <= 0:
+        return ""
+
+    tokenizer = _tokenizer(tokenizer_name(model))
+    if tokenizer is None:
+        limit = tokens * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        cut = text[:limit]
+    else:
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        if len(encoding["input_ids"]) <= tokens:
+            return text
+        cut = text[:encoding["offset_mapping"][tokens - 1][1]]
+
+    # do not end on half a word
+    space = cut.rfind(" ")
+    return cut[:space] if space > len(cut) // 2 else cut
+
+
+def split_sections(description):
+    """
+    split a job description at its headings
+
+    :param description: description string, usually markdown
+    :return: list of (kind, text) in document order
+    """
+    sections = []
+    kind, lines = OTHER, []
+    for line in description.splitlines():
+        if _HEADING.match(line):
+            if any(part.strip() for part in lines):
+                sections.append((kind, "\n".join(lines).strip()))
+            kind, lines = _section_kind(line), [line]
+        else:
+            lines.append(line)
+    if any(part.strip() for part in lines):
+        sections.append((kind, "\n".join(lines).strip()))
+    return sections
+
+
+def _section_kind(heading):
+    """
+    classify a section by its heading
+
+    :param heading: heading line
+    :return: RESPONSIBILITIES, REQUIREMENTS, BOILERPLATE or OTHER
+    """
+    text = heading.strip("#*: \t").lower()
+    if any(word in text for word in BOILERPLATE_HEADINGS):
+        return BOILERPLATE
+    if any(word in text for word in RESPONSIBILITY_HEADINGS):
+        return RESPONSIBILITIES
+    if any(word in text for word in REQUIREMENT_HEADINGS):
+        return REQUIREMENTS
+    return OTHER
+
+
+def _drop_boilerplate(text):
+    """
+    remove boilerplate paragraphs from a section
+
+    :param text: section text
+    :return: text without boilerplate paragraphs
+    """
+    paragraphs = re.split(r"\n\s*\n", text)
+    return "\n\n".join(p for p in paragraphs if not BOILERPLATE_PATTERN.search(p)).strip()
+
+
+def fit_description(description, tokens, model):
+    """
+    the parts of a job description that matter for a letter, within a token budget
+
+    boilerplate sections and paragraphs are dropped. Responsibility and
+    requirement sections get room first, then the remaining ones. When a
+    tier does not fit, the tokens left are shared evenly among its
+    sections: short ones stay whole, long ones are cut. The kept sections
+    stay in document order.
+
+    :param description: description string
+    :param tokens: token budget
+    :param model: model id, see tokenizer_name
+    :return: shortened description string
+    """
+    sections = [
+        (kind, _drop_boilerplate(text))
+        for kind, text in split_sections(description or "")
+        if kind != BOILERPLATE
+    ]
+    sections = [(kind, text) for kind, text in sections if text]
+    counts = count_tokens([text for _, text in sections], model)
+
+    kept = {}
+    left = tokens
+    for tier in TIERS:
+        indexes = [index for index, (kind, _) in enumerate(sections) if kind in tier]
+        total = sum(counts[index] for index in indexes)
+        if total <= left:
+            kept.update((index, sections[index][1]) for index in indexes)
+            left -= total
+            continue
+
+        # shortest first, each takes at most an even share of what is left
+        indexes.sort(key=lambda index: counts[index])
+        for position, index in enumerate(indexes):
+            share = left // (len(indexes) - position)
+            kept[index] = truncate(sections[index][1], share, model)
+            left -= min(counts[index], share)
+        break
+
+    return "\n\n".join(kept[index] for index in sorted(kept) if kept[index])
+
+
+def fit_prompt(description, sample_coverletter, model, budget=PROMPT_TOKENS):
+    """
+    shorten the description and sample letter to fit a prompt token budget
+
+    the sample letter is kept whole unless it takes more than LETTER_SHARE
+    of the budget, the description gets the rest.
+
+    :param description: job description string
+    :param sample_coverletter: user's sample cover letter string
+    :param model: model id, see tokenizer_name
+    :param budget: tokens for description and letter together
+    :return: (description, sample_coverletter)
+    """
+    sample_coverletter = (sample_coverletter or "").strip()
+    letter_tokens = count_tokens([sample_coverletter], model)[0]
+    if letter_tokens > budget * LETTER_SHARE:
+        sample_coverletter = truncate(sample_coverletter, int(budget * LETTER_SHARE), model)
+        letter_tokens = count_tokens([sample_coverletter], model)[0]
+
+    return fit_description(description, budget - letter_tokens, model), sample_coverletter
+
+
+def _tokenizer(name):
+    """
+    tokenizer loaded on first use, None if it cannot be loaded
+
+    :param name: tokenizer id or path
+    :return: tokenizer or None
+    """
+    with _tokenizer_lock:
+        if name not in _tokenizers:
+            try:
+                # transformers is slow to import and only needed for letters
+                from transformers import AutoTokenizer
+
+                _tokenizers[name] = AutoTokenizer.from_pretrained(name)
+            except Exception as e:
+                log.warning("Tokenizer %s not available, estimating token counts: %s", name, e)
+                _tokenizers[name] = None
+        return _tokenizers[name]
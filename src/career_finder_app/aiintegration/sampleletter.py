@@ -0,0 +1,41 @@
+import os
+
+from career_finder_app.diskcache import data_dir
+
+
+def sample_letter_path():
+    """
+    file holding the last sample letter written on the cover letter screen
+
+    :return: path string
+    """
+    return os.path.join(data_dir(), "sample_letter.txt")
+
+
+def load_sample_letter(path=None):
+    """
+    read the saved sample letter
+
+    :param path: text file, defaults to sample_letter_path()
+    :return: letter string, empty if none was saved yet
+    """
+    path = path or sample_letter_path()
+    if not os.path.exists(path):
+        return ""
+
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def save_sample_letter(letter, path=None):
+    """
+    keep the sample letter so searches can rank by it after the screen is cleared
+
+    :param letter: letter string
+    :param path: text file, defaults to sample_letter_path()
+    """
+    path = path or sample_letter_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(letter)
+    os.replace(tmp_path, path)
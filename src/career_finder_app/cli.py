@@ -0,0 +1,137 @@
+"""
+command line interface of the app, needs no window
+
+    career-finder search --location Germany python "machine learning" -o jobs.json
+    career-finder search --location Germany --location Austria --location Switzerland python
+    career-finder letters --jobs jobs.json --sample-letter letter.txt --top 5
+"""
+import argparse
+import sys
+
+from career_finder_app.jobspymodule import RESULTS_WANTED
+from career_finder_app.service import (
+    FORMATS,
+    generate_cover_letters,
+    read_jobs,
+    search_jobs,
+    search_saved_jobs,
+    write_jobs,
+)
+
+
+def _read_letter(path):
+    """
+    read a sample letter file
+
+    :param path: file path or None
+    :return: letter string
+    """
+    if not path:
+        return ""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def run_search(args):
+    """
+    search subcommand
+
+    :param args: parsed arguments
+    :return: exit code
+    """
+    sample_letter = _read_letter(args.sample_letter)
+    # one location searches like before, several are searched side by side
+    location = args.location[0] if args.location and len(args.location) == 1 else args.location
+    if args.saved:
+        df = search_saved_jobs(args.keywords, location, sample_letter=sample_letter)
+    else:
+        if not location:
+            raise SystemExit("career-finder search: --location is required unless --saved is given")
+        df = search_jobs(
+            args.keywords,
+            location,
+            results_wanted=args.results,
+            sample_letter=sample_letter,
+            incremental=args.incremental
+        )
+
+    if args.top:
+        df = df.head(args.top)
+    write_jobs(df, args.output, args.format)
+    if args.output != "-":
+        print(f"{len(df)} jobs written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_letters(args):
+    """
+    letters subcommand
+
+    :param args: parsed arguments
+    :return: exit code
+    """
+    from career_finder_app.aiintegration.batchgeneration import DONE, FAILED
+
+    jobs = read_jobs(args.jobs, args.format)
+    if args.top:
+        jobs = jobs[:args.top]
+
+    def on_progress(index, status, detail):
+        if status in (DONE, FAILED):
+            print(f"{index + 1}/{len(jobs)} {status}: {detail}", file=sys.stderr, flush=True)
+
+    folder, results = generate_cover_letters(
+        jobs,
+        _read_letter(args.sample_letter),
+        folder=args.folder,
+        max_concurrency=args.concurrency,
+        on_progress=on_progress,
+        regenerate=args.regenerate
+    )
+
+    failed = sum(1 for status, _ in results if status != DONE)
+    print(f"{len(results) - failed} letters written to {folder}, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    """
+    command line entry point
+
+    :param argv: arguments, defaults to sys.argv[1:]
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="career-finder",
+        description="Search jobs and generate cover letters without the app window."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="search jobs")
+    search.add_argument("keywords", nargs="+", help="keywords, quote keywords with spaces")
+    search.add_argument("--location", action="append", help="country to search in, repeat for several")
+    search.add_argument("--results", type=int, default=RESULTS_WANTED, help="postings per site")
+    search.add_argument("--incremental", action="store_true", help="only fetch postings new since the last search")
+    search.add_argument("--saved", action="store_true", help="search jobs fetched before, offline")
+    search.add_argument("--sample-letter", help="sample cover letter file, improves the ranking")
+    search.add_argument("--top", type=int, help="only output the most relevant jobs")
+    search.add_argument("-o", "--output", default="-", help="output file, - for stdout (default)")
+    search.add_argument("--format", choices=FORMATS, help="output format, defaults to the file extension or json")
+    search.set_defaults(run=run_search)
+
+    letters = commands.add_parser("letters", help="generate cover letters for searched jobs")
+    letters.add_argument("--jobs", required=True, help="jobs file written by search")
+    letters.add_argument("--sample-letter", required=True, help="sample cover letter file")
+    letters.add_argument("--folder", help="output folder, defaults to a new folder in your documents")
+    letters.add_argument("--top", type=int, help="only the first jobs of the file")
+    letters.add_argument("--concurrency", type=int, help="letters generated at the same time")
+    letters.add_argument("--regenerate", action="store_true", help="do not reuse cached letters")
+    letters.add_argument("--format", choices=FORMATS, help="jobs file format, defaults to the file extension")
+    letters.set_defaults(run=run_letters)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+from platformdirs import user_cache_dir, user_data_dir
+
+APP_NAME = "CareerFinderApp"
+
+
+def cache_dir():
+    """
+    directory for the app's cache files, created on first use
+
+    :return: path string
+    """
+    path = user_cache_dir(APP_NAME, appauthor=False)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def data_dir():
+    """
+    directory for data the app keeps, unlike the cache it is never pruned
+
+    :return: path string
+    """
+    path = user_data_dir(APP_NAME, appauthor=False)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class DiskCache:
+    def __init__(self, path, max_bytes):
+        """
+        size-bounded LRU key/value store in a SQLite file
+
+        values are pickled, entries are evicted least recently used first
+        once the total size goes over max_bytes.
+
+        :param self: object
+        :param path: sqlite file path
+        :param max_bytes: maximum total size of stored values
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """
+        connection for one operation so any thread can use the cache
+
+        the operation is committed, or rolled back if it fails, and the
+        connection closed when the block is left.
+
+        :param self: object
+        :return: context manager yielding a sqlite3 connection
+        """
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """
+        look up a value and mark it as recently used
+
+        :param self: object
+        :param key: key string
+        :return: (value, age in seconds) or None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # unreadable entry, e.g. written by an incompatible version
+            self.delete(key)
+            return None
+        return value, time.time() - row[1]
+
+    def set(self, key, value):
+        """
+        store a value and evict old entries if the cache is too big
+
+        :param self: object
+        :param key: key string
+        :param value: picklable value
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._evict(conn)
+
+    def delete(self, key):
+        """
+        remove an entry
+
+        :param self: object
+        :param key: key string
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        remove all entries
+
+        :param self: object
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def _evict(self, conn):
+        """
+        delete least recently used entries until the cache fits max_bytes
+
+        :param self: object
+        :param conn: open sqlite3 connection
+        """
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", stale)
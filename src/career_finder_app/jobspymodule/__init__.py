@@ -1,22 +1,310 @@
-from jobspy import scrape_jobs
+import json
+import time
+from collections import namedtuple
 
-def get_jobs(location, keywords):
+from career_finder_app.singleflight import SingleFlight
+from career_finder_app.tracing import span
+
+# jobspy and pandas are imported on first use, they are slow to import and
+# not needed until the first search runs
+
+SITES = ["indeed", "linkedin", "google"] # ziprecruited is geo restricted for EU region
+
+# seconds each sub-query of a site may take in fan-out mode before it is
+# given up on, waiting for an earlier scrape of the same site included
+SITE_TIMEOUTS = {
+    "indeed": 30,
+    "linkedin": 45,
+    "google": 30,
+}
+DEFAULT_SITE_TIMEOUT = 30
+
+# seconds between two merged progress frames of a fan-out search, every
+# merge deduplicates all rows so far on the scheduler's thread
+PROGRESS_INTERVAL = 1.0
+
+HOURS_OLD = 72
+
+# indeed and glassdoor search this country's site if the location names none
+DEFAULT_COUNTRY = "USA"
+
+# postings requested per site and scrape, jobspy counts results_wanted per site
+RESULTS_WANTED = 20
+
+# one scrape_jobs call of a search split by keyword, location and site
+SubQuery = namedtuple("SubQuery", ["keyword", "location", "site"])
+
+# searches running right now, by their arguments
+_searches = SingleFlight("get_jobs")
+
+COLUMNS = ['id', 'site', 'job_url', 'job_url_direct', 'title', 'company','location', 'date_posted', 'job_type', 'description']
+
+
+def get_jobs(location, keywords, results_wanted=RESULTS_WANTED, offset=0, fan_out=False, on_site_result=None, on_site_error=None, site_timeouts=None, hours_old=HOURS_OLD):
     """
     Fetch job listings based on location and keywords.
-    
+
+    Postings listed on several sites are merged into one row, its
+    source_urls column holds the job_url of every copy, search_location
+    the location it was found in.
+
+    results_wanted and offset are per site, so the next page of a search is
+    fetched with offset increased by results_wanted.
+
+    In fan-out mode every site is scraped by its own scrape_jobs call, see
+    SearchScheduler, results are merged as each call finishes and a call
+    that fails or runs past its site's timeout is skipped instead of
+    failing the search. A list of locations or keywords always fans out,
+    into one call per keyword, location and site.
+
+    :param location: location string, or a list of locations
+    :param keywords: keywords list string, or a list of keywords searched separately
+    :param results_wanted: number of postings to fetch per site
+    :param offset: number of postings to skip per site
+    :param fan_out: scrape each site concurrently
+    :param on_site_result: fan-out callback (site, merged dataframe so far)
+    :param on_site_error: fan-out callback (site, exception)
+    :param site_timeouts: dict of site to timeout seconds, defaults to SITE_TIMEOUTS
+    :param hours_old: maximum posting age in hours, or a dict of site to hours
+    :return: job results dataframe
+    """
+    if not isinstance(hours_old, dict):
+        hours_old = dict.fromkeys(SITES, hours_old)
+
+    # the same search started again in this process while it runs, e.g.
+    # by a double click or going back and searching again, waits for the
+    # running one instead of scraping. Its fan-out callbacks still get
+    # every site's results and errors
+    key = json.dumps([
+        location,
+        keywords,
+        results_wanted,
+        offset,
+        fan_out,
+        sorted(hours_old.items()),
+        sorted((site_timeouts or SITE_TIMEOUTS).items()),
+    ])
+
+    def listener(event, site, value):
+        callback = on_site_result if event == "result" else on_site_error
+        if callback:
+            callback(site, value)
+
+    def scrape(flight):
+        return _get_jobs(
+            location,
+            keywords,
+            results_wanted,
+            offset,
+            fan_out,
+            # the merged frame holds every earlier one, late callers only need the last
+            lambda site, jobs: flight.publish("result", site, jobs, slot="result"),
+            lambda site, error: flight.publish("error", site, error),
+            site_timeouts,
+            hours_old,
+            progress_wanted=lambda: flight.listened
+        )
+
+    return _searches.do(
+        key,
+        scrape,
+        share=lambda jobs: jobs.copy(),
+        listener=listener if on_site_result or on_site_error else None
+    )
+
+
+def _get_jobs(location, keywords, results_wanted, offset, fan_out, on_site_result, on_site_error, site_timeouts, hours_old, progress_wanted=None):
+    """
+    get_jobs without the single-flight check
+
+    :param location: location string, or a list of locations
+    :param keywords: keywords list string, or a list of keywords
+    :param results_wanted: number of postings to fetch per site
+    :param offset: number of postings to skip per site
+    :param fan_out: scrape each site concurrently
+    :param on_site_result: fan-out callback (site, merged dataframe so far)
+    :param on_site_error: fan-out callback (site, exception)
+    :param site_timeouts: dict of site to timeout seconds, defaults to SITE_TIMEOUTS
+    :param hours_old: dict of site to maximum posting age in hours
+    :param progress_wanted: function telling whether on_site_result is listened to, None if it always is
+    :return: job results dataframe
+    """
+
+    expand = isinstance(location, (list, tuple)) or isinstance(keywords, (list, tuple))
+    with span("get_jobs", fan_out=fan_out or expand):
+        if fan_out or expand:
+            return _get_jobs_fan_out(
+                expand_queries(keywords, location),
+                results_wanted,
+                offset,
+                on_site_result,
+                on_site_error,
+                site_timeouts or SITE_TIMEOUTS,
+                hours_old,
+                progress_wanted
+            )
+
+        from career_finder_app.jobspymodule.dedup import deduplicate_jobs
+
+        # one call for all sites, use the widest window asked for
+        jobs = _scrape(SITES, location, keywords, results_wanted, offset, max(hours_old.values()))
+        jobs = _select_columns(jobs).assign(search_location=location)
+        with span("get_jobs.dedup", rows=len(jobs)):
+            return deduplicate_jobs(jobs)
+
+
+def expand_queries(keywords, locations, sites=SITES):
+    """
+    split a search into one scrape per keyword, location and site
+
+    :param keywords: keywords string or list of keyword strings
+    :param locations: location string or list of location strings
+    :param sites: list of site names
+    :return: list of SubQuery, sites interleaved
+    """
+    keywords = [keywords] if isinstance(keywords, str) else list(dict.fromkeys(keywords))
+    locations = [locations] if isinstance(locations, str) else list(dict.fromkeys(locations))
+    return [
+        SubQuery(keyword, location, site)
+        for keyword in keywords
+        for location in locations
+        for site in sites
+    ]
+
+
+def indeed_country(location):
+    """
+    country name for indeed and glassdoor, which search one country's site
+
+    :param location: location string, e.g. "Germany" or "Berlin, Germany"
+    :return: country name jobspy knows, DEFAULT_COUNTRY if none is found
+    """
+    from jobspy.model import Country
+
+    for candidate in (location, location.rsplit(",", 1)[-1]):
+        try:
+            Country.from_string(candidate.strip())
+        except ValueError:
+            continue
+        return candidate.strip()
+    return DEFAULT_COUNTRY
+
+
+def _scrape(sites, location, keywords, results_wanted, offset, hours_old=HOURS_OLD, deadline=None):
+    """
+    run one scrape_jobs call for the given sites
+
+    :param sites: list of site names
     :param location: location string
     :param keywords: keywords list string
+    :param results_wanted: number of postings to fetch per site
+    :param offset: number of postings to skip per site
+    :param hours_old: maximum posting age in hours
+    :param deadline: time.monotonic() the caller gives up at, a scrape not sent by then is skipped
+    :return: raw jobspy dataframe, without the sites that are paused
+    """
+    from jobspy import scrape_jobs
+
+    from career_finder_app.jobspymodule.siteguard import default_guard
+
+    # sites that block or keep failing are paused, the others rate limited
+    with span("get_jobs.scrape", site=",".join(sites), location=location, offset=offset):
+        return default_guard().call(sites, lambda sites: scrape_jobs(
+            site_name=sites,
+            search_term=keywords,
+            google_search_term=f"{keywords} jobs near {location} since yesterday",
+            location=location,
+            results_wanted=results_wanted,
+            offset=offset,
+            hours_old=hours_old,
+            country_indeed=indeed_country(location),
+        ), deadline=deadline)
+
+
+def _select_columns(jobs):
+    """
+    keep the columns the app uses
+
+    :param jobs: raw jobspy dataframe
+    :return: dataframe with COLUMNS
+    """
+    with span("get_jobs.select_columns", rows=len(jobs)):
+        return jobs.reindex(columns=COLUMNS)
+
+
+def _get_jobs_fan_out(queries, results_wanted, offset, on_site_result, on_site_error, site_timeouts, hours_old, progress_wanted=None):
     """
-    jobs = scrape_jobs(
-        site_name=["indeed", "linkedin", "google"], # ziprecruited is geo restricted for EU region
-        search_term=keywords,
-        google_search_term=f"{keywords} jobs near {location} since yesterday",
-        location=location,
-        results_wanted=20,
-        hours_old=72,
-        country_indeed='USA',
-        
+    run one scrape per sub-query and merge results as they arrive
+
+    the first results are reported at once, later ones at most every
+    PROGRESS_INTERVAL seconds. The last sub-query is not reported, the
+    merged result is returned right after it.
+
+    :param queries: list of SubQuery
+    :param results_wanted: number of postings to fetch per site
+    :param offset: number of postings to skip per site
+    :param on_site_result: callback (site, merged dataframe so far) or None
+    :param on_site_error: callback (site, exception) or None
+    :param site_timeouts: dict of site to timeout seconds
+    :param hours_old: dict of site to maximum posting age in hours
+    :param progress_wanted: function telling whether on_site_result is listened to, None if it always is
+    :return: merged dataframe
+    """
+    from career_finder_app.jobspymodule.searchscheduler import SearchScheduler
+
+    frames = []
+    errors = []
+    last_report = None
+
+    def scrape(query):
+        # the scheduler gives up on the sub-query then, see SearchScheduler.run
+        deadline = time.monotonic() + site_timeouts.get(query.site, DEFAULT_SITE_TIMEOUT)
+        jobs = _scrape([query.site], query.location, query.keyword, results_wanted, offset, hours_old.get(query.site, HOURS_OLD), deadline)
+        return _select_columns(jobs).assign(search_location=query.location)
+
+    def done(query, jobs):
+        nonlocal last_report
+        frames.append(jobs)
+        if not on_site_result or len(frames) + len(errors) == len(queries):
+            return
+        if last_report is not None and time.monotonic() - last_report < PROGRESS_INTERVAL:
+            return
+        if progress_wanted is None or progress_wanted():
+            last_report = time.monotonic()
+            on_site_result(query.site, _merge(frames))
+
+    def fail(query, error):
+        errors.append(error)
+        if on_site_error:
+            on_site_error(query.site, error)
+
+    SearchScheduler().run(
+        [(query, query.site, lambda query=query: scrape(query)) for query in queries],
+        on_done=done,
+        on_error=fail,
+        timeouts=site_timeouts,
+        default_timeout=DEFAULT_SITE_TIMEOUT
     )
-    
-    df = jobs[['id', 'site', 'job_url', 'job_url_direct', 'title', 'company','location', 'date_posted', 'job_type', 'description']].head()
-    return df
\ No newline at end of file
+
+    if not frames and errors:
+        raise errors[0]
+    return _merge(frames)
+
+
+def _merge(frames):
+    """
+    concatenate per site results and merge cross-site duplicates
+
+    :param frames: list of dataframes
+    :return: merged dataframe
+    """
+    import pandas as pd
+
+    from career_finder_app.jobspymodule.dedup import deduplicate_jobs
+
+    if not frames:
+        return deduplicate_jobs(pd.DataFrame(columns=COLUMNS))
+
+    jobs = pd.concat(frames, ignore_index=True)
+    with span("get_jobs.dedup", rows=len(jobs)):
+        return deduplicate_jobs(jobs)
@@ -0,0 +1,270 @@
+import re
+import string
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# company suffixes that differ between sites for the same employer
+LEGAL_SUFFIXES = r"\b(inc|llc|ltd|limited|corp|corporation|co|gmbh|ag|se|sa|plc|kg|bv)\b"
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+# only the start of long descriptions is hashed
+MAX_TOKENS = 1000
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_PUNCTUATION = f"[{re.escape(string.punctuation)}]"
+
+EMPTY = np.iinfo(np.uint64).max
+_SHINGLE_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+
+
+def normalize_text(values, strip_legal_suffixes=False):
+    """
+    lowercase, drop punctuation and collapse whitespace
+
+    :param values: series of strings
+    :param strip_legal_suffixes: also drop company suffixes like Inc or GmbH
+    :return: normalized series
+    """
+    text = values.fillna("").astype(str).str.lower()
+    if strip_legal_suffixes:
+        text = text.str.replace(LEGAL_SUFFIXES, " ", regex=True)
+    text = text.str.replace(r"[^\w]+", " ", regex=True)
+    return text.str.strip()
+
+
+def deduplicate_jobs(df, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    merge postings that appear on several sites
+
+    rows are duplicates if their normalized (company, title, location) hash
+    matches, or if they are from the same company and their descriptions'
+    MinHash signatures agree on at least threshold of the positions. Of
+    every group the row with the longest description and most filled in
+    fields is kept, source_urls lists the job_url of every copy.
+
+    :param df: job results dataframe
+    :param threshold: estimated description similarity of near duplicates
+    :return: deduplicated dataframe with a source_urls column
+    """
+    df = df.reset_index(drop=True)
+    n = len(df)
+    if n == 0:
+        return df.assign(source_urls=pd.Series(dtype=object))
+
+    company = normalize_text(df["company"], strip_legal_suffixes=True)
+    title = normalize_text(df["title"])
+    location = normalize_text(df["location"])
+
+    parent = np.arange(n)
+
+    # exact duplicates, rows without company or title never match
+    keys = pd.util.hash_pandas_object(
+        pd.DataFrame({"company": company, "title": title, "location": location}),
+        index=False
+    ).to_numpy()
+    keyed = ((company != "") & (title != "")).to_numpy()
+    exact = pd.Series(np.flatnonzero(keyed)).groupby(keys[keyed]).transform("min").to_numpy()
+    parent[keyed] = exact
+
+    # near duplicates of the description from the same company
+    company_codes = pd.factorize(company)[0]
+    signatures, has_signature = minhash_signatures(df["description"])
+    pairs = _candidate_pairs(signatures, has_signature)
+    if len(pairs):
+        a, b = pairs[:, 0], pairs[:, 1]
+        similarity = signature_similarity(signatures[a], signatures[b])
+        same_company = (company_codes[a] == company_codes[b]) & (company.to_numpy()[a] != "")
+        pairs = pairs[(similarity >= threshold) & same_company]
+
+    groups = _connected_components(parent, pairs)
+    return _keep_richest(df, groups)
+
+
+def minhash_signatures(descriptions, num_perm=NUM_PERM):
+    """
+    one permutation MinHash signatures over word shingles of each description
+
+    every shingle is hashed once, the hash picks one of num_perm bins and the
+    signature keeps the smallest hash per bin. bins without a shingle hold EMPTY.
+
+    :param descriptions: series of description strings
+    :param num_perm: signature length, a power of two
+    :return: (uint64 array of shape (rows, num_perm), bool mask of rows with shingles)
+    """
+    n = len(descriptions)
+    signatures = np.full((n, num_perm), EMPTY, dtype=np.uint64)
+    has_signature = np.zeros(n, dtype=bool)
+
+    doc, codes, vocabulary = tokenize(descriptions, MAX_TOKENS)
+    if len(doc) < SHINGLE_SIZE:
+        return signatures, has_signature
+    # hash the vocabulary only, descriptions repeat most of their words
+    token_hashes = pd.util.hash_array(vocabulary.astype(object))[codes]
+
+    # hash each run of SHINGLE_SIZE consecutive tokens of the same document
+    count = len(token_hashes) - SHINGLE_SIZE + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    valid = np.ones(count, dtype=bool)
+    for offset in range(SHINGLE_SIZE):
+        shingles ^= token_hashes[offset:offset + count] * _SHINGLE_MIX[offset]
+        valid &= doc[offset:offset + count] == doc[:count]
+    shingles = shingles[valid]
+    shingle_doc = doc[:count][valid]
+
+    # the product's high bits are well mixed, use them for the bin
+    mixed = shingles * _SHINGLE_MIX[0]
+    bins = (mixed >> np.uint64(64 - int(np.log2(num_perm)))).astype(np.int64)
+    np.minimum.at(signatures.reshape(-1), shingle_doc * num_perm + bins, shingles)
+
+    has_signature[shingle_doc] = True
+    return signatures, has_signature
+
+
+def tokenize(texts, max_tokens=None):
+    """
+    split all texts into lowercase words in one pass
+
+    lowercasing, splitting and building the vocabulary run in arrow
+    kernels over all texts at once, no python code runs per word.
+
+    :param texts: series of strings
+    :param max_tokens: only keep the first max_tokens words of each text
+    :return: (text index of every token, vocabulary code of every token, vocabulary array)
+    """
+    texts = pa.array(texts.fillna("").astype(str).tolist(), type=pa.large_string())
+    texts = pc.utf8_trim_whitespace(pc.replace_substring_regex(pc.utf8_lower(texts), _PUNCTUATION, " "))
+    words = pc.utf8_split_whitespace(texts)
+    if max_tokens is not None:
+        words = pc.list_slice(words, 0, max_tokens)
+
+    doc = pc.list_parent_indices(words).to_numpy()
+    tokens = pc.list_flatten(words)
+    # an empty text splits into one empty word
+    keep = pc.not_equal(tokens, "")
+    doc = doc[keep.to_numpy(zero_copy_only=False)]
+    encoded = tokens.filter(keep).dictionary_encode()
+    codes = encoded.indices.to_numpy().astype(np.int64)
+    return doc, codes, encoded.dictionary.to_numpy(zero_copy_only=False)
+
+
+def signature_similarity(a, b):
+    """
+    estimated jaccard similarity of signature rows, bins empty in both are ignored
+
+    :param a: signatures
+    :param b: signatures of the same shape
+    :return: float array
+    """
+    filled = (a != EMPTY) | (b != EMPTY)
+    matches = ((a == b) & filled).sum(axis=1)
+    return matches / np.maximum(filled.sum(axis=1), 1)
+
+
+def _candidate_pairs(signatures, has_signature, bands=BANDS):
+    """
+    locality sensitive hashing of signature bands
+
+    :param signatures: MinHash signatures
+    :param has_signature: mask of rows with a signature
+    :param bands: number of bands
+    :return: int array of shape (pairs, 2)
+    """
+    rows = np.flatnonzero(has_signature)
+    if len(rows) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    width = signatures.shape[1] // bands
+    pairs = []
+    for band in range(bands):
+        part = signatures[rows, band * width:(band + 1) * width]
+        band_hash = pd.util.hash_pandas_object(pd.DataFrame(part), index=False).to_numpy()
+
+        order = np.argsort(band_hash, kind="stable")
+        sorted_hash = band_hash[order]
+        # pair every member of a bucket with the first member of that bucket
+        first = np.r_[True, sorted_hash[1:] != sorted_hash[:-1]]
+        head = order[np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))]
+        member = ~first
+        if member.any():
+            pairs.append(np.column_stack((rows[head[member]], rows[order[member]])))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def _connected_components(parent, pairs):
+    """
+    group rows linked by exact keys and near duplicate pairs
+
+    union-find over all pairs at once: every round hooks the larger root
+    of each linked pair onto the smaller one, then flattens the trees, until
+    both rows of every pair share a root.
+
+    :param parent: initial group representative of every row, a root itself
+    :param pairs: int array of linked row pairs
+    :return: group id of every row, the smallest row index of its group
+    """
+    parent = parent.copy()
+    a, b = pairs[:, 0], pairs[:, 1]
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        linked = root_a != root_b
+        if not linked.any():
+            return parent
+        np.minimum.at(
+            parent,
+            np.maximum(root_a[linked], root_b[linked]),
+            np.minimum(root_a[linked], root_b[linked])
+        )
+        parent = _flatten(parent)
+
+
+def _flatten(parent):
+    """
+    point every row straight at the root of its tree
+
+    :param parent: parent of every row, smaller than or equal to the row
+    :return: root of every row
+    """
+    while True:
+        grandparent = parent[parent]
+        if (grandparent == parent).all():
+            return parent
+        parent = grandparent
+
+
+def _keep_richest(df, groups):
+    """
+    keep the richest row of every group and collect its source urls
+
+    :param df: job results dataframe
+    :param groups: group id of every row
+    :return: deduplicated dataframe in original order
+    """
+    richness = pd.DataFrame({
+        "group": groups,
+        "description_length": df["description"].fillna("").astype(str).str.len(),
+        "filled": df.notna().sum(axis=1),
+    })
+    best = (
+        richness
+        .sort_values(["description_length", "filled"], ascending=False, kind="stable")
+        .drop_duplicates("group")
+        .index
+        .sort_values()
+    )
+
+    urls = pd.DataFrame({"group": groups, "url": df["job_url"]}).dropna().drop_duplicates()
+    source_urls = urls.groupby("group")["url"].agg(list)
+    result = df.loc[best].reset_index(drop=True)
+    result["source_urls"] = [
+        urls if isinstance(urls, list) else []
+        for urls in source_urls.reindex(groups[best])
+    ]
+    return result
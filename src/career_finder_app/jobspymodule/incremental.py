@@ -0,0 +1,82 @@
+import math
+import time
+
+from career_finder_app.jobspymodule import HOURS_OLD, SITES, get_jobs
+from career_finder_app.jobspymodule.jobstore import default_store
+
+# extra hours asked for, sites only tell posting times to the hour or day
+OVERLAP_HOURS = 1
+
+
+def hours_since(fetched_at, now):
+    """
+    posting age window that covers everything since an earlier fetch
+
+    :param fetched_at: unix time of the earlier fetch
+    :param now: unix time
+    :return: hours between 1 and HOURS_OLD
+    """
+    hours = math.ceil((now - fetched_at) / 3600) + OVERLAP_HOURS
+    return min(max(hours, 1), HOURS_OLD)
+
+
+def get_jobs_incremental(location, keywords, store=None, on_stored=None, on_site_error=None, **kwargs):
+    """
+    fetch only postings newer than the last fetch of the same search
+
+    every site is asked for postings since it last answered this search,
+    or the full HOURS_OLD window the first time. The fetched jobs are
+    merged into the job store and all stored results of the search are
+    returned, is_new marks the ones the search had not returned before.
+
+    :param location: location string or list of location strings
+    :param keywords: list of keyword strings, each searched separately
+    :param store: JobStore, defaults to default_store()
+    :param on_stored: callback receiving the stored results before fetching
+    :param on_site_error: fan-out callback (site, exception)
+    :param kwargs: passed on to get_jobs
+    :return: dataframe of the search's stored results with an is_new column
+    """
+    store = store or default_store()
+    key = store.search_key(keywords, location)
+    started = time.time()
+
+    if on_stored:
+        stored = store.search_results(key)
+        if not stored.empty:
+            on_stored(stored.assign(is_new=False))
+
+    last = store.last_fetched(key)
+    hours_old = {
+        site: hours_since(last[site], started) if site in last else HOURS_OLD
+        for site in SITES
+    }
+
+    failed = set()
+
+    def site_failed(site, error):
+        failed.add(site)
+        if on_site_error:
+            on_site_error(site, error)
+
+    df = get_jobs(
+        location=location,
+        keywords=list(keywords),
+        fan_out=True,
+        on_site_error=site_failed,
+        hours_old=hours_old,
+        **kwargs
+    )
+
+    store.upsert(df)
+    # a site that failed is asked for the same window again next time
+    new_urls = store.record_fetch(
+        key,
+        [site for site in SITES if site not in failed],
+        started,
+        df["job_url"].dropna()
+    )
+
+    results = store.search_results(key)
+    results["is_new"] = results["job_url"].isin(new_urls)
+    return results
@@ -0,0 +1,121 @@
+from threading import Lock
+
+from career_finder_app.jobspymodule import RESULTS_WANTED
+from career_finder_app.jobspymodule.jobrecords import records_from_frame
+
+PAGE_SIZE = 20
+
+# stop scraping further pages once this many postings per site were requested
+MAX_RESULTS = 300
+
+
+class JobPager:
+    def __init__(self, fetch, first_batch, page_size=PAGE_SIZE, batch_size=RESULTS_WANTED, max_results=MAX_RESULTS):
+        """
+        hand out search results page by page
+
+        pages come from rows already fetched first, fetch_more() scrapes the
+        next batch only once those are used up. Rows are kept as JobRecord,
+        the fetched dataframes with their descriptions are not held on to.
+
+        :param self: object
+        :param fetch: function (offset, results_wanted) returning a dataframe
+        :param first_batch: dataframe of the first scrape, fetched with offset 0
+        :param page_size: rows per page
+        :param batch_size: postings per site requested by each further scrape
+        :param max_results: postings per site after which no more are scraped
+        """
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.max_results = max_results
+        self._fetch = fetch
+        self._lock = Lock()
+        self._offset = batch_size
+        self._seen = set()
+        self._buffer = []
+        self.shown = []
+        self._exhausted = first_batch.empty
+        self._add(first_batch)
+
+    @property
+    def buffered(self):
+        """
+        number of fetched rows not handed out yet
+
+        :param self: object
+        :return: row count
+        """
+        return len(self._buffer)
+
+    @property
+    def can_fetch(self):
+        """
+        whether scraping another batch may return more rows
+
+        :param self: object
+        :return: True if more rows could be scraped
+        """
+        return not self._exhausted and self._offset < self.max_results
+
+    @property
+    def has_more(self):
+        """
+        whether another page can be shown
+
+        :param self: object
+        :return: True if rows are buffered or can be scraped
+        """
+        return self.buffered > 0 or self.can_fetch
+
+    def next_page(self, size=None):
+        """
+        take the next page from the fetched rows, never scrapes
+
+        the page is also appended to shown, all rows handed out so far.
+
+        :param self: object
+        :param size: rows to take, defaults to page_size
+        :return: list of up to size JobRecord
+        """
+        size = size or self.page_size
+        with self._lock:
+            page = self._buffer[:size]
+            del self._buffer[:size]
+            self.shown.extend(page)
+        return page
+
+    def fetch_more(self):
+        """
+        scrape the next batch into the buffer, blocking
+
+        :param self: object
+        :return: number of new rows
+        """
+        if not self.can_fetch:
+            return 0
+
+        offset = self._offset
+        df = self._fetch(offset, self.batch_size)
+
+        with self._lock:
+            self._offset = offset + self.batch_size
+            added = self._add(df)
+            if added == 0:
+                self._exhausted = True
+        return added
+
+    def _add(self, df):
+        """
+        append rows that were not seen before to the buffer
+
+        :param self: object
+        :param df: fetched dataframe
+        :return: number of new rows
+        """
+        if df.empty:
+            return 0
+
+        new = df[~df["job_url"].isin(self._seen)].drop_duplicates("job_url")
+        self._seen.update(new["job_url"])
+        self._buffer.extend(records_from_frame(new))
+        return len(new)
@@ -0,0 +1,124 @@
+# fields kept in memory for every listed job, the description is not
+FIELDS = (
+    "id",
+    "site",
+    "job_url",
+    "job_url_direct",
+    "title",
+    "company",
+    "location",
+    "date_posted",
+    "job_type",
+    "score",
+    "is_new",
+)
+_URL = FIELDS.index("job_url")
+
+
+class JobRecord:
+    __slots__ = FIELDS + ("has_description", "_description")
+
+    def __init__(self, values, has_description=False, description=None):
+        """
+        one listed job without its description
+
+        the description is read from the job store by job_url when asked
+        for, so a long result list holds only the short fields. Jobs
+        without a url cannot be looked up and keep their description.
+        get() and [] read fields like a row dictionary.
+
+        :param self: object
+        :param values: field values in FIELDS order, None for missing
+        :param has_description: whether the job has a description
+        :param description: description kept in memory, None to load it when needed
+        """
+        for field, value in zip(FIELDS, values):
+            setattr(self, field, value)
+        self.has_description = has_description
+        self._description = description
+
+    @property
+    def description(self):
+        """
+        description of the job, read from the job store
+
+        :param self: object
+        :return: description string, empty if unknown
+        """
+        if self._description is not None:
+            return self._description
+        if not self.has_description or not self.job_url:
+            return ""
+        return load_description(self.job_url) or ""
+
+    def get(self, key, default=None):
+        """
+        field value like dict.get, missing values give the default
+
+        :param self: object
+        :param key: field name or "description"
+        :param default: value for unknown or missing fields
+        :return: value
+        """
+        if key == "description":
+            return self.description
+        if key not in FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        if key != "description" and key not in FIELDS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def to_dict(self):
+        """
+        all fields including the description
+
+        :param self: object
+        :return: job data dictionary
+        """
+        job = {field: getattr(self, field) for field in FIELDS}
+        job["description"] = self.description
+        return job
+
+    def __repr__(self):
+        return f"JobRecord({self.title!r}, {self.company!r}, {self.job_url!r})"
+
+
+def records_from_frame(df):
+    """
+    compact records of job results
+
+    :param df: job results dataframe
+    :return: list of JobRecord in row order
+    """
+    if df.empty:
+        return []
+
+    fields = df.reindex(columns=list(FIELDS))
+    fields = fields.astype(object).where(fields.notna(), None)
+    descriptions = df["description"].tolist() if "description" in df else [None] * len(df)
+
+    records = []
+    for values, description in zip(zip(*(fields[field].tolist() for field in FIELDS)), descriptions):
+        has_description = isinstance(description, str) and description != ""
+        # jobs are looked up by url, one without keeps its description
+        kept = description if has_description and not values[_URL] else None
+        records.append(JobRecord(values, has_description, kept))
+    return records
+
+
+def load_description(job_url, store=None):
+    """
+    stored description of a job
+
+    :param job_url: job url
+    :param store: JobStore, defaults to default_store()
+    :return: description string or None
+    """
+    # imported on first use, records are also built where no store is needed
+    from career_finder_app.jobspymodule.jobstore import default_store
+
+    return (store or default_store()).description(job_url)
@@ -0,0 +1,427 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+import pandas as pd
+
+from career_finder_app.diskcache import data_dir
+from career_finder_app.jobspymodule import COLUMNS
+
+# columns kept for every job, job_url is the key
+STORED_COLUMNS = COLUMNS + ["source_urls", "search_location", "first_seen", "last_seen"]
+
+# rows returned by a search unless a limit is given
+DEFAULT_LIMIT = 500
+
+# bm25 weights of the indexed columns title, company, description
+FTS_WEIGHTS = (4.0, 2.0, 1.0)
+
+_default_store = None
+_default_store_lock = Lock()
+
+
+class JobStore:
+    def __init__(self, path=None):
+        """
+        every job ever fetched, in a SQLite file with a full-text index
+
+        jobs are upserted by job_url, so a posting seen again is updated in
+        place and keeps the time it was first seen. title, company and
+        description are indexed with FTS5, searching the history needs no
+        network access.
+
+        :param self: object
+        :param path: sqlite file, defaults to jobs.sqlite3 in the user data dir
+        """
+        self.path = path or os.path.join(data_dir(), "jobs.sqlite3")
+        self._lock = Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " job_url TEXT PRIMARY KEY,"
+                " id TEXT,"
+                " site TEXT,"
+                " job_url_direct TEXT,"
+                " title TEXT,"
+                " company TEXT,"
+                " location TEXT,"
+                " date_posted TEXT,"
+                " job_type TEXT,"
+                " description TEXT,"
+                " source_urls TEXT,"
+                " search_location TEXT,"
+                " first_seen REAL NOT NULL,"
+                " last_seen REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_search_location ON jobs (search_location COLLATE NOCASE)"
+            )
+
+            # external content index kept in sync by triggers
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                " title, company, description,"
+                " content='jobs', content_rowid='rowid',"
+                " tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN"
+                " INSERT INTO jobs_fts (rowid, title, company, description)"
+                " VALUES (new.rowid, new.title, new.company, new.description);"
+                " END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN"
+                " INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)"
+                " VALUES ('delete', old.rowid, old.title, old.company, old.description);"
+                " END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN"
+                " INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)"
+                " VALUES ('delete', old.rowid, old.title, old.company, old.description);"
+                " INSERT INTO jobs_fts (rowid, title, company, description)"
+                " VALUES (new.rowid, new.title, new.company, new.description);"
+                " END"
+            )
+
+            # jobs each search returned and when each site was last fetched
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_results ("
+                " search_key TEXT NOT NULL,"
+                " job_url TEXT NOT NULL,"
+                " PRIMARY KEY (search_key, job_url))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetches ("
+                " search_key TEXT NOT NULL,"
+                " site TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (search_key, site))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """
+        connection for one operation so any thread can use the store
+
+        the operation is committed, or rolled back if it fails, and the
+        connection closed when the block is left.
+
+        :param self: object
+        :return: context manager yielding a sqlite3 connection
+        """
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, df, search_location=None):
+        """
+        insert new jobs and update the ones stored before
+
+        fields missing in df keep their stored value.
+
+        :param self: object
+        :param df: job results dataframe
+        :param search_location: location the jobs were searched in, a search_location column wins
+        :return: set of job urls that were not stored before
+        """
+        if df.empty or "job_url" not in df:
+            return set()
+
+        df = df[df["job_url"].notna()].drop_duplicates("job_url")
+        now = time.time()
+        rows = []
+        for job in df.reindex(columns=COLUMNS + ["source_urls", "search_location"]).itertuples(index=False):
+            values = [_sql_value(value) for value in job[:-2]]
+            source_urls = job[-2] if isinstance(job[-2], list) else None
+            rows.append(values + [
+                json.dumps(source_urls) if source_urls else None,
+                job[-1] if isinstance(job[-1], str) else search_location,
+                now,
+                now,
+            ])
+
+        columns = ", ".join(STORED_COLUMNS)
+        placeholders = ", ".join("?" * len(STORED_COLUMNS))
+        updates = ", ".join(
+            f"{column} = COALESCE(excluded.{column}, {column})"
+            for column in STORED_COLUMNS
+            if column not in ("job_url", "first_seen")
+        )
+
+        with self._lock, self._connect() as conn:
+            known = self._known_urls(conn, [row[COLUMNS.index("job_url")] for row in rows])
+            conn.executemany(
+                f"INSERT INTO jobs ({columns}) VALUES ({placeholders})"
+                f" ON CONFLICT (job_url) DO UPDATE SET {updates}",
+                rows
+            )
+        return set(df["job_url"]) - known
+
+    def _known_urls(self, conn, urls, search_key=None):
+        """
+        job urls among urls that are stored already
+
+        :param self: object
+        :param conn: open sqlite3 connection
+        :param urls: list of job urls
+        :param search_key: only count jobs this search returned before
+        :return: set of job urls
+        """
+        if search_key is None:
+            query = "SELECT job_url FROM jobs WHERE job_url IN ({})"
+            params = []
+        else:
+            query = "SELECT job_url FROM search_results WHERE search_key = ? AND job_url IN ({})"
+            params = [search_key]
+
+        known = set()
+        # stay below sqlite's limit of bound parameters
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            known.update(
+                row[0] for row in conn.execute(
+                    query.format(", ".join("?" * len(chunk))),
+                    params + chunk
+                )
+            )
+        return known
+
+    def search(self, keywords=(), location=None, site=None, since=None, limit=DEFAULT_LIMIT):
+        """
+        search the stored jobs
+
+        jobs matching any of the keywords are returned best match first,
+        without keywords the most recently seen jobs are returned.
+
+        :param self: object
+        :param keywords: list of keyword strings, each matched as a phrase
+        :param location: only jobs searched in this location, or in one of a list of locations
+        :param site: only jobs from this site
+        :param since: only jobs first seen after this unix time
+        :param limit: maximum number of rows
+        :return: dataframe with STORED_COLUMNS
+        """
+        match = " OR ".join(_phrase(keyword) for keyword in keywords if keyword.strip())
+        columns = ", ".join(f"jobs.{column}" for column in STORED_COLUMNS)
+        conditions = []
+        params = []
+
+        if match:
+            query = f"SELECT {columns} FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid"
+            conditions.append("jobs_fts MATCH ?")
+            params.append(match)
+            order = "bm25(jobs_fts, {}, {}, {})".format(*FTS_WEIGHTS)
+        else:
+            query = f"SELECT {columns} FROM jobs"
+            order = "jobs.last_seen DESC"
+
+        if location:
+            locations = [location] if isinstance(location, str) else list(location)
+            conditions.append(
+                "jobs.search_location COLLATE NOCASE IN ({})".format(", ".join("?" * len(locations)))
+            )
+            params.extend(locations)
+        if site:
+            conditions.append("jobs.site = ?")
+            params.append(site)
+        if since is not None:
+            conditions.append("jobs.first_seen >= ?")
+            params.append(since)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return _to_frame(rows)
+
+    @staticmethod
+    def search_key(keywords, location):
+        """
+        build the key of a search, independent of keyword order and case
+
+        :param keywords: list of keyword strings
+        :param location: location string or list of location strings
+        :return: key string
+        """
+        raw = json.dumps([
+            sorted(keyword.strip().lower() for keyword in keywords),
+            _location_key(location),
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def last_fetched(self, search_key):
+        """
+        time of the last successful fetch of a search per site
+
+        :param self: object
+        :param search_key: key from search_key
+        :return: dict of site to unix time
+        """
+        with self._connect() as conn:
+            return dict(conn.execute(
+                "SELECT site, fetched_at FROM fetches WHERE search_key = ?", (search_key,)
+            ))
+
+    def record_fetch(self, search_key, sites, fetched_at, job_urls):
+        """
+        remember a successful fetch and the jobs it returned
+
+        :param self: object
+        :param search_key: key from search_key
+        :param sites: sites that answered
+        :param fetched_at: unix time the fetch started
+        :param job_urls: urls of the fetched jobs
+        :return: set of job urls the search did not return before
+        """
+        job_urls = list(job_urls)
+        with self._lock, self._connect() as conn:
+            known = self._known_urls(conn, job_urls, search_key)
+            conn.executemany(
+                "INSERT OR REPLACE INTO fetches (search_key, site, fetched_at) VALUES (?, ?, ?)",
+                [(search_key, site, fetched_at) for site in sites]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO search_results (search_key, job_url) VALUES (?, ?)",
+                [(search_key, url) for url in job_urls]
+            )
+        return set(job_urls) - known
+
+    def search_results(self, search_key, limit=DEFAULT_LIMIT):
+        """
+        stored jobs returned by a search so far, most recently seen first
+
+        :param self: object
+        :param search_key: key from search_key
+        :param limit: maximum number of rows
+        :return: dataframe with STORED_COLUMNS
+        """
+        columns = ", ".join(f"jobs.{column}" for column in STORED_COLUMNS)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {columns} FROM search_results"
+                " JOIN jobs ON jobs.job_url = search_results.job_url"
+                " WHERE search_results.search_key = ?"
+                " ORDER BY jobs.last_seen DESC, jobs.first_seen DESC LIMIT ?",
+                (search_key, limit)
+            ).fetchall()
+        return _to_frame(rows)
+
+    def get(self, job_url):
+        """
+        look up a stored job
+
+        :param self: object
+        :param job_url: job url
+        :return: job data dictionary or None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(STORED_COLUMNS)} FROM jobs WHERE job_url = ?", (job_url,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip(STORED_COLUMNS, row))
+        job["source_urls"] = json.loads(job["source_urls"]) if job["source_urls"] else []
+        return job
+
+    def description(self, job_url):
+        """
+        description of a stored job, without reading the other fields
+
+        :param self: object
+        :param job_url: job url
+        :return: description string or None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT description FROM jobs WHERE job_url = ?", (job_url,)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        """
+        number of stored jobs
+
+        :param self: object
+        :return: row count
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+def default_store():
+    """
+    shared job store in the user data dir
+
+    :return: JobStore
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = JobStore()
+        return _default_store
+
+
+def _to_frame(rows):
+    """
+    build a dataframe of stored job rows
+
+    :param rows: tuples in STORED_COLUMNS order
+    :return: dataframe with STORED_COLUMNS
+    """
+    df = pd.DataFrame(rows, columns=STORED_COLUMNS)
+    df["source_urls"] = [json.loads(urls) if urls else [] for urls in df["source_urls"]]
+    return df
+
+
+def _phrase(keyword):
+    """
+    quote a keyword as an FTS5 phrase, so its text is never read as query syntax
+
+    :param keyword: keyword string
+    :return: phrase string
+    """
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+def _location_key(location):
+    """
+    normalized location of a search, independent of location order and case
+
+    :param location: location string or list of location strings
+    :return: string, or sorted list of strings for several locations
+    """
+    if isinstance(location, str):
+        return location.strip().lower()
+    locations = sorted({place.strip().lower() for place in location})
+    # a single location keys like the plain string it used to be
+    return locations[0] if len(locations) == 1 else locations
+
+
+def _sql_value(value):
+    """
+    convert a dataframe value for sqlite, missing values become NULL
+
+    :param value: cell value
+    :return: str, int, float or None
+    """
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, (int, float, str)):
+        return value
+    # dates, timestamps and enums of jobspy
+    return str(value)
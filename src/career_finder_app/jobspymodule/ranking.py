@@ -0,0 +1,160 @@
+import logging
+import os
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+from career_finder_app.jobspymodule.dedup import tokenize
+from career_finder_app.tracing import traced
+
+K1 = 1.2
+B = 0.75
+
+# a keyword in the title counts this much more than one in the description
+TITLE_WEIGHT = 2.0
+# words of the sample letter are a weak hint next to the keyword chips
+LETTER_WEIGHT = 0.2
+
+# sentence-transformers model reordering the top rows, empty disables it
+RERANK_MODEL = os.environ.get("CAREER_FINDER_RERANK_MODEL", "")
+RERANK_TOP = 50
+
+log = logging.getLogger(__name__)
+
+_embedding_models = {}
+_embedding_lock = Lock()
+
+
+class BM25Index:
+    def __init__(self, texts, k1=K1, b=B):
+        """
+        BM25 index of one text field of a result set
+
+        the index keeps the tokens of every text, a query only counts the
+        (text, term) pairs of its own terms and is scored with a single
+        weighted bincount over those pairs.
+
+        :param self: object
+        :param texts: series of strings
+        :param k1: term frequency saturation
+        :param b: length normalization
+        """
+        self._doc, self._codes, vocabulary = tokenize(texts)
+        self.size = len(texts)
+        self.vocabulary = pd.Index(vocabulary)
+        self.k1 = k1
+
+        lengths = np.bincount(self._doc, minlength=self.size)
+        average = max(lengths.mean(), 1) if self.size else 1
+        self._norm = k1 * (1 - b + b * lengths / average)
+
+    def query_vector(self, weighted_texts):
+        """
+        weight of every vocabulary term in a query
+
+        :param self: object
+        :param weighted_texts: list of (text, weight), a term gets the highest weight it appears with
+        :return: float array over the vocabulary
+        """
+        query = np.zeros(len(self.vocabulary))
+        texts = pd.Series([text for text, _ in weighted_texts], dtype=object)
+        weights = np.array([weight for _, weight in weighted_texts], dtype=float)
+        doc, codes, vocabulary = tokenize(texts)
+
+        ids = self.vocabulary.get_indexer(vocabulary)[codes]
+        known = ids >= 0
+        np.maximum.at(query, ids[known], weights[doc[known]])
+        return query
+
+    def score(self, query):
+        """
+        BM25 score of every text
+
+        :param self: object
+        :param query: query_vector result
+        :return: float array of scores
+        """
+        asked = query[self._codes] > 0
+        terms = max(len(self.vocabulary), 1)
+        pairs, tf = np.unique(self._doc[asked] * terms + self._codes[asked], return_counts=True)
+        doc, term = pairs // terms, pairs % terms
+
+        document_frequency = np.bincount(term, minlength=len(self.vocabulary))[term]
+        idf = np.log1p((self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+        weight = idf * tf * (self.k1 + 1) / (tf + self._norm[doc])
+        return np.bincount(doc, weights=weight * query[term], minlength=self.size)
+
+
+@traced("rank_jobs")
+def rank_jobs(df, keywords, sample_letter="", rerank_model=RERANK_MODEL):
+    """
+    sort jobs by relevance to the keywords and the sample letter
+
+    title and description are scored by BM25 indexes built for this result
+    set, the top rows are optionally reordered by embedding similarity.
+
+    :param df: job results dataframe
+    :param keywords: list of keyword strings
+    :param sample_letter: user's sample cover letter string
+    :param rerank_model: sentence-transformers model name, empty to skip the rerank
+    :return: dataframe sorted by relevance with a score column
+    """
+    if df.empty:
+        return df.assign(score=pd.Series(dtype=float))
+
+    query = [(keyword, 1.0) for keyword in keywords]
+    if sample_letter:
+        query.append((sample_letter, LETTER_WEIGHT))
+
+    title = BM25Index(df["title"])
+    description = BM25Index(df["description"])
+    score = (
+        TITLE_WEIGHT * title.score(title.query_vector(query))
+        + description.score(description.query_vector(query))
+    )
+
+    order = np.argsort(-score, kind="stable")
+    ranked = df.iloc[order].reset_index(drop=True)
+    ranked["score"] = score[order]
+
+    if rerank_model:
+        try:
+            ranked = rerank(ranked, " ".join(keywords), rerank_model)
+        except Exception:
+            log.exception("Embedding rerank failed")
+    return ranked
+
+
+def rerank(ranked, query, model_name=RERANK_MODEL, top=RERANK_TOP):
+    """
+    reorder the top rows by embedding similarity to the query
+
+    :param ranked: dataframe sorted by score
+    :param query: query string
+    :param model_name: sentence-transformers model name
+    :param top: number of rows to reorder
+    :return: reordered dataframe
+    """
+    head = ranked.iloc[:top]
+    texts = (head["title"].fillna("").astype(str) + "\n" + head["description"].fillna("").astype(str)).tolist()
+
+    vectors = _embedding_model(model_name).encode([query] + texts, normalize_embeddings=True)
+    similarity = vectors[1:] @ vectors[0]
+    order = np.argsort(-similarity, kind="stable")
+    return pd.concat([head.iloc[order], ranked.iloc[top:]], ignore_index=True)
+
+
+def _embedding_model(name):
+    """
+    sentence-transformers model, loaded on first use
+
+    :param name: model name
+    :return: SentenceTransformer
+    """
+    with _embedding_lock:
+        if name not in _embedding_models:
+            from sentence_transformers import SentenceTransformer
+
+            _embedding_models[name] = SentenceTransformer(name)
+        return _embedding_models[name]
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+from threading import Lock, Thread
+
+from career_finder_app.diskcache import DiskCache, cache_dir
+from career_finder_app.jobspymodule import HOURS_OLD, RESULTS_WANTED, SITES, get_jobs
+from career_finder_app.jobspymodule.jobstore import default_store
+
+# results younger than this are served without touching the network
+DEFAULT_TTL = int(os.environ.get("CAREER_FINDER_SEARCH_TTL", 6 * 60 * 60))
+# older results are still shown while a refresh runs, up to this age
+DEFAULT_MAX_AGE = int(os.environ.get("CAREER_FINDER_SEARCH_MAX_AGE", 7 * 24 * 60 * 60))
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_default_cache = None
+_default_cache_lock = Lock()
+
+
+class ResultCache:
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        on-disk cache of job search results
+
+        :param self: object
+        :param path: sqlite file, defaults to searches.sqlite3 in the user cache dir
+        :param ttl: seconds a result is fresh
+        :param max_age: seconds a stale result may still be served
+        :param max_bytes: size bound of the cache file contents
+        """
+        self.ttl = ttl
+        self.max_age = max_age
+        self._store = DiskCache(
+            path or os.path.join(cache_dir(), "searches.sqlite3"),
+            max_bytes
+        )
+        self._refreshing = set()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(keywords, location, sites=SITES, hours_old=HOURS_OLD, results_wanted=RESULTS_WANTED):
+        """
+        build the cache key of a search
+
+        :param keywords: keywords list string, or a list of keywords searched separately
+        :param location: location string or list of location strings
+        :param sites: list of site names
+        :param hours_old: maximum posting age in hours
+        :param results_wanted: number of postings fetched per site
+        :return: key string
+        """
+        raw = json.dumps([
+            _normalize(keywords),
+            _normalize(location),
+            sorted(sites),
+            hours_old,
+            results_wanted,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """
+        look up cached results
+
+        :param self: object
+        :param key: key from make_key
+        :return: (dataframe, is_fresh) or None if missing or too old
+        """
+        hit = self._store.get(key)
+        if hit is None:
+            return None
+
+        df, age = hit
+        if age > self.max_age:
+            return None
+        return df, age <= self.ttl
+
+    def store(self, key, df):
+        """
+        store search results
+
+        :param self: object
+        :param key: key from make_key
+        :param df: job results dataframe
+        """
+        self._store.set(key, df)
+
+    def start_refresh(self, key):
+        """
+        claim the background refresh of a key
+
+        :param self: object
+        :param key: key from make_key
+        :return: False if a refresh of key is already running
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def finish_refresh(self, key):
+        """
+        release the background refresh of a key
+
+        :param self: object
+        :param key: key from make_key
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+
+def default_cache():
+    """
+    shared result cache in the user cache dir
+
+    :return: ResultCache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
+
+
+def get_jobs_cached(location, keywords, cache=None, on_refresh=None, **kwargs):
+    """
+    get_jobs behind the result cache, with stale-while-revalidate
+
+    fresh results are returned straight from the cache. Stale results are
+    returned at once while a background thread scrapes again, stores the
+    new results and passes them to on_refresh. A miss scrapes live. Only
+    the first page of a search is cached, calls with an offset always
+    scrape live. Every scraped job is also kept in the job store.
+
+    :param location: location string or list of location strings
+    :param keywords: keywords list string or list of keyword strings
+    :param cache: ResultCache, defaults to default_cache()
+    :param on_refresh: callback receiving the refreshed dataframe
+    :param kwargs: passed on to get_jobs
+    :return: job results dataframe
+    """
+    if kwargs.get("offset"):
+        return _scrape(location, keywords, kwargs)
+
+    cache = cache or default_cache()
+    key = cache.make_key(
+        keywords,
+        location,
+        results_wanted=kwargs.get("results_wanted", RESULTS_WANTED)
+    )
+
+    hit = cache.lookup(key)
+    if hit is not None:
+        df, fresh = hit
+        if not fresh and cache.start_refresh(key):
+            Thread(
+                target=_refresh,
+                args=(cache, key, location, keywords, on_refresh, kwargs),
+                daemon=True
+            ).start()
+        return df
+
+    df = _scrape(location, keywords, kwargs)
+    cache.store(key, df)
+    return df
+
+
+def _scrape(location, keywords, kwargs):
+    """
+    scrape live and keep the jobs in the job store
+
+    :param location: location string or list of location strings
+    :param keywords: keywords list string or list of keyword strings
+    :param kwargs: passed on to get_jobs
+    :return: job results dataframe
+    """
+    store = default_store()
+    on_site_result = kwargs.get("on_site_result")
+    if on_site_result is not None:
+        # partial results are listed at once, their descriptions are read
+        # back from the store
+        def store_and_report(site, df):
+            store.upsert(df)
+            on_site_result(site, df)
+
+        kwargs = dict(kwargs, on_site_result=store_and_report)
+
+    # every row tells the location it was found in
+    df = get_jobs(location=location, keywords=keywords, **kwargs)
+    store.upsert(df)
+    return df
+
+
+def _normalize(value):
+    """
+    key part of keywords or locations, independent of order and case
+
+    :param value: string or list of strings
+    :return: string, or sorted list of strings
+    """
+    if isinstance(value, str):
+        return value.strip().lower()
+    return sorted({part.strip().lower() for part in value})
+
+
+def refresh_search(location, keywords, cache=None, **kwargs):
+    """
+    scrape a search now and replace its cached results, blocking
+
+    :param location: location string or list of location strings
+    :param keywords: keywords list string or list of keyword strings
+    :param cache: ResultCache, defaults to default_cache()
+    :param kwargs: passed on to get_jobs
+    :return: job results dataframe
+    """
+    cache = cache or default_cache()
+    key = cache.make_key(
+        keywords,
+        location,
+        results_wanted=kwargs.get("results_wanted", RESULTS_WANTED)
+    )
+    df = _scrape(location, keywords, kwargs)
+    cache.store(key, df)
+    return df
+
+
+def _refresh(cache, key, location, keywords, on_refresh, kwargs):
+    """
+    scrape again in the background and update the cache
+
+    :param cache: ResultCache
+    :param key: key from make_key
+    :param location: location string or list of location strings
+    :param keywords: keywords list string or list of keyword strings
+    :param on_refresh: callback receiving the refreshed dataframe or None
+    :param kwargs: passed on to get_jobs
+    """
+    # per-site progress would flash partial results over the cached ones
+    kwargs = {k: v for k, v in kwargs.items() if k != "on_site_result"}
+    try:
+        df = _scrape(location, keywords, kwargs)
+        cache.store(key, df)
+    except Exception:
+        # keep serving the stale results, the next lookup tries again
+        return
+    finally:
+        cache.finish_refresh(key)
+
+    if on_refresh:
+        on_refresh(df)
@@ -0,0 +1,116 @@
+import json
+import os
+
+from career_finder_app.diskcache import data_dir
+
+
+def saved_searches_path():
+    """
+    file holding the saved searches
+
+    :return: path string
+    """
+    return os.path.join(data_dir(), "saved_searches.json")
+
+
+def load_saved_searches(path=None):
+    """
+    read the saved searches
+
+    :param path: json file, defaults to saved_searches_path()
+    :return: list of {"keywords": list of strings, "location": string or list of strings}
+    """
+    path = path or saved_searches_path()
+    if not os.path.exists(path):
+        return []
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_search(keywords, location, path=None):
+    """
+    add a search unless the same keywords and location are saved already
+
+    :param keywords: list of keyword strings
+    :param location: location string or list of location strings
+    :param path: json file, defaults to saved_searches_path()
+    :return: updated list of saved searches
+    """
+    searches = load_saved_searches(path)
+    search = {"keywords": list(keywords), "location": location if isinstance(location, str) else list(location)}
+    if _normalize(search) not in [_normalize(saved) for saved in searches]:
+        searches.append(search)
+        _write(searches, path)
+    return searches
+
+
+def remove_search(index, path=None):
+    """
+    remove a saved search
+
+    :param index: position in the list of saved searches
+    :param path: json file, defaults to saved_searches_path()
+    :return: updated list of saved searches
+    """
+    searches = load_saved_searches(path)
+    del searches[index]
+    _write(searches, path)
+    return searches
+
+
+def describe(search):
+    """
+    one line label of a saved search
+
+    :param search: saved search dictionary
+    :return: label string
+    """
+    return f"{', '.join(search['keywords'])} in {location_label(search['location'])}"
+
+
+def location_label(location):
+    """
+    readable form of a search location
+
+    :param location: location string or list of location strings
+    :return: label string
+    """
+    return location if isinstance(location, str) else ", ".join(location)
+
+
+def _normalize(search):
+    """
+    comparable form of a saved search
+
+    :param search: saved search dictionary
+    :return: tuple
+    """
+    return (
+        tuple(sorted(keyword.strip().lower() for keyword in search["keywords"])),
+        tuple(sorted({location.strip().lower() for location in _locations(search["location"])})),
+    )
+
+
+def _locations(location):
+    """
+    locations of a search as a list
+
+    :param location: location string or list of location strings
+    :return: list of location strings
+    """
+    return [location] if isinstance(location, str) else list(location)
+
+
+def _write(searches, path=None):
+    """
+    replace the saved searches file, readers never see a partial file
+
+    :param searches: list of saved searches
+    :param path: json file, defaults to saved_searches_path()
+    """
+    path = path or saved_searches_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(searches, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
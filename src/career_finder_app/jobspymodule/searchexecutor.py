@@ -0,0 +1,167 @@
+from itertools import count
+from threading import Event, Lock, Thread
+
+
+class SearchHandle:
+    def __init__(self, search_id):
+        """
+        handle for one submitted background search
+
+        :param self: object
+        :param search_id: increasing search id
+        """
+        self.search_id = search_id
+        self._cancel_event = Event()
+        self._done_event = Event()
+
+    @property
+    def cancelled(self):
+        """
+        whether the search was cancelled or superseded
+
+        :param self: object
+        :return: True if cancelled
+        """
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        cancel the search, late results will be dropped
+
+        :param self: object
+        """
+        self._cancel_event.set()
+
+    @property
+    def running(self):
+        """
+        whether the search function has not returned yet
+
+        :param self: object
+        :return: True while running
+        """
+        return not self._done_event.is_set()
+
+    def finish(self):
+        """
+        mark the search function as returned
+
+        :param self: object
+        """
+        self._done_event.set()
+
+
+class SearchExecutor:
+    def __init__(self, dispatch=None):
+        """
+        run searches on a background thread and hand results back
+
+        callbacks are delivered through dispatch, e.g. a function that
+        schedules them on the Kivy main thread with Clock.schedule_once.
+        Only the most recently submitted search delivers results, older
+        ones are cancelled and anything they produce later is dropped.
+
+        :param self: object
+        :param dispatch: function taking a no-arg callable to run it on the ui thread
+        """
+        self._dispatch = dispatch or (lambda callback: callback())
+        self._ids = count(1)
+        self._lock = Lock()
+        self._current = None
+
+    @property
+    def current(self):
+        """
+        handle of the latest submitted search
+
+        :param self: object
+        :return: SearchHandle or None
+        """
+        return self._current
+
+    def is_running(self, handle):
+        """
+        check that a handle belongs to the latest search and it is still running
+
+        :param self: object
+        :param handle: SearchHandle or None
+        :return: True if handle's search is current and has not returned
+        """
+        return handle is not None and self.is_current(handle) and handle.running
+
+    def is_current(self, handle):
+        """
+        check that a handle belongs to the latest, still active search
+
+        :param self: object
+        :param handle: SearchHandle
+        :return: True if results of handle should be shown
+        """
+        return handle is self._current and not handle.cancelled
+
+    def submit(self, target, on_done=None, on_progress=None, on_error=None):
+        """
+        start a new search, cancelling the one in flight
+
+        target is called on a worker thread as target(handle, report), it may
+        call report(partial) any number of times for progressive results and
+        its return value is passed to on_done.
+
+        :param self: object
+        :param target: search function
+        :param on_done: callback for the final result
+        :param on_progress: callback for partial results
+        :param on_error: callback for an exception raised by target
+        :return: SearchHandle
+        """
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+            handle = SearchHandle(next(self._ids))
+            self._current = handle
+
+        def report(partial):
+            self._deliver(handle, on_progress, partial)
+
+        def run():
+            try:
+                result = target(handle, report)
+            except Exception as e:
+                self._deliver(handle, on_error, e)
+                return
+            finally:
+                handle.finish()
+            self._deliver(handle, on_done, result)
+
+        Thread(target=run, daemon=True).start()
+        return handle
+
+    def cancel(self):
+        """
+        cancel the search in flight, if any
+
+        :param self: object
+        """
+        with self._lock:
+            if self._current is not None:
+                self._current.cancel()
+                self._current = None
+
+    def _deliver(self, handle, callback, value):
+        """
+        dispatch a callback unless its search went stale in the meantime
+
+        :param self: object
+        :param handle: SearchHandle the value belongs to
+        :param callback: callback or None
+        :param value: value passed to callback
+        """
+        if callback is None or handle.cancelled:
+            return
+
+        def deliver():
+            # check again on the receiving thread, cancel may have happened there
+            if self.is_current(handle):
+                callback(value)
+
+        self._dispatch(deliver)
@@ -0,0 +1,75 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# scrapes running at the same time over all sites
+SEARCH_CONCURRENCY = int(os.environ.get("CAREER_FINDER_SEARCH_CONCURRENCY", 6))
+
+
+class SearchScheduler:
+    def __init__(self, max_concurrency=SEARCH_CONCURRENCY):
+        """
+        run scrapes with a global concurrency cap
+
+        tasks start in the order given. There is no cap per site, the site
+        guard runs scrapes of the same site one at a time and gives up on
+        one waiting past its timeout, see SiteGuard.call.
+
+        :param self: object
+        :param max_concurrency: tasks running at the same time
+        """
+        self.max_concurrency = max(1, max_concurrency)
+
+    def run(self, tasks, on_done=None, on_error=None, timeouts=None, default_timeout=None):
+        """
+        run tasks and report each result, blocking until all are done
+
+        callbacks run on the calling thread. A task running past its
+        site's timeout is reported as a TimeoutError and no longer counts
+        against the cap, its thread is left to finish in the background.
+
+        :param self: object
+        :param tasks: list of (key, site, function without arguments)
+        :param on_done: callback (key, result) or None
+        :param on_error: callback (key, exception) or None
+        :param timeouts: dict of site to seconds from the start of a task
+        :param default_timeout: seconds for sites missing in timeouts, None waits forever
+        """
+        timeouts = timeouts or {}
+        queue = list(tasks)
+        running = {}
+
+        # timed out tasks keep their thread, so the pool may need more than the cap
+        pool = ThreadPoolExecutor(max_workers=max(1, len(queue)), thread_name_prefix="scrape")
+        try:
+            while queue or running:
+                while queue and len(running) < self.max_concurrency:
+                    key, site, function = queue.pop(0)
+                    timeout = timeouts.get(site, default_timeout)
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    running[pool.submit(function)] = (key, site, deadline)
+
+                deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+                wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    key, site, _ = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if on_error:
+                            on_error(key, e)
+                        continue
+                    if on_done:
+                        on_done(key, result)
+
+                now = time.monotonic()
+                for future, (key, site, deadline) in list(running.items()):
+                    if deadline is not None and deadline <= now:
+                        del running[future]
+                        if on_error:
+                            on_error(key, TimeoutError(f"{site} did not answer in time"))
+        finally:
+            # do not wait for timed out scrapes, their results are discarded
+            pool.shutdown(wait=False, cancel_futures=True)
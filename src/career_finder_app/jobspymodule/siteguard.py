@@ -0,0 +1,532 @@
+import json
+import logging
+import os
+import re
+import time
+from threading import Lock
+
+from career_finder_app.diskcache import cache_dir
+
+# scrapes per second a site is sent at most, and how many may go out at once
+SITE_RATES = {
+    "indeed": (0.5, 4),
+    "linkedin": (0.1, 2),
+    "google": (0.25, 4),
+}
+DEFAULT_RATE = (0.2, 2)
+# a site that blocks is slowed down to this share of its rate at most
+MIN_RATE_SHARE = 1 / 8
+# share of the full rate won back by every scrape that went through
+RATE_RECOVERY = 0.1
+# seconds a scrape waits for its turn before the site counts as unavailable
+ACQUIRE_TIMEOUT = 20
+
+# failed scrapes in a row that pause a site, a block pauses it at once
+FAILURE_THRESHOLD = 3
+# seconds a site is paused the first time, doubled every time it fails again
+COOLDOWN = 60
+MAX_COOLDOWN = 2 * 60 * 60
+
+# jobspy logs these instead of raising when a site turns it away
+BLOCKED_PATTERN = re.compile(r"\b(429|403)\b|blocked|too many requests|captcha", re.IGNORECASE)
+
+# jobspy logger of each site, see jobspy.util.create_logger
+SITE_LOGGERS = {
+    "indeed": "JobSpy:Indeed",
+    "linkedin": "JobSpy:LinkedIn",
+    "google": "JobSpy:Google",
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+log = logging.getLogger(__name__)
+
+_default_guard = None
+# the first scrapes of a search ask for the guard from several threads at once
+_default_guard_lock = Lock()
+
+
+class SiteUnavailable(Exception):
+    def __init__(self, site, retry_at=None, reason="paused"):
+        """
+        a site is not scraped right now
+
+        :param self: object
+        :param site: site name
+        :param retry_at: unix time the site is tried again, None if unknown
+        :param reason: why, shown in the message
+        """
+        self.site = site
+        self.retry_at = retry_at
+        when = f", retrying at {time.strftime('%H:%M', time.localtime(retry_at))}" if retry_at else ""
+        super().__init__(f"{site} {reason}{when}")
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, tokens=None):
+        """
+        token bucket rate limiter whose rate adapts to the site
+
+        slow_down() halves the rate down to MIN_RATE_SHARE of the full
+        rate, every speed_up() wins back RATE_RECOVERY of it.
+
+        :param self: object
+        :param rate: full rate in tokens per second
+        :param capacity: tokens that can be saved up
+        :param tokens: tokens at the start, defaults to a full bucket
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity if tokens is None else tokens
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self, timeout=None):
+        """
+        take a token, waiting until one is saved up
+
+        :param self: object
+        :param timeout: seconds to wait at most, None waits as long as needed
+        :return: False if no token was available in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._fill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+
+            if deadline is not None:
+                if time.monotonic() + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def slow_down(self):
+        """
+        halve the rate after the site pushed back
+
+        :param self: object
+        """
+        with self._lock:
+            self._fill()
+            self.rate = max(self.rate / 2, self.max_rate * MIN_RATE_SHARE)
+
+    def speed_up(self):
+        """
+        move the rate back towards the full rate after a scrape went through
+
+        :param self: object
+        """
+        with self._lock:
+            self._fill()
+            self.rate = min(self.rate + self.max_rate * RATE_RECOVERY, self.max_rate)
+
+    def _fill(self):
+        """
+        add the tokens saved up since the last call, hold the lock
+
+        :param self: object
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    def __init__(self, state=CLOSED, failures=0, trips=0, opened_until=0.0):
+        """
+        stop scraping a site that keeps failing, probe it again later
+
+        the breaker opens after FAILURE_THRESHOLD failures in a row, or at
+        once when the site blocked. While open no scrape is let through.
+        Once the cooldown is over it is half-open and lets one probe
+        through: success closes it, failure opens it again for twice as
+        long, up to MAX_COOLDOWN. Times are unix times so the state can
+        be kept between runs.
+
+        :param self: object
+        :param state: CLOSED, OPEN or HALF_OPEN
+        :param failures: failures in a row
+        :param trips: times opened in a row, sets the cooldown
+        :param opened_until: unix time the cooldown ends
+        """
+        self.state = state
+        self.failures = failures
+        self.trips = trips
+        self.opened_until = opened_until
+        self._probing = False
+
+    def allow(self, now=None):
+        """
+        whether a scrape may go out now, claims the probe when half-open
+
+        :param self: object
+        :param now: unix time, defaults to time.time()
+        :return: True if the scrape may go out
+        """
+        now = time.time() if now is None else now
+        if self.state == OPEN and now >= self.opened_until:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def cancel(self):
+        """
+        the scrape let through did not go out, a probe may be sent again
+
+        :param self: object
+        """
+        self._probing = False
+
+    def record_success(self):
+        """
+        the scrape went through, close the breaker
+
+        :param self: object
+        """
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probing = False
+
+    def record_failure(self, blocked=False, now=None):
+        """
+        the scrape failed, open the breaker if the site is failing
+
+        :param self: object
+        :param blocked: the site turned the scrape away, opens at once
+        :param now: unix time, defaults to time.time()
+        :return: True if the breaker opened
+        """
+        now = time.time() if now is None else now
+        self.failures += 1
+        self._probing = False
+        if self.state == OPEN:
+            # a scrape sent before the breaker opened, already counted
+            return False
+        if not blocked and self.state == CLOSED and self.failures < FAILURE_THRESHOLD:
+            return False
+
+        self.trips += 1
+        self.state = OPEN
+        self.opened_until = now + self.cooldown
+        return True
+
+    @property
+    def cooldown(self):
+        """
+        seconds the breaker stays open this time
+
+        :param self: object
+        :return: seconds
+        """
+        return min(COOLDOWN * 2 ** max(self.trips - 1, 0), MAX_COOLDOWN)
+
+    def to_dict(self):
+        """
+        state to keep between runs
+
+        :param self: object
+        :return: json serializable dictionary
+        """
+        # a probe running when the app quit never reported back
+        state = OPEN if self.state == HALF_OPEN else self.state
+        return {
+            "state": state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "opened_until": self.opened_until,
+        }
+
+
+class SiteGuard:
+    def __init__(self, path=None, rates=None):
+        """
+        rate limiter and circuit breaker of every site
+
+        state is written to a json file whenever a breaker or a rate
+        changes and read back on start, so a site that blocked is left
+        alone after a restart too.
+
+        :param self: object
+        :param path: json file, defaults to site_health.json in the user cache dir
+        :param rates: dict of site to (scrapes per second, burst), defaults to SITE_RATES
+        """
+        self.path = path or os.path.join(cache_dir(), "site_health.json")
+        self.rates = rates or SITE_RATES
+        self._buckets = {}
+        self._breakers = {}
+        self._site_locks = {}
+        self._lock = Lock()
+        self._load()
+
+    def call(self, sites, function, deadline=None):
+        """
+        run a scrape of some sites through their limiters and breakers
+
+        sites that are paused are left out, the scrape runs once a token
+        of every remaining site was taken. Afterwards each site's jobspy
+        error log tells whether it failed or blocked. jobspy logs from its
+        own worker threads, so scrapes of the same site run one at a time
+        to keep their errors apart. A scrape whose caller gave up before
+        its turn came is not sent.
+
+        :param self: object
+        :param sites: list of site names
+        :param function: function (list of sites) returning a dataframe
+        :param deadline: time.monotonic() the caller stops waiting at, None waits as long as needed
+        :return: dataframe
+        """
+        allowed = []
+        with self._lock:
+            for site in sites:
+                if self._breaker(site).allow():
+                    allowed.append(site)
+        if not allowed:
+            site = sites[0]
+            raise SiteUnavailable(site, self._breaker(site).opened_until)
+
+        with self._lock:
+            # taken in the same order by every call
+            site_locks = [(site, self._site_lock(site)) for site in sorted(allowed)]
+        held = []
+        try:
+            for site, site_lock in site_locks:
+                if not site_lock.acquire(timeout=_remaining(deadline, -1)):
+                    self._cancel(allowed)
+                    raise SiteUnavailable(site, reason="busy with another search")
+                held.append(site_lock)
+            return self._call(allowed, function, deadline)
+        finally:
+            for site_lock in reversed(held):
+                site_lock.release()
+
+    def _call(self, allowed, function, deadline):
+        """
+        run a scrape of sites let through, hold their site locks
+
+        :param self: object
+        :param allowed: list of site names
+        :param function: function (list of sites) returning a dataframe
+        :param deadline: time.monotonic() the caller stops waiting at, or None
+        :return: dataframe
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            # the caller stopped waiting while an earlier scrape held the site
+            self._cancel(allowed)
+            raise SiteUnavailable(allowed[0], reason="given up on before its turn")
+
+        for site in allowed:
+            if not self._bucket(site).acquire(min(ACQUIRE_TIMEOUT, _remaining(deadline, ACQUIRE_TIMEOUT))):
+                self._cancel(allowed)
+                raise SiteUnavailable(site, reason="rate limited")
+
+        collector = _ErrorCollector()
+        loggers = [logging.getLogger(SITE_LOGGERS.get(site, "")) for site in allowed]
+        for logger in loggers:
+            logger.addHandler(collector)
+        try:
+            jobs = function(allowed)
+        except Exception:
+            self._report(allowed, collector.messages, rows={}, failed=True)
+            raise
+        finally:
+            for logger in loggers:
+                logger.removeHandler(collector)
+
+        rows = jobs["site"].value_counts().to_dict() if "site" in jobs else {}
+        blocked = self._report(allowed, collector.messages, rows)
+        if jobs.empty and blocked and len(blocked) == len(allowed):
+            raise SiteUnavailable(blocked[0], self._breaker(blocked[0]).opened_until, reason="blocked the search")
+        return jobs
+
+    def _cancel(self, sites):
+        """
+        scrapes let through did not go out, give back their probes
+
+        :param self: object
+        :param sites: list of site names
+        """
+        with self._lock:
+            for site in sites:
+                self._breaker(site).cancel()
+
+    def status(self, site):
+        """
+        current state of a site
+
+        :param self: object
+        :param site: site name
+        :return: (breaker state, scrapes per second)
+        """
+        with self._lock:
+            return self._breaker(site).state, self._bucket(site).rate
+
+    def _report(self, sites, messages, rows, failed=False):
+        """
+        update limiters and breakers with the outcome of a scrape
+
+        :param self: object
+        :param sites: sites that were scraped
+        :param messages: dict of logger name to list of error messages
+        :param rows: dict of site to rows returned
+        :param failed: the scrape raised
+        :return: list of sites that blocked
+        """
+        blocked = []
+        with self._lock:
+            for site in sites:
+                errors = messages.get(SITE_LOGGERS.get(site, ""), [])
+                breaker = self._breaker(site)
+                if any(BLOCKED_PATTERN.search(message) for message in errors):
+                    blocked.append(site)
+                    self._bucket(site).slow_down()
+                    opened = breaker.record_failure(blocked=True)
+                elif failed or (errors and not rows.get(site)):
+                    opened = breaker.record_failure()
+                else:
+                    breaker.record_success()
+                    self._bucket(site).speed_up()
+                    continue
+
+                if opened:
+                    log.warning(
+                        "Pausing %s for %d min after it failed: %s",
+                        site,
+                        breaker.cooldown // 60,
+                        errors[-1] if errors else "error"
+                    )
+            self._save()
+        return blocked
+
+    def _bucket(self, site):
+        """
+        token bucket of a site, hold the lock
+
+        :param self: object
+        :param site: site name
+        :return: TokenBucket
+        """
+        if site not in self._buckets:
+            rate, capacity = self.rates.get(site, DEFAULT_RATE)
+            self._buckets[site] = TokenBucket(rate, capacity)
+        return self._buckets[site]
+
+    def _site_lock(self, site):
+        """
+        lock held while a site is scraped, hold the lock
+
+        :param self: object
+        :param site: site name
+        :return: Lock
+        """
+        if site not in self._site_locks:
+            self._site_locks[site] = Lock()
+        return self._site_locks[site]
+
+    def _breaker(self, site):
+        """
+        circuit breaker of a site, hold the lock
+
+        :param self: object
+        :param site: site name
+        :return: CircuitBreaker
+        """
+        if site not in self._breakers:
+            self._breakers[site] = CircuitBreaker()
+        return self._breakers[site]
+
+    def _load(self):
+        """
+        read the state kept by an earlier run
+
+        :param self: object
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for site, state in saved.items():
+            try:
+                self._breakers[site] = CircuitBreaker(
+                    state["state"],
+                    state["failures"],
+                    state["trips"],
+                    state["opened_until"]
+                )
+                bucket = self._bucket(site)
+                bucket.rate = min(max(state["rate"], bucket.max_rate * MIN_RATE_SHARE), bucket.max_rate)
+                if bucket.rate < bucket.max_rate:
+                    # a full bucket would let a restarted app burst into a site that pushed back
+                    bucket.tokens = min(bucket.tokens, 1)
+            except (KeyError, TypeError):
+                continue
+
+    def _save(self):
+        """
+        write the state for the next run, hold the lock
+
+        :param self: object
+        """
+        state = {
+            site: dict(breaker.to_dict(), rate=self._bucket(site).rate)
+            for site, breaker in self._breakers.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not save site state: %s", e)
+
+
+class _ErrorCollector(logging.Handler):
+    def __init__(self):
+        """
+        keep the error messages jobspy logs during a scrape
+
+        :param self: object
+        """
+        super().__init__(logging.ERROR)
+        self.messages = {}
+
+    def emit(self, record):
+        self.messages.setdefault(record.name, []).append(record.getMessage())
+
+
+def _remaining(deadline, default):
+    """
+    seconds left until a deadline
+
+    :param deadline: time.monotonic() value or None
+    :param default: returned without a deadline
+    :return: seconds, at least 0
+    """
+    if deadline is None:
+        return default
+    return max(0.0, deadline - time.monotonic())
+
+
+def default_guard():
+    """
+    shared site guard keeping its state in the user cache dir
+
+    :return: SiteGuard
+    """
+    global _default_guard
+    with _default_guard_lock:
+        if _default_guard is None:
+            _default_guard = SiteGuard()
+        return _default_guard
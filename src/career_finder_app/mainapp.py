@@ -1,12 +1,35 @@
 from kivy.config import Config
 Config.set('input', 'mouse', 'mouse,multitouch_on_demand')
 
+import os
+from importlib import import_module
+
 from kivymd.app import MDApp
 from kivymd.uix.screenmanager import MDScreenManager
 
-from career_finder_app.ui.formscreen import FormScreen
-from career_finder_app.ui.resultscreen import ResultScreen
-from career_finder_app.ui.coverletterscreen import CoverLetterScreen
+# screens are imported and built the first time they are shown, so the
+# search and inference backends they pull in do not slow down startup
+SCREENS = {
+    "form": ("career_finder_app.ui.formscreen", "FormScreen"),
+    "result": ("career_finder_app.ui.resultscreen", "ResultScreen"),
+    "cover_letter": ("career_finder_app.ui.coverletterscreen", "CoverLetterScreen"),
+}
+
+
+class LazyScreenManager(MDScreenManager):
+    def get_screen(self, name):
+        """
+        return a screen, building it on first access
+
+        :param self: object
+        :param name: screen name
+        :return: screen
+        """
+        if name in SCREENS and not self.has_screen(name):
+            module_name, class_name = SCREENS[name]
+            screen_class = getattr(import_module(module_name), class_name)
+            self.add_widget(screen_class(name=name))
+        return super().get_screen(name)
 
 
 class MyApp(MDApp):
@@ -24,12 +47,37 @@ class MyApp(MDApp):
         from kivy.core.window import Window
         Window.softinput_mode = "below_target"
 
-        sm = MDScreenManager()
-        sm.add_widget(FormScreen(name="form"))
-        sm.add_widget(ResultScreen(name="result"))
-        sm.add_widget(CoverLetterScreen(name="cover_letter"))
+        sm = LazyScreenManager()
+        sm.get_screen("form")
         return sm
 
+    def on_start(self):
+        """
+        warm up the cover letter backend once the form is shown, add the
+        timings overlay when tracing is on
+
+        :param self: object
+        """
+        from kivy.clock import Clock
+        Clock.schedule_once(lambda dt: self._warm_up())
+
+        # timings overlay, F12 toggles it while tracing is on
+        from career_finder_app import tracing
+        if tracing.enabled():
+            from career_finder_app.ui.traceoverlay import TraceOverlay
+            self.trace_overlay = TraceOverlay()
+            if os.environ.get("CAREER_FINDER_TRACE_OVERLAY", "") not in ("", "0"):
+                self.trace_overlay.show()
+
+    def _warm_up(self):
+        """
+        start loading the local model, after the first frame so it does not delay it
+
+        :param self: object
+        """
+        from career_finder_app.aiintegration.backends import warm_up
+        warm_up()
+
 
 if __name__ == "__main__":
-    MyApp().run()
\ No newline at end of file
+    MyApp().run()
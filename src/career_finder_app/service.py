@@ -0,0 +1,225 @@
+"""
+job search and cover letter generation without a user interface
+
+the app screens, the command line and scripts all go through these
+functions. Nothing here imports kivy.
+"""
+import json
+import os
+import re
+
+from career_finder_app.jobspymodule import RESULTS_WANTED
+
+FORMATS = ("json", "csv", "parquet")
+
+# a \/ escape in json text, not preceded by an escaped backslash
+_ESCAPED_SLASH = re.compile(r"(?<!\\)((?:\\\\)*)\\/")
+
+
+def search_jobs(keywords, location, results_wanted=RESULTS_WANTED, sample_letter="", incremental=False, on_progress=None):
+    """
+    search the job sites, most relevant jobs first
+
+    cached results are returned at once, see get_jobs_cached. In incremental
+    mode only postings new since the last run of the search are fetched and
+    returned together with the earlier results, is_new marks the new ones.
+
+    :param keywords: list of keyword strings, each searched separately
+    :param location: location string or list of location strings
+    :param results_wanted: postings per site
+    :param sample_letter: user's sample cover letter, used for ranking
+    :param incremental: only fetch postings new since the last search
+    :param on_progress: callback receiving ranked partial or refreshed results
+    :return: ranked job results dataframe
+    """
+    from career_finder_app.jobspymodule.ranking import rank_jobs
+
+    rank = lambda df: rank_jobs(df, keywords, sample_letter)
+    report = (lambda df: on_progress(rank(df))) if on_progress else None
+
+    if incremental:
+        from career_finder_app.jobspymodule.incremental import get_jobs_incremental
+
+        return rank(get_jobs_incremental(
+            location,
+            keywords,
+            on_stored=report,
+            results_wanted=results_wanted
+        ))
+
+    from career_finder_app.jobspymodule.resultcache import get_jobs_cached
+
+    return rank(get_jobs_cached(
+        location=location,
+        keywords=list(keywords),
+        results_wanted=results_wanted,
+        on_refresh=report,
+        fan_out=True,
+        on_site_result=(lambda site, df: report(df)) if report else None
+    ))
+
+
+def fetch_more_jobs(keywords, location, offset, results_wanted=RESULTS_WANTED, sample_letter=""):
+    """
+    scrape a further page of a search, most relevant jobs first
+
+    :param keywords: list of keyword strings, each searched separately
+    :param location: location string or list of location strings
+    :param offset: postings per site to skip
+    :param results_wanted: postings per site
+    :param sample_letter: user's sample cover letter, used for ranking
+    :return: ranked job results dataframe
+    """
+    from career_finder_app.jobspymodule.ranking import rank_jobs
+    from career_finder_app.jobspymodule.resultcache import get_jobs_cached
+
+    df = get_jobs_cached(
+        location=location,
+        keywords=list(keywords),
+        results_wanted=results_wanted,
+        offset=offset,
+        fan_out=True
+    )
+    return rank_jobs(df, keywords, sample_letter)
+
+
+def search_saved_jobs(keywords, location=None, sample_letter=""):
+    """
+    search the jobs fetched before, without network access
+
+    :param keywords: list of keyword strings
+    :param location: only jobs searched in this location or list of locations, None for all
+    :param sample_letter: user's sample cover letter, used for ranking
+    :return: ranked job results dataframe
+    """
+    from career_finder_app.jobspymodule.jobstore import default_store
+    from career_finder_app.jobspymodule.ranking import rank_jobs
+
+    return rank_jobs(default_store().search(keywords, location=location), keywords, sample_letter)
+
+
+def generate_cover_letter(job, sample_letter, regenerate=False):
+    """
+    generate a letter for one job
+
+    :param job: job data dictionary
+    :param sample_letter: user's sample cover letter string
+    :param regenerate: skip the letter cache
+    :return: letter string
+    """
+    from career_finder_app.aiintegration.huggingfaceinference import get_modified_coverletter
+
+    return get_modified_coverletter(job.get("description", "") or "", sample_letter, regenerate=regenerate)
+
+
+def generate_cover_letters(jobs, sample_letter, folder=None, max_concurrency=None, on_progress=None, regenerate=False):
+    """
+    generate a letter for every job into a folder, see generate_letters
+
+    :param jobs: list of job data dictionaries
+    :param sample_letter: user's sample cover letter string
+    :param folder: output folder, defaults to a new folder in the user's documents
+    :param max_concurrency: letters generated at the same time
+    :param on_progress: callback (index, status, detail)
+    :param regenerate: skip the letter cache
+    :return: (folder, list of (status, detail) in job order)
+    """
+    from career_finder_app.aiintegration.batchgeneration import (
+        DEFAULT_CONCURRENCY,
+        default_output_dir,
+        generate_letters,
+    )
+
+    folder = folder or default_output_dir()
+    results = generate_letters(
+        jobs,
+        sample_letter,
+        folder=folder,
+        max_concurrency=max_concurrency or DEFAULT_CONCURRENCY,
+        on_progress=on_progress,
+        regenerate=regenerate
+    )
+    return folder, results
+
+
+def output_format(path, format=None):
+    """
+    file format of a path
+
+    :param path: file path
+    :param format: explicit format, wins over the extension
+    :return: one of FORMATS
+    """
+    format = format or os.path.splitext(path)[1].lstrip(".").lower()
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}, use one of {', '.join(FORMATS)}")
+    return format
+
+
+def write_jobs(df, path, format=None):
+    """
+    write job results to a file or stdout
+
+    :param df: job results dataframe
+    :param path: file path, "-" for stdout
+    :param format: json, csv or parquet, defaults to the file extension
+    """
+    format = output_format(path, format or ("json" if path == "-" else None))
+    df = df.copy()
+    if "source_urls" in df:
+        # lists are not a csv or parquet friendly cell type everywhere
+        df["source_urls"] = df["source_urls"].map(
+            lambda urls: " ".join(urls) if isinstance(urls, list) else urls
+        )
+
+    if format == "json":
+        text = df.to_json(
+            orient="records",
+            date_format="iso",
+            force_ascii=False,
+            indent=2
+        )
+        # pandas writes urls as https:\/\/..., keep them readable
+        _write_text(_ESCAPED_SLASH.sub(r"\1/", text), path)
+    elif format == "csv":
+        _write_text(df.to_csv(index=False), path)
+    else:
+        if path == "-":
+            raise ValueError("Parquet output needs a file path")
+        df.to_parquet(path, index=False)
+
+
+def read_jobs(path, format=None):
+    """
+    read job results written by write_jobs
+
+    :param path: file path
+    :param format: json, csv or parquet, defaults to the file extension
+    :return: list of job data dictionaries
+    """
+    import pandas as pd
+
+    format = output_format(path, format)
+    if format == "json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if format == "csv":
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_parquet(path)
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def _write_text(text, path):
+    """
+    write text to a file or stdout
+
+    :param text: string
+    :param path: file path, "-" for stdout
+    """
+    if path == "-":
+        print(text)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
@@ -0,0 +1,147 @@
+"""
+single-flight calls: concurrent callers of the same request share one call
+
+a scrape or generation that is already running for a key is joined
+instead of being started again, every caller gets its result or its
+exception. Progress the call publishes, e.g. per-site results, reaches
+every caller too, callers joining late first get what was published
+before. Keys are forgotten as soon as the call finishes, so a later call
+runs again.
+"""
+import logging
+from concurrent.futures import Future
+from threading import Lock
+
+from career_finder_app.tracing import span
+
+log = logging.getLogger(__name__)
+
+
+class _Flight:
+    def __init__(self):
+        """
+        state of one running call
+
+        :param self: object
+        """
+        self.future = Future()
+        self.events = []
+        self.listeners = []
+        self.lock = Lock()
+
+    @property
+    def listened(self):
+        """
+        whether any caller listens to published events
+
+        :param self: object
+        :return: bool
+        """
+        with self.lock:
+            return bool(self.listeners)
+
+    def publish(self, *event, slot=None):
+        """
+        pass an event to every caller's listener
+
+        :param self: object
+        :param event: listener arguments
+        :param slot: callers joining later only get the last event of a slot, None keeps every event
+        """
+        with self.lock:
+            if slot is not None:
+                self.events = [(kept, earlier) for kept, earlier in self.events if kept != slot]
+            self.events.append((slot, event))
+            for callback, is_leader in self.listeners:
+                if is_leader:
+                    callback(*event)
+                else:
+                    _notify(callback, event)
+
+
+class SingleFlight:
+    def __init__(self, name):
+        """
+        group of calls deduplicated by key
+
+        :param self: object
+        :param name: name used in traces
+        """
+        self.name = name
+        self._calls = {}
+        self._lock = Lock()
+
+    def do(self, key, function, share=None, listener=None):
+        """
+        call function unless a call with the same key is running, blocking
+
+        the first caller runs function on its own thread, callers arriving
+        while it runs wait for it and get the same result. function is
+        called with the running flight, every event passed to its
+        publish(*event) reaches the listener of each caller as
+        listener(*event), on the thread that published it. Its listened
+        property tells whether anyone listens. A failing listener of a
+        joined caller is reported and does not stop the call.
+
+        :param self: object
+        :param key: hashable request key
+        :param function: function (flight) returning the result
+        :param share: function making each caller's own copy of the result, e.g. for dataframes
+        :param listener: this caller's callback for published events, or None
+        :return: result of the call
+        """
+        share = share or (lambda result: result)
+        with self._lock:
+            flight = self._calls.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._calls[key] = _Flight()
+
+        if listener is not None:
+            with flight.lock:
+                if not leader:
+                    # events published before this caller joined
+                    for _, event in flight.events:
+                        _notify(listener, event)
+                flight.listeners.append((listener, leader))
+
+        if not leader:
+            with span(f"{self.name}.joined"):
+                return share(flight.future.result())
+
+        try:
+            result = function(flight)
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            flight.future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._calls[key]
+        flight.future.set_result(result)
+        return share(result)
+
+    def in_flight(self, key):
+        """
+        whether a call with key is running
+
+        :param self: object
+        :param key: hashable request key
+        :return: True if running
+        """
+        with self._lock:
+            return key in self._calls
+
+
+def _notify(listener, event):
+    """
+    pass an event to a joined caller's listener
+
+    :param listener: callback
+    :param event: tuple of arguments
+    """
+    try:
+        listener(*event)
+    except Exception:
+        log.exception("Listener of a joined call failed")
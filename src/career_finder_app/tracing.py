@@ -0,0 +1,199 @@
+"""
+lightweight timing spans
+
+set CAREER_FINDER_TRACE=1 to record spans to trace.jsonl in the user cache
+dir, or to a file path to record there. While tracing is off span() hands
+out one shared do-nothing context manager, so instrumented code only pays
+for a function call.
+
+    with span("get_jobs.scrape", site="indeed"):
+        ...
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from functools import wraps
+
+# durations kept per span name for the session statistics
+HISTORY = 500
+
+_enabled = False
+_path = None
+_file = None
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=HISTORY))
+_last = {}
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Span:
+    def __init__(self, name, attrs):
+        """
+        one timed section, recorded when the with block ends
+
+        :param self: object
+        :param name: span name
+        :param attrs: extra fields of the record
+        """
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        record(self.name, duration, started=self.started, **self.attrs)
+        return False
+
+
+def enable(path=None):
+    """
+    start recording spans
+
+    :param path: jsonl file, defaults to trace.jsonl in the user cache dir
+    """
+    global _enabled, _path, _file
+    from career_finder_app.diskcache import cache_dir
+
+    with _lock:
+        if _file is not None:
+            _file.close()
+        _path = path or os.path.join(cache_dir(), "trace.jsonl")
+        _file = open(_path, "a", encoding="utf-8")
+        _enabled = True
+
+
+def disable():
+    """
+    stop recording spans, the session statistics are kept
+    """
+    global _enabled, _file
+    with _lock:
+        _enabled = False
+        if _file is not None:
+            _file.close()
+            _file = None
+
+
+def enabled():
+    """
+    whether spans are recorded
+
+    :return: bool
+    """
+    return _enabled
+
+
+def span(name, **attrs):
+    """
+    time a with block
+
+    :param name: span name
+    :param attrs: extra fields of the record
+    :return: context manager
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return Span(name, attrs)
+
+
+def traced(name):
+    """
+    decorator timing every call of a function
+
+    :param name: span name
+    :return: decorator
+    """
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with Span(name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name, duration, started=None, **attrs):
+    """
+    record a span measured by the caller, e.g. the time to a first token
+
+    :param name: span name
+    :param duration: seconds
+    :param started: unix time the span started, defaults to now - duration
+    :param attrs: extra fields of the record
+    """
+    if not _enabled:
+        return
+
+    entry = {
+        "name": name,
+        "start": started if started is not None else time.time() - duration,
+        "ms": round(duration * 1000, 3),
+        "thread": threading.current_thread().name,
+    }
+    entry.update(attrs)
+    line = json.dumps(entry, default=str)
+
+    with _lock:
+        _durations[name].append(duration)
+        _last[name] = duration
+        if _file is not None:
+            _file.write(line + "\n")
+            _file.flush()
+
+
+def stats():
+    """
+    timings of the session per span name
+
+    :return: dict of name to {"count", "last", "p50", "p95"}, durations in seconds
+    """
+    with _lock:
+        snapshot = {name: (list(durations), _last[name]) for name, durations in _durations.items()}
+
+    result = {}
+    for name, (durations, last) in snapshot.items():
+        durations.sort()
+        result[name] = {
+            "count": len(durations),
+            "last": last,
+            "p50": _percentile(durations, 0.5),
+            "p95": _percentile(durations, 0.95),
+        }
+    return result
+
+
+def _percentile(values, fraction):
+    """
+    nearest rank percentile of sorted values
+
+    :param values: sorted list
+    :param fraction: 0 to 1
+    :return: value
+    """
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+_setting = os.environ.get("CAREER_FINDER_TRACE", "")
+if _setting and _setting != "0":
+    enable(None if _setting == "1" else _setting)
@@ -5,11 +5,15 @@ from kivymd.uix.textfield import MDTextField
 from kivymd.uix.button import MDRaisedButton, MDFlatButton
 from kivymd.uix.scrollview import MDScrollView
 from kivy.metrics import dp
-from threading import Thread
+from threading import Event, Lock, Thread
+import time
 from kivy.clock import Clock
 from kivy.core.clipboard import Clipboard
-from career_finder_app.aiintegration.huggingfaceinference import get_modified_coverletter
+from career_finder_app import tracing
+from career_finder_app.aiintegration.sampleletter import save_sample_letter
 
+# streamed text is added to the output this often instead of per token
+FLUSH_INTERVAL = 0.1
 
 
 
@@ -17,6 +21,19 @@ class CoverLetterScreen(MDScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.job_data = None
+        self.batch_jobs = None
+        self._batch_cancel = None
+        self._batch_status = []
+
+        # streaming state, chunks are buffered by the worker thread and
+        # flushed into the output field on the ui thread
+        self._generation = 0
+        self._stream = None
+        self._stop_requested = False
+        self._streamed = False
+        self._pending_chunks = []
+        self._chunks_lock = Lock()
+        self._flush_event = None
 
         # Main layout
         main_layout = MDBoxLayout(orientation="vertical", padding=20, spacing=15)
@@ -87,7 +104,7 @@ class CoverLetterScreen(MDScreen):
 
         # Center - Generate button
         center_section = MDBoxLayout(
-            orientation="vertical", size_hint_x=0.1, padding=(0, 100, 0, 0)
+            orientation="vertical", size_hint_x=0.1, padding=(0, 100, 0, 0), spacing=10
         )
 
         self.generate_btn = MDRaisedButton(
@@ -98,6 +115,24 @@ class CoverLetterScreen(MDScreen):
         )
         center_section.add_widget(self.generate_btn)
 
+        self.stop_btn = MDFlatButton(
+            text="Stop",
+            size_hint=(1, None),
+            height="48dp",
+            disabled=True,
+            on_release=self.stop_generation,
+        )
+        center_section.add_widget(self.stop_btn)
+
+        # skips the letter cache
+        self.regenerate_btn = MDFlatButton(
+            text="Regenerate",
+            size_hint=(1, None),
+            height="48dp",
+            on_release=lambda x: self.generate_cover_letter(x, regenerate=True),
+        )
+        center_section.add_widget(self.regenerate_btn)
+
         content_layout.add_widget(center_section)
 
         # Right side - Output section
@@ -156,10 +191,11 @@ class CoverLetterScreen(MDScreen):
         set job data for application screen
 
         :param self: object
-        :param job_data: job data dictionary
+        :param job_data: JobRecord or job data dictionary
         """
 
         self.job_data = job_data
+        self.batch_jobs = None
 
         # Update job info display
         company = job_data.get("company", "N/A")
@@ -172,26 +208,194 @@ class CoverLetterScreen(MDScreen):
         self.input_field.text = ""
         self.output_field.text = ""  # Blank initially
 
-    def generate_cover_letter(self, instance):
+    def set_batch_jobs(self, jobs):
+        """
+        set several jobs to generate letters for from one sample letter
+
+        :param self: object
+        :param jobs: list of JobRecord or job data dictionaries
+        """
+        self.job_data = None
+        self.batch_jobs = list(jobs)
+
+        self.job_info_label.text = f"Applying to {len(self.batch_jobs)} selected jobs"
+
+        # Clear previous content
+        self.input_field.text = ""
+        self.output_field.text = ""
+
+    def generate_cover_letter(self, instance, regenerate=False):
         """
         generate cover letter based on job data and user input
         
         :param self: object
         :param instance: widget instance
+        :param regenerate: generate a new letter even if one is cached
         """
         if not self.input_field.text.strip():
             self.output_field.text = "Please enter your information first."
             return
 
+        # kept for ranking searches, the field is cleared when a job is picked
+        save_sample_letter(self.input_field.text)
+
         # Disable button during generation
         self.generate_btn.disabled = True
         self.generate_btn.text = "Generating"
+        self.regenerate_btn.disabled = True
+        self.stop_btn.disabled = False
         self.output_field.text = "Generating your cover letter..."
 
+        if self.batch_jobs:
+            self._start_batch(regenerate)
+            return
+
+        # a new generation ignores chunks still arriving from an older one
+        self._generation += 1
+        self._stream = None
+        self._stop_requested = False
+        self._streamed = False
+        with self._chunks_lock:
+            self._pending_chunks = []
+        self._flush_event = Clock.schedule_interval(self._flush_chunks, FLUSH_INTERVAL)
+
         # Run in thread to avoid blocking UI
-        thread = Thread(target=self._generate_in_background)
+        thread = Thread(
+            target=self._generate_in_background,
+            args=(self._generation, regenerate),
+            daemon=True
+        )
         thread.start()
 
+    def stop_generation(self, instance):
+        """
+        stop the running generation, keeping the text received so far
+
+        :param self: object
+        :param instance: widget instance
+        """
+        self._stop_requested = True
+        if self._stream is not None:
+            self._stream.close()
+        if self._batch_cancel is not None:
+            # letters already being generated still finish
+            self._batch_cancel.set()
+
+    def _start_batch(self, regenerate):
+        """
+        generate letters for all batch jobs on a background thread
+
+        :param self: object
+        :param regenerate: skip the letter cache
+        """
+        from career_finder_app.aiintegration.batchgeneration import QUEUED, default_output_dir
+
+        self._generation += 1
+        self._batch_cancel = Event()
+        self._batch_status = [QUEUED] * len(self.batch_jobs)
+        self._render_batch_status()
+
+        thread = Thread(
+            target=self._generate_batch_in_background,
+            args=(
+                self._generation,
+                self.batch_jobs,
+                self.input_field.text,
+                default_output_dir(),
+                regenerate,
+                self._batch_cancel,
+            ),
+            daemon=True
+        )
+        thread.start()
+
+    def _generate_batch_in_background(self, generation, jobs, sample_coverletter, folder, regenerate, cancel_event):
+        """
+        background thread generating the batch letters
+
+        :param self: object
+        :param generation: id of the generation this thread serves
+        :param jobs: list of job data dictionaries
+        :param sample_coverletter: user's sample cover letter string
+        :param folder: output folder
+        :param regenerate: skip the letter cache
+        :param cancel_event: event set by the Stop button
+        """
+        from career_finder_app.aiintegration.batchgeneration import generate_letters
+
+        def on_progress(index, status, detail):
+            Clock.schedule_once(
+                lambda dt: self._on_batch_progress(generation, index, status, detail),
+                0
+            )
+
+        try:
+            generate_letters(
+                jobs,
+                sample_coverletter,
+                folder,
+                on_progress=on_progress,
+                cancel_event=cancel_event,
+                regenerate=regenerate
+            )
+            Clock.schedule_once(lambda dt: self._finish_batch(generation, folder), 0)
+
+        except Exception as e:
+            Clock.schedule_once(
+                lambda dt: self._finish_batch(
+                    generation,
+                    folder,
+                    f"Error generating cover letters: {str(e)}"
+                ),
+                0,
+            )
+
+    def _on_batch_progress(self, generation, index, status, detail):
+        """
+        show the progress of one batch job, runs on the ui thread
+
+        :param self: object
+        :param generation: id of the batch
+        :param index: job position in the batch
+        :param status: status string
+        :param detail: file path, exception or None
+        """
+        if generation != self._generation:
+            return
+
+        if detail is not None:
+            status = f"{status}: {detail}"
+        self._batch_status[index] = status
+        self._render_batch_status()
+
+    def _render_batch_status(self):
+        """
+        list every batch job with its status in the output field
+
+        :param self: object
+        """
+        self.output_field.text = "\n".join(
+            f"{i + 1}. {job.get('title', 'N/A')} at {job.get('company', 'N/A')} - {status}"
+            for i, (job, status) in enumerate(zip(self.batch_jobs, self._batch_status))
+        )
+
+    def _finish_batch(self, generation, folder, error=None):
+        """
+        show where the letters were written and reset the buttons
+
+        :param self: object
+        :param generation: id of the batch
+        :param folder: output folder
+        :param error: error message string or None
+        """
+        if generation != self._generation:
+            return
+
+        self._batch_cancel = None
+        self._render_batch_status()
+        footer = error or f"Letters written to {folder}"
+        self._update_output(f"{self.output_field.text}\n\n{footer}")
+
     def copy_to_clipboard(self, instance):
         """
         copy to clipboard
@@ -207,48 +411,113 @@ class CoverLetterScreen(MDScreen):
         # Could show a snackbar or dialog here
         print("Cover letter copied to clipboard!")
 
-    def _generate_in_background(self):
+    def _generate_in_background(self, generation, regenerate=False):
         """
-        background thread to generate cover letter
+        background thread to stream the cover letter
 
         :param self: object
+        :param generation: id of the generation this thread serves
+        :param regenerate: skip the letter cache
         """
+        started = time.perf_counter()
+        first_token = None
         try:
-            cover_letter = self._call_ai_function(
+            stream = self._call_ai_function(
                 job_title=self.job_data.get("jobtitle", ""),
                 company=self.job_data.get("company", ""),
                 job_description=self.job_data.get("description", ""),
                 user_info=self.input_field.text,
+                regenerate=regenerate,
             )
-
-            Clock.schedule_once(lambda dt: self._update_output(cover_letter), 0)
+            self._stream = stream
+            if self._stop_requested:
+                stream.close()
+
+            for chunk in stream:
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                    tracing.record("letter.first_token", first_token)
+                with self._chunks_lock:
+                    if generation != self._generation:
+                        return
+                    self._pending_chunks.append(chunk)
+
+            tracing.record("letter.generation", time.perf_counter() - started, regenerate=regenerate)
+            Clock.schedule_once(lambda dt: self._finish_generation(generation), 0)
 
         except Exception as e:
 
             Clock.schedule_once(
-                lambda dt: self._update_output(
+                lambda dt: self._finish_generation(
+                    generation,
                     f"Error generating cover letter: {str(e)}"
                 ),
                 0,
             )
 
-    def _call_ai_function(self, job_title, company, job_description, user_info):
+    def _call_ai_function(self, job_title, company, job_description, user_info, regenerate=False):
         """
-        placeholder AI function call
+        start streaming the AI generated cover letter
         
         :param self: object
         :param job_title: title string
         :param company: company string
         :param job_description: Description string
         :param user_info: user input string
-        :return: generated cover letter string
+        :param regenerate: skip the letter cache
+        :return: stream of generated text chunks with a close() method
         """
-        generated_coverletter = get_modified_coverletter(job_description, user_info)
-        
-        if not generated_coverletter:
-            raise ValueError("AI service returned no content.")
-        return generated_coverletter
-       
+        # imported on first use, the inference client is not needed at startup
+        from career_finder_app.aiintegration.huggingfaceinference import stream_modified_coverletter
+
+        return stream_modified_coverletter(job_description, user_info, regenerate=regenerate)
+
+    def _flush_chunks(self, dt):
+        """
+        append buffered chunks to the output, runs on the ui thread
+
+        :param self: object
+        :param dt: clock delta time
+        """
+        with self._chunks_lock:
+            chunks = self._pending_chunks
+            self._pending_chunks = []
+
+        if not chunks:
+            return
+
+        if not self._streamed:
+            # first chunk replaces the placeholder text
+            self._streamed = True
+            self.output_field.text = ""
+        self.output_field.text += "".join(chunks)
+
+    def _finish_generation(self, generation, error=None):
+        """
+        flush the remaining text and reset the buttons
+
+        :param self: object
+        :param generation: id of the finished generation
+        :param error: error message string or None
+        """
+        if generation != self._generation:
+            return
+
+        self._flush_chunks(0)
+        if self._flush_event is not None:
+            self._flush_event.cancel()
+            self._flush_event = None
+        self._stream = None
+
+        if error is not None and not self._stop_requested:
+            self._update_output(error)
+        elif not self._streamed:
+            self._update_output(
+                "Generation stopped." if self._stop_requested else "AI service returned no content."
+            )
+        else:
+            self._update_output(self.output_field.text)
+
     def _update_output(self, text):
         """
         update output field with generated text
@@ -256,9 +525,12 @@ class CoverLetterScreen(MDScreen):
         :param self: object
         :param text: generated cover letter string
         """
-        self.output_field.text = text
-        self.generate_btn.disabled = False
-        self.generate_btn.text = "Generate"
+        with tracing.span("_update_output", chars=len(text)):
+            self.output_field.text = text
+            self.generate_btn.disabled = False
+            self.generate_btn.text = "Generate"
+            self.regenerate_btn.disabled = False
+            self.stop_btn.disabled = True
 
     def go_back(self, instance):
         """
@@ -0,0 +1,218 @@
+import math
+import re
+
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDFlatButton
+from kivymd.uix.dialog import MDDialog
+from kivymd.uix.label import MDLabel
+from kivymd.uix.recycleview import MDRecycleView
+
+from kivy.metrics import dp, sp
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+# characters per list row, each row is rasterized into its own small texture
+CHUNK_CHARS = 800
+# height of the scrolling area in the dialog
+VIEWER_HEIGHT = dp(400)
+# padding around the text of a row
+CHUNK_PADDING = dp(10)
+# rough glyph width and line height relative to the font size, used to
+# estimate row heights before a row was rendered once
+GLYPH_WIDTH = 0.5
+LINE_HEIGHT = 1.25
+
+EMPTY_TEXT = "No description available"
+
+
+def split_chunks(text, max_chars=CHUNK_CHARS):
+    """
+    split a description into paragraphs of at most max_chars characters
+
+    paragraphs are cut at line breaks first, then after sentences, then
+    at spaces.
+
+    :param text: description string
+    :param max_chars: characters per chunk
+    :return: list of strings
+    """
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+
+        pieces = []
+        for line in paragraph.splitlines():
+            pieces.extend(re.split(r"(?<=[.!?])\s+", line) if len(line) > max_chars else [line])
+
+        chunk = ""
+        for piece in pieces:
+            while len(piece) > max_chars:
+                cut = piece.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if chunk:
+                    chunks.append(chunk)
+                    chunk = ""
+                chunks.append(piece[:cut])
+                piece = piece[cut:].lstrip()
+            if chunk and len(chunk) + len(piece) + 1 > max_chars:
+                chunks.append(chunk)
+                chunk = ""
+            chunk = f"{chunk}\n{piece}" if chunk else piece
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+class DescriptionChunk(RecycleDataViewBehavior, MDLabel):
+    def __init__(self, **kwargs):
+        """
+        one paragraph of the description, reused for whichever scrolls into view
+
+        the row height in the list data starts as an estimate and is set
+        to the rendered height once the row was shown.
+
+        :param self: object
+        :param kwargs: additional arguments
+        """
+        super().__init__(
+            size_hint_y=None,
+            markup=False,
+            padding=(CHUNK_PADDING, CHUNK_PADDING / 2),
+            **kwargs
+        )
+        self._rv = None
+        self._index = None
+        self.bind(width=self._wrap, texture_size=self._fit)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """
+        show the chunk at index in this row
+
+        :param self: object
+        :param rv: recycleview
+        :param index: row index
+        :param data: row data dict
+        """
+        self._rv = rv
+        self._index = index
+        super().refresh_view_attrs(rv, index, data)
+
+    def _wrap(self, instance, width):
+        """
+        wrap the text at the row width
+
+        :param self: object
+        :param instance: label
+        :param width: row width
+        """
+        self.text_size = (max(width - 2 * CHUNK_PADDING, 1), None)
+
+    def _fit(self, instance, texture_size):
+        """
+        store the rendered height in the list data
+
+        :param self: object
+        :param instance: label
+        :param texture_size: (width, height) of the rendered text
+        """
+        if self._rv is None or self._index is None or self._index >= len(self._rv.data):
+            return
+
+        row = self._rv.data[self._index]
+        if row.get("text") != self.text or abs(row.get("height", 0) - texture_size[1]) < 1:
+            return
+        self._rv.data[self._index] = dict(row, height=texture_size[1])
+
+
+class DescriptionViewer:
+    def __init__(self, title="Job Description"):
+        """
+        dialog showing long texts as a list of paragraphs
+
+        the dialog is built once and reused. Only the paragraphs in view
+        are rendered, so a long posting never becomes one huge texture.
+
+        :param self: object
+        :param title: dialog title
+        """
+        self.title = title
+        self.dialog = None
+        self.rv = None
+
+    def show(self, text):
+        """
+        open the dialog with a text, scrolled to the top
+
+        :param self: object
+        :param text: description string
+        """
+        if self.dialog is None:
+            self._build()
+
+        chunks = split_chunks(str(text or "")) or [EMPTY_TEXT]
+        width = self.rv.width if self.rv.width > 1 else dp(400)
+        self.rv.data = [
+            {"text": chunk, "height": self._estimate_height(chunk, width)}
+            for chunk in chunks
+        ]
+        self.rv.scroll_y = 1
+        self.dialog.open()
+
+    def dismiss(self):
+        """
+        close the dialog
+
+        :param self: object
+        """
+        if self.dialog:
+            self.dialog.dismiss()
+
+    def _build(self):
+        """
+        create the dialog and its paragraph list
+
+        :param self: object
+        """
+        self.rv = MDRecycleView(do_scroll_x=False)
+        layout = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, dp(40)),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter("height"))
+        self.rv.add_widget(layout)
+        self.rv.viewclass = DescriptionChunk
+
+        content = MDBoxLayout(
+            orientation="vertical",
+            size_hint_y=None,
+            height=VIEWER_HEIGHT
+        )
+        content.add_widget(self.rv)
+
+        self.dialog = MDDialog(
+            title=self.title,
+            type="custom",
+            content_cls=content,
+            buttons=[MDFlatButton(text="CLOSE", on_release=lambda x: self.dismiss())]
+        )
+
+    @staticmethod
+    def _estimate_height(chunk, width):
+        """
+        row height of a chunk before it was rendered
+
+        :param chunk: chunk string
+        :param width: row width
+        :return: height in pixels
+        """
+        font_size = sp(16)
+        per_line = max(int((width - 2 * CHUNK_PADDING) / (font_size * GLYPH_WIDTH)), 1)
+        lines = sum(max(math.ceil(len(line) / per_line), 1) for line in chunk.splitlines())
+        return lines * font_size * LINE_HEIGHT + CHUNK_PADDING
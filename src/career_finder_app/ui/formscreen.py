@@ -6,6 +6,7 @@ from kivymd.uix.button import MDRaisedButton, MDFlatButton, MDIconButton
 from kivymd.uix.chip import MDChip
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.scrollview import MDScrollView
+from kivymd.uix.selectioncontrol import MDCheckbox
 
 
 class FormScreen(MDScreen):
@@ -18,7 +19,8 @@ class FormScreen(MDScreen):
         """
         super().__init__(**kwargs)
 
-        self.selected_location = "Select Country"
+        # several countries are searched side by side
+        self.selected_locations = []
         self.keywords = []
 
         layout = MDBoxLayout(
@@ -63,7 +65,7 @@ class FormScreen(MDScreen):
 
         # Location dropdown 
         self.location_btn = MDRaisedButton(
-            text=self.selected_location,
+            text="Select Country",
             pos_hint={"center_x": 0.5},
             on_release=self.open_menu
         )
@@ -74,13 +76,30 @@ class FormScreen(MDScreen):
             items=[
                 {
                     "text": country,
-                    "on_release": lambda x=country: self.set_location(x)
+                    "on_release": lambda x=country: self.toggle_location(x)
                 }
                 for country in ["Germany", "Austria", "Switzerland", "USA", "Canada", "UK"]
             ],
             width_mult=4
         )
 
+        # only ask the sites for postings since the same search last ran
+        incremental_row = MDBoxLayout(
+            orientation="horizontal",
+            spacing=8,
+            size_hint_y=None,
+            height="40dp"
+        )
+        self.incremental_box = MDCheckbox(
+            size_hint=(None, None),
+            size=("40dp", "40dp")
+        )
+        incremental_row.add_widget(self.incremental_box)
+        incremental_row.add_widget(
+            MDLabel(text="Only fetch postings new since my last search")
+        )
+        layout.add_widget(incremental_row)
+
         #find_jobs button 
         find_jobs_btn = MDRaisedButton(
             text="Find Jobs",
@@ -89,6 +108,35 @@ class FormScreen(MDScreen):
         )
         layout.add_widget(find_jobs_btn)
 
+        # searches jobs fetched before, works offline
+        saved_jobs_btn = MDFlatButton(
+            text="Search Saved Jobs",
+            pos_hint={"center_x": 0.5},
+            on_release=self.search_saved_jobs
+        )
+        layout.add_widget(saved_jobs_btn)
+
+        # saved searches are also run by the headless watch runner
+        saved_search_row = MDBoxLayout(
+            orientation="horizontal",
+            spacing=10,
+            size_hint_y=None,
+            height="40dp"
+        )
+        saved_search_row.add_widget(
+            MDFlatButton(
+                text="Save Search",
+                on_release=self.save_current_search
+            )
+        )
+        self.saved_searches_btn = MDFlatButton(
+            text="Saved Searches",
+            on_release=self.open_saved_searches
+        )
+        saved_search_row.add_widget(self.saved_searches_btn)
+        layout.add_widget(saved_search_row)
+        self.saved_searches_menu = None
+
         self.add_widget(layout)
 
 
@@ -179,17 +227,52 @@ class FormScreen(MDScreen):
         """
         self.menu.open()
 
-    def set_location(self, location):
+    def toggle_location(self, location):
         """
-        set selected location from dropdown
+        add a country from the dropdown to the search, or remove it again
 
         :param self: object
         :param location: location string
         """
-        self.selected_location = location
-        self.location_btn.text = location
+        if location in self.selected_locations:
+            self.selected_locations.remove(location)
+        else:
+            self.selected_locations.append(location)
+        self._update_location_btn()
+        self.menu.dismiss()
+
+    def set_location(self, location):
+        """
+        replace the selected locations
+
+        :param self: object
+        :param location: location string or list of location strings
+        """
+        self.selected_locations = [location] if isinstance(location, str) else list(location)
+        self._update_location_btn()
         self.menu.dismiss()
 
+    def _update_location_btn(self):
+        """
+        show the selected countries on the dropdown button
+
+        :param self: object
+        """
+        self.location_btn.text = ", ".join(self.selected_locations) or "Select Country"
+
+    def _location(self):
+        """
+        location of the search
+
+        :param self: object
+        :return: None if no country is selected, a string for one, a list for several
+        """
+        if not self.selected_locations:
+            return None
+        if len(self.selected_locations) == 1:
+            return self.selected_locations[0]
+        return list(self.selected_locations)
+
 
     def find_jobs(self, instance):
         """
@@ -198,12 +281,97 @@ class FormScreen(MDScreen):
         :param self: object
         :param instance: widget instance
         """
-        if not self.keywords or self.selected_location == "Select Country":
+        if not self.keywords or not self.selected_locations:
             return
 
         result_screen = self.manager.get_screen("result")
         result_screen.fetch_and_display(
             self.keywords,
-            self.selected_location
+            self._location(),
+            sample_letter=self._sample_letter(),
+            incremental=self.incremental_box.active
+        )
+        self.manager.current = "result"
+
+    def search_saved_jobs(self, instance):
+        """
+        search the jobs fetched before and navigate to result screen
+
+        :param self: object
+        :param instance: widget instance
+        """
+        if not self.keywords:
+            return
+
+        result_screen = self.manager.get_screen("result")
+        result_screen.show_saved_jobs(
+            self.keywords,
+            self._location(),
+            sample_letter=self._sample_letter()
         )
         self.manager.current = "result"
+
+    def save_current_search(self, instance):
+        """
+        save the keywords and countries for the watch runner
+
+        :param self: object
+        :param instance: widget instance
+        """
+        if not self.keywords or not self.selected_locations:
+            return
+
+        from career_finder_app.jobspymodule.savedsearches import save_search
+        save_search(self.keywords, self._location())
+
+    def open_saved_searches(self, instance):
+        """
+        open the dropdown of saved searches
+
+        :param self: object
+        :param instance: widget instance
+        """
+        from career_finder_app.jobspymodule.savedsearches import describe, load_saved_searches
+
+        searches = load_saved_searches()
+        if not searches:
+            return
+
+        if self.saved_searches_menu:
+            self.saved_searches_menu.dismiss()
+        self.saved_searches_menu = MDDropdownMenu(
+            caller=self.saved_searches_btn,
+            items=[
+                {
+                    "text": describe(search),
+                    "on_release": lambda x=search: self.load_search(x)
+                }
+                for search in searches
+            ],
+            width_mult=5
+        )
+        self.saved_searches_menu.open()
+
+    def load_search(self, search):
+        """
+        fill the form with a saved search
+
+        :param self: object
+        :param search: saved search dictionary
+        """
+        self.keywords = list(search["keywords"])
+        self._rebuild_chips()
+        self.set_location(search["location"])
+        if self.saved_searches_menu:
+            self.saved_searches_menu.dismiss()
+
+    def _sample_letter(self):
+        """
+        sample letter last used on the cover letter screen, used for ranking
+
+        :param self: object
+        :return: letter string, empty if no letter was generated yet
+        """
+        from career_finder_app.aiintegration.sampleletter import load_sample_letter
+
+        return load_sample_letter()
@@ -1,3 +1,5 @@
+import logging
+
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
@@ -6,10 +8,114 @@ from kivymd.uix.button import MDRaisedButton, MDFlatButton
 from kivymd.uix.chip import MDChip
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.dialog import MDDialog
+from kivymd.uix.recycleview import MDRecycleView
+from kivymd.uix.selectioncontrol import MDCheckbox
 
 from kivy.metrics import dp
-from career_finder_app.jobspymodule import get_jobs
+from kivy.clock import Clock
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty, StringProperty
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from career_finder_app.jobspymodule import RESULTS_WANTED
+from career_finder_app.jobspymodule.jobpager import PAGE_SIZE, JobPager
+from career_finder_app.jobspymodule.searchexecutor import SearchExecutor
+from career_finder_app.service import fetch_more_jobs, search_jobs, search_saved_jobs
+from career_finder_app.tracing import span
+from career_finder_app.ui.descriptionviewer import DescriptionViewer
+
+# load the next page once the list is scrolled this close to the bottom
+LOAD_MORE_AT = 0.1
+
+# fixed row height: three 30dp labels, the 40dp button row, padding and spacing
+ROW_HEIGHT = dp(165)
+
+log = logging.getLogger(__name__)
+
+
+class JobRow(RecycleDataViewBehavior, MDBoxLayout):
+    company = StringProperty("")
+    location = StringProperty("")
+    title = StringProperty("")
+    has_description = BooleanProperty(False)
+    is_new = BooleanProperty(False)
+    selected = BooleanProperty(False)
+    owner = ObjectProperty(None, allownone=True)
+    row_index = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        """
+        one job in the result list, reused for whichever row scrolls into view
+
+        :param self: object
+        :param kwargs: additional arguments
+        """
+        super().__init__(
+            orientation="vertical",
+            spacing=5,
+            padding=10,
+            md_bg_color=(0.95, 0.95, 0.95, 1),
+            **kwargs
+        )
+
+        self.company_label = MDLabel(markup=True, size_hint_y=None, height="30dp")
+        self.location_label = MDLabel(markup=True, size_hint_y=None, height="30dp")
+        self.title_label = MDLabel(markup=True, size_hint_y=None, height="30dp")
+        self.add_widget(self.company_label)
+        self.add_widget(self.location_label)
+        self.add_widget(self.title_label)
+
+        # Buttons container
+        button_container = MDBoxLayout(
+            orientation="horizontal",
+            spacing=10,
+            size_hint_y=None,
+            height="40dp"
+        )
+
+        # selects the job for batch cover letter generation
+        self.select_box = MDCheckbox(
+            size_hint=(None, None),
+            size=("40dp", "40dp"),
+            on_release=lambda x: self.owner.set_selected(self.row_index, x.active)
+        )
+        button_container.add_widget(self.select_box)
+
+        self.desc_btn = MDFlatButton(
+            text="View Description",
+            on_release=lambda x: self.owner.show_description_at(self.row_index)
+        )
+        button_container.add_widget(self.desc_btn)
+
+        cover_letter_btn = MDRaisedButton(
+            text="Generate Cover Letter",
+            on_release=lambda x: self.owner.go_to_cover_letter_at(self.row_index)
+        )
+        button_container.add_widget(cover_letter_btn)
+
+        self.add_widget(button_container)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """
+        show the job at index in this row
+
+        :param self: object
+        :param rv: recycleview
+        :param index: row index
+        :param data: row data dict
+        """
+        self.row_index = index
+        super().refresh_view_attrs(rv, index, data)
+
+        self.company_label.text = f"[b]Company:[/b] {self.company}"
+        self.location_label.text = f"[b]Location:[/b] {self.location}"
+        self.title_label.text = f"[b]Job Title:[/b] {self.title}"
+        if self.is_new:
+            self.title_label.text += "  [color=#2e7d32][b]NEW[/b][/color]"
+        self.select_box.active = self.selected
+
+        # rows are recycled, so hide the button rather than removing it
+        self.desc_btn.disabled = not self.has_description
+        self.desc_btn.opacity = 1 if self.has_description else 0
 
 
 class ResultScreen(MDScreen):
@@ -21,8 +127,25 @@ class ResultScreen(MDScreen):
         :param kwargs: additional arguments
         """
         super().__init__(**kwargs)
-        self.df = None
-        self.dialog = None
+        # JobRecord of the listed jobs, descriptions are loaded when opened
+        self.jobs = None
+        # one dialog for every description, built when first opened
+        self.description_viewer = DescriptionViewer()
+        self.pager = None
+        self.selected = set()
+        self._make_pager = None
+        # (job_url, is_new) of the rows the list was last built from, see
+        # _on_search_done, the frame itself is not held on to
+        self._first_batch = None
+        self._loading_more = False
+        # arguments and handle of the last search, see fetch_and_display
+        self._request = None
+        self._search = None
+
+        # searches run off the ui thread, results come back through Clock
+        dispatch = lambda callback: Clock.schedule_once(lambda dt: callback(), 0)
+        self.search_executor = SearchExecutor(dispatch=dispatch)
+        self.page_loader = SearchExecutor(dispatch=dispatch)
 
         self.layout = MDBoxLayout(
             orientation="vertical",
@@ -38,146 +161,396 @@ class ResultScreen(MDScreen):
             height="40dp"
         )
         
-        # Scrollview for table
+        # Content area, shows either the job list or the message scrollview
+        self.content = MDBoxLayout()
+        self.layout.add_widget(self.content)
+
+        # Scrollview for loading, error and empty messages
         self.scroll = MDScrollView()
-        self.layout.add_widget(self.scroll)
+        self.content.add_widget(self.scroll)
+
+        # Job list, only the rows in view are instantiated
+        self.rv = MDRecycleView()
+        list_layout = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=dp(10),
+            padding=dp(10)
+        )
+        list_layout.bind(minimum_height=list_layout.setter("height"))
+        self.rv.add_widget(list_layout)
+        self.rv.viewclass = JobRow
+        self.rv.bind(scroll_y=self._on_scroll)
 
         # Back button
+        bottom_bar = MDBoxLayout(
+            orientation="horizontal",
+            spacing=10,
+            size_hint_y=None,
+            height="40dp"
+        )
+
         back_btn = MDFlatButton(
             text="Go Back",
             on_release=self.go_back
         )
-        self.layout.add_widget(back_btn)
+        bottom_bar.add_widget(back_btn)
+
+        bottom_bar.add_widget(MDLabel())
+
+        self.batch_btn = MDRaisedButton(
+            text="Generate for Selected",
+            disabled=True,
+            on_release=self.go_to_batch_cover_letters
+        )
+        bottom_bar.add_widget(self.batch_btn)
+
+        self.layout.add_widget(bottom_bar)
 
         self.add_widget(self.layout)
 
-    def fetch_and_display(self, keywords, location):
+    def fetch_and_display(self, keywords, location, results_wanted=RESULTS_WANTED, page_size=PAGE_SIZE, sample_letter="", incremental=False):
         """
-        fetch and display job results
+        fetch and display job results, most relevant first
+
+        :param self: object
+        :param keywords: list of keywords strings, each searched separately
+        :param location: location string or list of location strings searched side by side
+        :param results_wanted: postings per site fetched by each scrape
+        :param page_size: rows shown per page
+        :param sample_letter: user's sample cover letter, also used for ranking
+        :param incremental: only fetch postings new since the last search, shown with earlier results
+        """
+        # the same search asked for again while it runs, e.g. a double
+        # click on Find Jobs, keeps the running one
+        request = repr((keywords, location, results_wanted, page_size, sample_letter, incremental))
+        if request == self._request and self.search_executor.is_running(self._search):
+            return
+        self._request = request
+
+        self._show_loading()
+
+        # further pages are scraped with an offset once the first batch is used up
+        fetch = lambda offset, wanted: fetch_more_jobs(
+            keywords,
+            location,
+            offset,
+            results_wanted=wanted,
+            sample_letter=sample_letter
+        )
+        self._make_pager = lambda first_batch: JobPager(
+            fetch,
+            first_batch,
+            page_size=page_size,
+            batch_size=results_wanted
+        )
+
+        # starting a new search cancels the previous one, each site's
+        # results are shown as soon as that site finishes. Cached results
+        # show at once, stale ones are replaced when the refresh is done.
+        # In incremental mode the earlier results show at once, new
+        # postings are merged in and marked once the sites answered
+        self._search = self.search_executor.submit(
+            lambda handle, report: search_jobs(
+                keywords,
+                location,
+                results_wanted=results_wanted,
+                sample_letter=sample_letter,
+                incremental=incremental,
+                on_progress=report
+            ),
+            on_done=self._on_search_done,
+            on_progress=self._on_search_progress,
+            on_error=self._on_search_error
+        )
+
+    def show_saved_jobs(self, keywords, location=None, page_size=PAGE_SIZE, sample_letter=""):
+        """
+        display matching jobs from the job store without scraping
 
         :param self: object
         :param keywords: list of keywords strings
-        :param location: location string
+        :param location: only jobs searched in this location or list of locations, None for all
+        :param page_size: rows shown per page
+        :param sample_letter: user's sample cover letter, also used for ranking
         """
-        # Show loading
+        self._show_loading()
+
+        # stored results are complete, the pager never scrapes
+        self._make_pager = lambda first_batch: JobPager(
+            None,
+            first_batch,
+            page_size=page_size,
+            max_results=0
+        )
+        self.search_executor.submit(
+            lambda handle, report: search_saved_jobs(keywords, location, sample_letter),
+            on_done=self._on_search_done,
+            on_error=lambda e: self.show_error(str(e))
+        )
+
+    def _show_loading(self):
+        """
+        clear the previous results and show the loading message
+
+        :param self: object
+        """
+        self.jobs = None
+        self.pager = None
+        self._first_batch = None
+        self._loading_more = False
+        self.page_loader.cancel()
+        self.rv.data = []
+        self._clear_selection()
+        self._show_content(self.scroll)
         self.scroll.clear_widgets()
         self.scroll.add_widget(self.loading_label)
-        
-        # Fetch data (in real app, do this in a thread)
-        try:
-            # Call your function
-            self.df = get_jobs(location=location, keywords=", ".join(keywords))
-            
-            if self.df.empty:
-                self.show_no_results()
-                return
-            
-            self.display_table()
-
-        except Exception as e:
-            self.show_error(str(e))
 
-    def display_table(self):
+    def _on_search_progress(self, df):
         """
-        display job results in scrollview table
+        show partial results while other sites are still scraping
 
         :param self: object
+        :param df: results merged so far
         """
-        self.scroll.clear_widgets()
-        
-        # table container
-        table_container = MDBoxLayout(
-            orientation="vertical",
-            adaptive_height=True,
-            spacing=10,
-            padding=10
+        if df.empty:
+            return
+
+        self._show_first_batch(df)
+
+    def _on_search_done(self, df):
+        """
+        show the results of the current search, runs on the ui thread
+
+        :param self: object
+        :param df: job results dataframe
+        """
+        if self.pager is not None and self._first_batch == _fingerprint(df):
+            # the last progress update showed exactly these rows already
+            return
+
+        if df.empty:
+            self.show_no_results()
+            return
+
+        self._show_first_batch(df)
+
+    def _on_search_error(self, error):
+        """
+        show the error unless some sites already answered
+
+        :param self: object
+        :param error: exception
+        """
+        if self.jobs:
+            # keep the partial results, e.g. when the last site was paused
+            log.warning("Search failed: %s", error, exc_info=error)
+            return
+
+        self.show_error(str(error))
+
+    def _show_first_batch(self, df):
+        """
+        page the first scrape of a search, keeping as many rows on screen as before
+
+        :param self: object
+        :param df: job results dataframe
+        """
+        shown = 0 if self.jobs is None else len(self.jobs)
+        self._first_batch = _fingerprint(df)
+        self.pager = self._make_pager(df)
+        self.pager.next_page(max(shown, self.pager.page_size))
+        self.jobs = self.pager.shown
+        self.display_table()
+
+    def _on_scroll(self, instance, scroll_y):
+        """
+        load the next page when the list is scrolled near the bottom
+
+        :param self: object
+        :param instance: scrollview
+        :param scroll_y: scroll position, 0 is the bottom
+        """
+        if scroll_y <= LOAD_MORE_AT:
+            self.load_more()
+
+    def load_more(self):
+        """
+        show the next page, scraping more postings only if none are left
+
+        :param self: object
+        """
+        if self.pager is None or self._loading_more:
+            return
+
+        if self.pager.buffered:
+            page = self.pager.next_page()
+            self.jobs = self.pager.shown
+            self._add_rows(page)
+            return
+
+        if not self.pager.can_fetch:
+            return
+
+        self._loading_more = True
+        pager = self.pager
+        self.page_loader.submit(
+            lambda handle, report: pager.fetch_more(),
+            on_done=self._on_page_fetched,
+            on_error=self._on_page_error
         )
-        
-        # rows
-        for idx, row in self.df.iterrows():
-            row_layout = MDBoxLayout(
-                orientation="vertical",
-                adaptive_height=True,
-                spacing=5,
-                padding=10,
-                md_bg_color=(0.95, 0.95, 0.95, 1)
-            )
-            
-            # Company
-            row_layout.add_widget(
-                MDLabel(
-                    text=f"[b]Company:[/b] {row.get('company', 'N/A')}",
-                    markup=True,
-                    size_hint_y=None,
-                    height="30dp"
-                )
-            )
-            
-            # Location
-            row_layout.add_widget(
-                MDLabel(
-                    text=f"[b]Location:[/b] {row.get('location', 'N/A')}",
-                    markup=True,
-                    size_hint_y=None,
-                    height="30dp"
-                )
-            )
-            
-            # Job Title
-            row_layout.add_widget(
-                MDLabel(
-                    text=f"[b]Job Title:[/b] {row.get('title', 'N/A')}",
-                    markup=True,
-                    size_hint_y=None,
-                    height="30dp"
-                )
-            )
-            
-            # Buttons container
-            button_container = MDBoxLayout(
-                orientation="horizontal",
-                adaptive_height=True,
-                spacing=10,
-                size_hint_y=None,
-                height="40dp"
-            )
-            
-            # Description button
-            if 'description' in row and row['description']:
-                desc_btn = MDFlatButton(
-                    text="View Description",
-                    on_release=lambda x, desc=row['description']: self.show_description(desc)
-                )
-                button_container.add_widget(desc_btn)
-            
-            # Cover Letter button
-            cover_letter_btn = MDRaisedButton(
-                text="Generate Cover Letter",
-                on_release=lambda x, job_row=row: self.go_to_cover_letter(job_row)
-            )
-            button_container.add_widget(cover_letter_btn)
-            
-            row_layout.add_widget(button_container)
-            
-            table_container.add_widget(row_layout)
-            
-            # Add separator
-            table_container.add_widget(
-                MDLabel(
-                    text="",
-                    size_hint_y=None,
-                    height="10dp"
-                )
-            )
-        
-        self.scroll.add_widget(table_container)
+
+    def _on_page_fetched(self, added):
+        """
+        show the freshly scraped page
+
+        :param self: object
+        :param added: number of new rows
+        """
+        self._loading_more = False
+        if added:
+            self.load_more()
+
+    def _on_page_error(self, error):
+        """
+        keep the rows shown so far if scraping another page failed
+
+        :param self: object
+        :param error: exception
+        """
+        self._loading_more = False
+        log.warning("Loading more jobs failed: %s", error, exc_info=error)
+
+    def display_table(self):
+        """
+        display job results in the recycled job list
+
+        :param self: object
+        """
+        with span("display_table", rows=len(self.jobs)):
+            self._show_content(self.rv)
+            self.rv.data = self._rows_to_data(self.jobs)
+            self.rv.scroll_y = 1
+            self._clear_selection()
+
+    def _add_rows(self, jobs):
+        """
+        append job rows to the list
+
+        :param self: object
+        :param jobs: list of JobRecord
+        """
+        with span("display_table.add_rows", rows=len(jobs)):
+            self.rv.data.extend(self._rows_to_data(jobs))
+
+    def _rows_to_data(self, jobs):
+        """
+        flatten job records into recycleview data dicts
+
+        :param self: object
+        :param jobs: list of JobRecord
+        :return: list of dicts for JobRow
+        """
+        return [
+            {
+                "company": str(job.get("company", "N/A")),
+                "location": str(job.get("location", "N/A")),
+                "title": str(job.get("title", "N/A")),
+                "has_description": job.has_description,
+                "is_new": bool(job.is_new),
+                "selected": False,
+                "owner": self,
+            }
+            for job in jobs
+        ]
+
+    def _show_content(self, widget):
+        """
+        show the job list or a message scrollview in the content area
+
+        :param self: object
+        :param widget: widget to show
+        """
+        if widget.parent is not self.content:
+            self.content.clear_widgets()
+            self.content.add_widget(widget)
+
+    def show_description_at(self, index):
+        """
+        show the description of a listed job
+
+        :param self: object
+        :param index: row index in the list
+        """
+        self.show_description(self.jobs[index].description)
+
+    def go_to_cover_letter_at(self, index):
+        """
+        navigate to the cover letter screen for a listed job
+
+        :param self: object
+        :param index: row index in the list
+        """
+        self.go_to_cover_letter(self.jobs[index])
+
+    def set_selected(self, index, selected):
+        """
+        select or unselect a listed job for batch generation
+
+        :param self: object
+        :param index: row index in the list
+        :param selected: new selection state
+        """
+        # recycled rows read the state back from the data dict
+        self.rv.data[index]["selected"] = selected
+        if selected:
+            self.selected.add(index)
+        else:
+            self.selected.discard(index)
+        self._update_batch_button()
+
+    def _clear_selection(self):
+        """
+        unselect all jobs
+
+        :param self: object
+        """
+        self.selected = set()
+        self._update_batch_button()
+
+    def _update_batch_button(self):
+        """
+        show the number of selected jobs on the batch button
+
+        :param self: object
+        """
+        count = len(self.selected)
+        self.batch_btn.disabled = count == 0
+        self.batch_btn.text = f"Generate for Selected ({count})" if count else "Generate for Selected"
+
+    def go_to_batch_cover_letters(self, instance):
+        """
+        navigate to the cover letter screen with all selected jobs
+
+        :param self: object
+        :param instance: widget instance
+        """
+        if not self.selected:
+            return
+
+        jobs = [self.jobs[index] for index in sorted(self.selected)]
+        cover_letter_screen = self.manager.get_screen("cover_letter")
+        cover_letter_screen.set_batch_jobs(jobs)
+        self.manager.current = "cover_letter"
 
     def go_to_cover_letter(self, job_data):
         """
         navigate to cover letter screen with job data
 
         :param self: object
-        :param job_data: job data dictionary
+        :param job_data: JobRecord or job data dictionary
         """
         cover_letter_screen = self.manager.get_screen("cover_letter")
         cover_letter_screen.set_job_data(job_data)
@@ -186,54 +559,11 @@ class ResultScreen(MDScreen):
     def show_description(self, description):
         """
         show job description dialog
-        
+
         :param self: object
         :param description: description string
         """
-        if self.dialog:
-            self.dialog.dismiss()
-        
-        if not description:
-            description = "No description available"
-        
-  
-        desc_label = MDLabel(
-            text=str(description),
-            size_hint_y=None,
-            markup=False,
-            padding=(10, 10)
-        )
-        desc_label.text_size = (dp(400), None)
-        desc_label.bind(
-            texture_size=lambda instance, value: setattr(instance, 'height', value[1])
-        )
-  
-        content = MDBoxLayout(
-            orientation="vertical",
-            size_hint_y=None,
-            height=dp(400),  
-            padding=0
-        )
-        
-        scroll = MDScrollView(
-            do_scroll_x=False,
-            size_hint=(1, 1)
-        )
-        scroll.add_widget(desc_label)
-        content.add_widget(scroll)
-        
-        close_button = MDFlatButton(
-            text="CLOSE",
-            on_release=lambda x: self.dialog.dismiss()
-        )
-        
-        self.dialog = MDDialog(
-            title="Job Description",
-            type="custom",
-            content_cls=content,
-            buttons=[close_button]
-        )
-        self.dialog.open()
+        self.description_viewer.show(description)
 
     def show_no_results(self):
         """
@@ -241,6 +571,7 @@ class ResultScreen(MDScreen):
         
         :param self: object
         """
+        self._show_content(self.scroll)
         self.scroll.clear_widgets()
         self.scroll.add_widget(
             MDLabel(
@@ -256,6 +587,7 @@ class ResultScreen(MDScreen):
         :param self: object
         :param error_msg: error message string
         """
+        self._show_content(self.scroll)
         self.scroll.clear_widgets()
         self.scroll.add_widget(
             MDLabel(
@@ -266,11 +598,23 @@ class ResultScreen(MDScreen):
 
     def go_back(self, instance):
         """
-        Docstring for go_back
+        cancel the running search and navigate back to the form
         
         :param self: object
         :param instance: widget instance
         """
+        self.search_executor.cancel()
+        self.page_loader.cancel()
+        self._loading_more = False
         self.manager.current = "form"
 
 
+def _fingerprint(df):
+    """
+    rows of a result frame in order, compact enough to keep
+
+    :param df: job results dataframe
+    :return: tuple of (job_url, is_new)
+    """
+    is_new = df["is_new"] if "is_new" in df else [False] * len(df)
+    return tuple(zip(df["job_url"], (bool(new) for new in is_new)))
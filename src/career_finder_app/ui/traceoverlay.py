@@ -0,0 +1,112 @@
+from kivymd.uix.label import MDLabel
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.metrics import dp
+
+from career_finder_app import tracing
+
+# seconds between two refreshes of the shown timings
+REFRESH_INTERVAL = 1.0
+
+# F12 shows or hides the overlay
+TOGGLE_KEY = 293
+
+
+class TraceOverlay(MDLabel):
+    def __init__(self, **kwargs):
+        """
+        timings of the traced spans drawn over the app
+
+        shows the last duration, p50 and p95 of every span name recorded in
+        this session, refreshed every REFRESH_INTERVAL seconds while shown.
+
+        :param self: object
+        :param kwargs: additional arguments
+        """
+        super().__init__(
+            font_style="Caption",
+            adaptive_size=True,
+            padding=(dp(6), dp(4)),
+            theme_text_color="Custom",
+            text_color=(1, 1, 1, 1),
+            **kwargs
+        )
+        # set after init, the label has no canvas for a background before
+        self.md_bg_color = (0, 0, 0, 0.6)
+        self.font_name = "RobotoMono-Regular"
+        self.bind(size=self._place)
+        Window.bind(size=self._place, on_keyboard=self._on_keyboard)
+        self._event = None
+
+    def show(self):
+        """
+        add the overlay to the window and start refreshing
+
+        :param self: object
+        """
+        if self.parent is None:
+            Window.add_widget(self)
+        self.refresh(0)
+        if self._event is None:
+            self._event = Clock.schedule_interval(self.refresh, REFRESH_INTERVAL)
+
+    def hide(self):
+        """
+        remove the overlay and stop refreshing
+
+        :param self: object
+        """
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if self.parent is not None:
+            Window.remove_widget(self)
+
+    def refresh(self, dt):
+        """
+        redraw the timings table
+
+        :param self: object
+        :param dt: clock delta time
+        """
+        lines = [f"{'span':<28}{'last':>9}{'p50':>9}{'p95':>9}{'n':>6}"]
+        for name, timing in sorted(tracing.stats().items()):
+            lines.append(
+                f"{name[:27]:<28}"
+                f"{timing['last'] * 1000:>7.1f}ms"
+                f"{timing['p50'] * 1000:>7.1f}ms"
+                f"{timing['p95'] * 1000:>7.1f}ms"
+                f"{timing['count']:>6}"
+            )
+        if len(lines) == 1:
+            lines.append("no spans recorded yet")
+        self.text = "\n".join(lines)
+
+    def _place(self, *args):
+        """
+        keep the overlay in the top right corner
+
+        :param self: object
+        :param args: size event arguments
+        """
+        self.right = Window.width
+        self.top = Window.height
+
+    def _on_keyboard(self, window, key, *args):
+        """
+        toggle the overlay with TOGGLE_KEY
+
+        :param self: object
+        :param window: window
+        :param key: key code
+        :param args: scancode, codepoint and modifiers
+        :return: True when the key was handled
+        """
+        if key != TOGGLE_KEY:
+            return False
+        if self.parent is None:
+            self.show()
+        else:
+            self.hide()
+        return True
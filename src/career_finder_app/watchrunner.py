@@ -0,0 +1,125 @@
+"""
+headless runner of the saved searches
+
+refreshes the search cache and the job store on a schedule, so the app
+shows fresh results at once. Needs no window, e.g. for cron or a service:
+
+    python src/career_finder_app/watchrunner.py add --location Germany python "machine learning"
+    python src/career_finder_app/watchrunner.py add --location Germany --location Austria python
+    python src/career_finder_app/watchrunner.py list
+    python src/career_finder_app/watchrunner.py run
+"""
+import argparse
+import os
+import sys
+import time
+
+from career_finder_app.jobspymodule.resultcache import DEFAULT_TTL, refresh_search
+from career_finder_app.jobspymodule.savedsearches import (
+    describe,
+    load_saved_searches,
+    remove_search,
+    save_search,
+)
+
+# seconds between two runs of all saved searches, half the cache ttl so a
+# search refreshed by the runner never goes stale before the next run
+WATCH_INTERVAL = int(os.environ.get("CAREER_FINDER_WATCH_INTERVAL", DEFAULT_TTL // 2))
+
+
+def run_saved_searches(searches=None):
+    """
+    scrape every saved search once and store the results
+
+    a failing search is reported and skipped.
+
+    :param searches: list of saved searches, defaults to the saved ones
+    :return: number of searches that failed
+    """
+    searches = load_saved_searches() if searches is None else searches
+    failed = 0
+    for search in searches:
+        started = time.monotonic()
+        try:
+            df = refresh_search(
+                location=search["location"],
+                keywords=search["keywords"],
+                fan_out=True
+            )
+        except Exception as e:
+            failed += 1
+            print(f"{describe(search)}: failed: {e}", flush=True)
+            continue
+        print(f"{describe(search)}: {len(df)} jobs in {time.monotonic() - started:.1f}s", flush=True)
+    return failed
+
+
+def watch(interval=WATCH_INTERVAL):
+    """
+    run the saved searches every interval seconds until interrupted
+
+    the saved searches are read again before every run, so searches saved
+    in the app are picked up without a restart.
+
+    :param interval: seconds between the starts of two runs
+    """
+    while True:
+        started = time.monotonic()
+        run_saved_searches()
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+def main(argv=None):
+    """
+    command line entry point
+
+    :param argv: arguments, defaults to sys.argv[1:]
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(description="Run saved job searches without the app window.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="save a search")
+    add.add_argument("keywords", nargs="+", help="keywords, quote keywords with spaces")
+    add.add_argument("--location", action="append", required=True, help="country to search in, repeat for several")
+
+    commands.add_parser("list", help="show the saved searches")
+
+    remove = commands.add_parser("remove", help="delete a saved search")
+    remove.add_argument("number", type=int, help="number shown by list")
+
+    run = commands.add_parser("run", help="refresh the saved searches on a schedule")
+    run.add_argument("--once", action="store_true", help="run every search once and exit")
+    run.add_argument(
+        "--interval",
+        type=int,
+        default=WATCH_INTERVAL,
+        help=f"seconds between runs (default {WATCH_INTERVAL})"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "add":
+        # one location is saved like before, several are searched side by side
+        location = args.location[0] if len(args.location) == 1 else args.location
+        save_search(args.keywords, location)
+    elif args.command == "list":
+        for number, search in enumerate(load_saved_searches(), start=1):
+            print(f"{number}. {describe(search)}")
+    elif args.command == "remove":
+        searches = load_saved_searches()
+        if not 1 <= args.number <= len(searches):
+            parser.error(f"no saved search number {args.number}")
+        remove_search(args.number - 1)
+    elif args.once:
+        return 1 if run_saved_searches() else 0
+    else:
+        try:
+            watch(args.interval)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
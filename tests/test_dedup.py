@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from career_finder_app.jobspymodule.dedup import _connected_components, deduplicate_jobs
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design and run the services behind "
+    "our payments platform, working with python, postgres and kubernetes in a small "
+    "team that owns its code from the first commit to production and on call"
+)
+
+
+def _jobs(*rows):
+    return pd.DataFrame(
+        [{"job_url": f"https://jobs.example/{i}", "company": company, "title": title,
+          "location": location, "description": description}
+         for i, (company, title, location, description) in enumerate(rows)]
+    )
+
+
+def test_same_posting_on_two_sites_is_merged():
+    jobs = _jobs(
+        ("Acme Inc.", "Backend Engineer", "Berlin", "short"),
+        ("ACME GmbH", "backend engineer!", "berlin", None),
+        ("Acme", "Backend Engineer", "Munich", "short"),
+    )
+
+    deduplicated = deduplicate_jobs(jobs)
+
+    assert deduplicated["location"].tolist() == ["Berlin", "Munich"]
+    assert deduplicated["source_urls"].tolist() == [
+        ["https://jobs.example/0", "https://jobs.example/1"],
+        ["https://jobs.example/2"],
+    ]
+
+
+def test_near_duplicate_descriptions_merge_only_within_a_company():
+    jobs = _jobs(
+        ("Acme", "Backend Engineer", "Berlin", DESCRIPTION),
+        ("Acme", "Senior Backend Engineer (m/f/d)", "Remote", DESCRIPTION + " duty"),
+        ("Globex", "Backend Engineer", "Berlin", DESCRIPTION),
+    )
+
+    deduplicated = deduplicate_jobs(jobs)
+
+    assert deduplicated["company"].tolist() == ["Acme", "Globex"]
+    assert len(deduplicated["source_urls"].iloc[0]) == 2
+
+
+def test_richest_copy_is_kept():
+    jobs = _jobs(
+        ("Acme", "Backend Engineer", "Berlin", "short"),
+        ("Acme", "Backend Engineer", "Berlin", "a much longer description"),
+        ("Acme", "Backend Engineer", "Berlin", "short"),
+    )
+    jobs.loc[2, "salary"] = 50000
+
+    deduplicated = deduplicate_jobs(jobs)
+
+    assert deduplicated["job_url"].tolist() == ["https://jobs.example/1"]
+    assert len(deduplicated["source_urls"].iloc[0]) == 3
+
+
+def test_rows_without_company_or_title_are_kept():
+    jobs = _jobs(
+        (None, "Backend Engineer", "Berlin", "short"),
+        (None, "Backend Engineer", "Berlin", "short"),
+        ("Acme", None, "Berlin", "short"),
+        ("Acme", None, "Berlin", "short"),
+    )
+
+    assert len(deduplicate_jobs(jobs)) == 4
+
+
+def test_empty_results_get_a_source_urls_column():
+    deduplicated = deduplicate_jobs(_jobs())
+
+    assert deduplicated.empty and "source_urls" in deduplicated
+
+
+def test_groups_are_joined_through_chains_of_pairs():
+    parent = np.array([0, 1, 1, 3, 4, 5])
+    pairs = np.array([[4, 5], [3, 4], [2, 3]])
+
+    assert _connected_components(parent, pairs).tolist() == [0, 1, 1, 1, 1, 1]
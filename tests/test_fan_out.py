@@ -0,0 +1,48 @@
+import pandas as pd
+
+from career_finder_app import jobspymodule
+from career_finder_app.jobspymodule import COLUMNS, SITE_TIMEOUTS, SITES, _get_jobs_fan_out, expand_queries
+
+
+def _fake_scrape(sites, location, keyword, results_wanted, offset, hours_old, deadline=None):
+    return pd.DataFrame([
+        dict.fromkeys(COLUMNS, None) | {
+            "site": sites[0],
+            "job_url": f"https://{sites[0]}/{keyword}",
+            "title": f"{keyword} developer",
+            "company": f"{sites[0]} {keyword}",
+            "location": location,
+        }
+    ])
+
+
+def _fan_out(monkeypatch, keywords, interval):
+    monkeypatch.setattr(jobspymodule, "_scrape", _fake_scrape)
+    monkeypatch.setattr(jobspymodule, "PROGRESS_INTERVAL", interval)
+    reports = []
+    jobs = _get_jobs_fan_out(
+        expand_queries(keywords, "Germany", SITES),
+        20,
+        0,
+        lambda site, merged: reports.append(len(merged)),
+        None,
+        SITE_TIMEOUTS,
+        dict.fromkeys(SITES, 72)
+    )
+    return jobs, reports
+
+
+def test_progress_is_throttled(monkeypatch):
+    jobs, reports = _fan_out(monkeypatch, ["python", "java"], interval=60)
+
+    # the first results at once, the rest only in the returned frame
+    assert reports == [1]
+    assert len(jobs) == 2 * len(SITES)
+
+
+def test_last_sub_query_is_not_reported(monkeypatch):
+    jobs, reports = _fan_out(monkeypatch, ["python"], interval=0)
+
+    assert len(reports) == len(SITES) - 1
+    assert reports == sorted(reports)
+    assert len(jobs) == len(SITES)
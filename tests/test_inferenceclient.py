@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from career_finder_app.aiintegration import inferenceclient
+from career_finder_app.aiintegration.inferenceclient import InferenceClient
+
+COMPLETION = {"choices": [{"message": {"content": "Dear hiring manager"}}]}
+
+
+class FakeServer:
+    def __init__(self, answers):
+        """
+        chat completions server answering with the given (status, headers, delay[, body]) in turn
+        """
+        self.answers = list(answers)
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                status, headers, delay, *body = server.answers[min(server.requests, len(server.answers) - 1)]
+                server.requests += 1
+                time.sleep(delay)
+                body = body[0] if body else json.dumps(COMPLETION if status == 200 else {"error": "busy"}).encode()
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except OSError:
+                    # the client gave up waiting
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1/chat/completions"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    # only the client's sleeps, the server's own delays still run
+    monkeypatch.setattr(inferenceclient, "time", SimpleNamespace(sleep=slept.append))
+    return slept
+
+
+def _serve(request, answers):
+    server = FakeServer(answers)
+    request.addfinalizer(server.close)
+    return server
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_transient_answers_are_retried(request, sleeps, status):
+    server = _serve(request, [(status, {}, 0), (status, {}, 0), (200, {}, 0)])
+    client = InferenceClient(server.url, "token", backoff=1, max_backoff=30)
+
+    assert client.chat({}) == COMPLETION
+    assert server.requests == 3
+    assert len(sleeps) == 2
+    # exponential backoff with jitter
+    assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2
+
+
+def test_retries_give_up(request, sleeps):
+    server = _serve(request, [(503, {}, 0)])
+    client = InferenceClient(server.url, "token", max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.chat({})
+    assert server.requests == 3
+
+
+def test_retry_after_is_waited_for_in_full(request, sleeps):
+    server = _serve(request, [(429, {"Retry-After": "90"}, 0), (200, {}, 0)])
+    client = InferenceClient(server.url, "token", max_backoff=30)
+
+    assert client.chat({}) == COMPLETION
+    assert sleeps == [90]
+
+
+def test_retry_after_beyond_the_ceiling_is_raised(request, sleeps):
+    server = _serve(request, [(429, {"Retry-After": "3600"}, 0), (200, {}, 0)])
+    client = InferenceClient(server.url, "token", max_retry_after=300)
+
+    with pytest.raises(requests.HTTPError) as error:
+        client.chat({})
+    assert error.value.response.status_code == 429
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_read_timeout_is_not_retried(request, sleeps):
+    server = _serve(request, [(200, {}, 0.5)])
+    client = InferenceClient(server.url, "token", read_timeout=0.1)
+
+    # the server may already be generating, a retry would run it twice
+    with pytest.raises(requests.ReadTimeout):
+        client.chat({})
+    assert server.requests == 1
+
+
+def _events(*chunks, finish_reason=None, done=True):
+    events = [
+        {"choices": [{"delta": {"content": chunk}, "finish_reason": None}]}
+        for chunk in chunks
+    ]
+    if finish_reason:
+        events.append({"choices": [{"delta": {}, "finish_reason": finish_reason}]})
+    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+    return (body + ("data: [DONE]\n\n" if done else "")).encode()
+
+
+@pytest.mark.parametrize("body, completed", [
+    (_events("Dear ", "team"), True),
+    (_events("Dear ", "team", finish_reason="stop", done=False), True),
+    # the connection ended in the middle of the letter
+    (_events("Dear ", "te", done=False), False),
+])
+def test_stream_is_only_completed_when_the_server_says_so(request, body, completed):
+    server = _serve(request, [(200, {"Content-Type": "text/event-stream"}, 0, body)])
+    stream = InferenceClient(server.url, "token").stream_chat({})
+
+    assert "".join(stream).startswith("Dear ")
+    assert stream.completed is completed
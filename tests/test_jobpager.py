@@ -0,0 +1,81 @@
+import pandas as pd
+
+from career_finder_app.jobspymodule.jobpager import JobPager
+
+
+def _batch(*numbers):
+    return pd.DataFrame({
+        "job_url": [f"https://jobs.example/{number}" for number in numbers],
+        "title": [f"Job {number}" for number in numbers],
+    })
+
+
+class FakeSearch:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+
+    def __call__(self, offset, results_wanted):
+        self.calls.append((offset, results_wanted))
+        return _batch(*range(offset, min(offset + results_wanted, self.total)))
+
+
+def _urls(page):
+    return [job["job_url"] for job in page]
+
+
+def test_pages_come_from_the_first_batch_before_scraping():
+    search = FakeSearch(total=100)
+    pager = JobPager(search, _batch(*range(5)), page_size=2, batch_size=5)
+
+    assert _urls(pager.next_page()) == ["https://jobs.example/0", "https://jobs.example/1"]
+    assert _urls(pager.next_page(3)) == [f"https://jobs.example/{n}" for n in range(2, 5)]
+    assert pager.next_page() == []
+    assert search.calls == []
+    assert len(pager.shown) == 5 and pager.has_more
+
+
+def test_fetch_more_continues_at_the_next_offset_and_skips_seen_jobs():
+    search = FakeSearch(total=100)
+    # the first batch already holds a job of the second one
+    pager = JobPager(search, _batch(0, 1, 2, 3, 5), page_size=10, batch_size=5)
+    pager.next_page()
+
+    assert pager.fetch_more() == 4
+    assert pager.fetch_more() == 5
+    assert search.calls == [(5, 5), (10, 5)]
+    assert _urls(pager.next_page()) == [f"https://jobs.example/{n}" for n in (6, 7, 8, 9, 10, 11, 12, 13, 14)]
+
+
+def test_empty_batch_ends_scraping():
+    search = FakeSearch(total=7)
+    pager = JobPager(search, _batch(*range(5)), batch_size=5)
+
+    assert pager.fetch_more() == 2
+    assert pager.fetch_more() == 0
+    assert not pager.can_fetch
+    assert pager.fetch_more() == 0
+    assert len(search.calls) == 2
+
+    pager.next_page(7)
+    assert not pager.has_more
+
+
+def test_no_scraping_past_max_results():
+    search = FakeSearch(total=1000)
+    pager = JobPager(search, _batch(*range(10)), batch_size=10, max_results=30)
+
+    while pager.fetch_more():
+        pass
+
+    assert search.calls == [(10, 10), (20, 10)]
+    assert pager.buffered == 30 and not pager.can_fetch
+
+
+def test_empty_first_batch_has_nothing_more():
+    search = FakeSearch(total=100)
+    pager = JobPager(search, _batch())
+
+    assert not pager.has_more
+    assert pager.fetch_more() == 0
+    assert search.calls == []
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from career_finder_app.jobspymodule import jobstore
+from career_finder_app.jobspymodule.jobstore import JobStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(jobstore, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(path=str(tmp_path / "jobs.sqlite3"))
+
+
+def _jobs(*rows, **columns):
+    df = pd.DataFrame(
+        [{"job_url": f"https://jobs.example/{number}", "site": "indeed", "title": title,
+          "company": company, "description": description}
+         for number, title, company, description in rows]
+    )
+    return df.assign(**columns)
+
+
+def test_upsert_reports_new_jobs_and_keeps_known_fields(store, clock):
+    new = store.upsert(_jobs((1, "Python Developer", "Acme", "Write services."), search_location="Berlin"))
+    clock[0] += 60
+    again = store.upsert(_jobs(
+        (1, "Senior Python Developer", "Acme", None),
+        (2, "Go Developer", "Initech", "Run clusters."),
+    ))
+
+    assert new == {"https://jobs.example/1"}
+    assert again == {"https://jobs.example/2"}
+    assert store.count() == 2
+
+    job = store.get("https://jobs.example/1")
+    # the new title wins, the missing description and location are kept
+    assert job["title"] == "Senior Python Developer"
+    assert job["description"] == "Write services."
+    assert job["search_location"] == "Berlin"
+    assert (job["first_seen"], job["last_seen"]) == (1000.0, 1060.0)
+
+
+def test_rows_without_url_are_skipped(store):
+    df = _jobs((1, "Python Developer", "Acme", "")).assign(job_url=[None])
+
+    assert store.upsert(df) == set()
+    assert store.count() == 0
+
+
+def test_search_ranks_title_matches_first(store):
+    store.upsert(_jobs(
+        (1, "Backend Developer", "Acme", "We use python every day."),
+        (2, "Python Developer", "Initech", "We build services."),
+        (3, "Sales Manager", "Globex", "Nothing technical."),
+    ))
+
+    found = store.search(["python"])
+
+    assert found["job_url"].tolist() == ["https://jobs.example/2", "https://jobs.example/1"]
+    # the search index is updated along with the rows
+    store.upsert(_jobs((3, "Python Sales Engineer", "Globex", None)))
+    assert len(store.search(["python"])) == 3
+
+
+def test_search_keywords_are_phrases_not_query_syntax(store):
+    store.upsert(_jobs(
+        (1, "C++ Developer", "Acme", "Modern C++ and embedded systems."),
+        (2, "Developer", "Initech", "Systems embedded in cars."),
+    ))
+
+    assert store.search(['embedded systems"', "NOT"])["job_url"].tolist() == ["https://jobs.example/1"]
+    assert store.search(["embedded systems"])["job_url"].tolist() == ["https://jobs.example/1"]
+
+
+def test_search_filters_and_falls_back_to_most_recent(store, clock):
+    store.upsert(_jobs((1, "Python Developer", "Acme", ""), search_location="Berlin"))
+    clock[0] += 60
+    store.upsert(_jobs((2, "Python Developer", "Initech", ""), search_location="Munich", site="linkedin"))
+
+    assert store.search()["job_url"].tolist() == ["https://jobs.example/2", "https://jobs.example/1"]
+    assert store.search(["python"], location="berlin")["job_url"].tolist() == ["https://jobs.example/1"]
+    assert store.search(["python"], location=["BERLIN", "munich"], site="linkedin")["company"].tolist() == ["Initech"]
+    assert store.search(["python"], since=1030.0)["company"].tolist() == ["Initech"]
+    assert len(store.search(["python"], limit=1)) == 1
+
+
+def test_record_fetch_reports_jobs_new_to_the_search(store):
+    key = JobStore.search_key(["Python", "Go"], "Berlin")
+    assert key == JobStore.search_key(["go", "python "], "berlin")
+    store.upsert(_jobs((1, "Python Developer", "Acme", ""), (2, "Go Developer", "Initech", "")))
+
+    first = store.record_fetch(key, ["indeed"], 1000.0, ["https://jobs.example/1"])
+    second = store.record_fetch(key, ["indeed", "linkedin"], 2000.0, ["https://jobs.example/1", "https://jobs.example/2"])
+
+    assert first == {"https://jobs.example/1"}
+    assert second == {"https://jobs.example/2"}
+    assert store.last_fetched(key) == {"indeed": 2000.0, "linkedin": 2000.0}
+    assert len(store.search_results(key)) == 2
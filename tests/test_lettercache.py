@@ -0,0 +1,55 @@
+from career_finder_app.aiintegration.lettercache import SharedStream
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.completed = False
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            yield chunk
+        self.completed = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_readers_share_one_stream():
+    opened = []
+    finished = []
+
+    def open_stream():
+        opened.append(FakeStream(["Dear ", "hiring ", "manager"]))
+        return opened[-1]
+
+    shared = SharedStream(open_stream, on_finish=lambda: finished.append(1))
+    first, second = shared.reader(), shared.reader()
+    first_chunks = iter(first)
+
+    assert next(first_chunks) == "Dear "
+    # the second reader starts at the first chunk
+    assert "".join(second) == "Dear hiring manager"
+    assert "".join(first_chunks) == "hiring manager"
+    assert len(opened) == 1
+    assert shared.completed and first.completed
+    assert finished == [1]
+
+
+def test_closing_every_reader_closes_the_stream():
+    stream = FakeStream(["Dear ", "hiring ", "manager"])
+    finished = []
+    shared = SharedStream(lambda: stream, on_finish=lambda: finished.append(1))
+    first, second = shared.reader(), shared.reader()
+
+    assert next(iter(first)) == "Dear "
+    first.close()
+    assert not stream.closed
+    second.close()
+
+    assert stream.closed
+    assert shared.finished and not shared.completed
+    assert finished == [1]
@@ -0,0 +1,65 @@
+import pytest
+
+from career_finder_app.aiintegration import huggingfaceinference
+from career_finder_app.aiintegration.backends import CoverLetterBackend, set_backend
+from career_finder_app.aiintegration.lettercache import CachedStream, LetterCache
+
+
+class FakeBackend(CoverLetterBackend):
+    model = "fake-model"
+
+    def __init__(self):
+        self.payloads = []
+
+    def complete(self, payload):
+        self.payloads.append(payload)
+        return f"letter {len(self.payloads)}"
+
+    def stream(self, payload):
+        return CachedStream(self.complete(payload))
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    cache = LetterCache(path=str(tmp_path / "letters.sqlite3"))
+    monkeypatch.setattr(huggingfaceinference, "default_letter_cache", lambda: cache)
+    fits = []
+
+    def fit_prompt(description, sample_coverletter, model, budget):
+        fits.append(description)
+        return description, sample_coverletter
+
+    monkeypatch.setattr(huggingfaceinference, "fit_prompt", fit_prompt)
+    backend = FakeBackend()
+    backend.fits = fits
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def test_cached_letter_skips_the_prompt(backend):
+    first = huggingfaceinference.get_modified_coverletter("Python developer", "Dear team")
+    again = huggingfaceinference.get_modified_coverletter("Python developer", "Dear team")
+    stream = huggingfaceinference.stream_modified_coverletter("Python developer", "Dear team")
+
+    assert first == again == "letter 1"
+    assert isinstance(stream, CachedStream)
+    # the tokenizer is only needed to build the prompt of a miss
+    assert backend.fits == ["Python developer"]
+
+
+def test_changed_request_is_a_miss(backend):
+    huggingfaceinference.get_modified_coverletter("Python developer", "Dear team")
+    huggingfaceinference.get_modified_coverletter("Python developer", "Dear hiring team")
+    huggingfaceinference.get_modified_coverletter("Python developer", "Dear team", regenerate=True)
+
+    assert len(backend.payloads) == 3
+
+
+def test_backend_must_implement_generation():
+    class Incomplete(CoverLetterBackend):
+        def complete(self, payload):
+            return ""
+
+    with pytest.raises(TypeError):
+        Incomplete()
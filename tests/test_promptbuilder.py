@@ -0,0 +1,94 @@
+import logging
+import sys
+
+import pytest
+
+from career_finder_app.aiintegration import promptbuilder
+from career_finder_app.aiintegration.promptbuilder import (
+    CHARS_PER_TOKEN,
+    LETTER_SHARE,
+    count_tokens,
+    fit_description,
+    fit_prompt,
+    truncate,
+)
+
+MODEL = "test/model"
+
+DESCRIPTION = """Acme builds payment software.
+
+## Responsibilities
+Design and run the backend services.
+
+## Requirements
+Five years of Python.
+
+## Benefits
+Free lunch and a gym membership.
+
+We are an equal opportunity employer."""
+
+
+@pytest.fixture(autouse=True)
+def no_tokenizer(monkeypatch):
+    # token counts are estimated from the length, as without transformers
+    monkeypatch.setattr(promptbuilder, "_tokenizers", {MODEL: None})
+
+
+def test_missing_tokenizer_is_logged_once_and_counts_are_estimated(monkeypatch, caplog):
+    monkeypatch.setattr(promptbuilder, "_tokenizers", {})
+    monkeypatch.setitem(sys.modules, "transformers", None)
+
+    with caplog.at_level(logging.WARNING, logger=promptbuilder.__name__):
+        counts = count_tokens(["abcd", "abcde", ""], MODEL)
+        count_tokens(["abcd"], MODEL)
+
+    assert counts == [1, 2, 0]
+    assert caplog.text.count(f"Tokenizer {MODEL} not available") == 1
+
+
+def test_truncate_cuts_at_a_word_boundary():
+    text = "one two three four five six"
+
+    cut = truncate(text, 4, MODEL)
+
+    assert cut == "one two three"
+    assert len(cut) <= 4 * CHARS_PER_TOKEN
+    assert truncate(text, 100, MODEL) == text
+    assert truncate(text, 0, MODEL) == ""
+
+
+def test_boilerplate_is_dropped_even_with_room_to_spare():
+    fitted = fit_description(DESCRIPTION, 1000, MODEL)
+
+    assert "Design and run" in fitted and "Five years" in fitted and "Acme builds" in fitted
+    assert "Free lunch" not in fitted and "equal opportunity" not in fitted
+
+
+def test_responsibilities_and_requirements_get_room_first():
+    budget = sum(count_tokens([
+        "## Responsibilities\nDesign and run the backend services.",
+        "## Requirements\nFive years of Python.",
+    ], MODEL))
+
+    fitted = fit_description(DESCRIPTION, budget, MODEL)
+
+    assert fitted.startswith("## Responsibilities")
+    assert "Five years of Python." in fitted
+    assert "Acme builds" not in fitted
+
+
+def test_long_sample_letter_is_cut_to_its_share():
+    letter = "word " * 1000
+
+    description, sample = fit_prompt(DESCRIPTION, letter, MODEL, budget=100)
+
+    assert count_tokens([sample], MODEL)[0] <= 100 * LETTER_SHARE
+    assert count_tokens([description], MODEL)[0] <= 100 - count_tokens([sample], MODEL)[0]
+    assert "Design and run" in description
+
+
+def test_short_sample_letter_is_kept_whole():
+    _, sample = fit_prompt(DESCRIPTION, "  Dear team, I write Python.  ", MODEL, budget=100)
+
+    assert sample == "Dear team, I write Python."
@@ -0,0 +1,74 @@
+import logging
+
+import pandas as pd
+
+from career_finder_app.jobspymodule import ranking
+from career_finder_app.jobspymodule.ranking import BM25Index, rank_jobs
+
+
+def _jobs(*rows):
+    return pd.DataFrame(
+        [{"job_url": f"https://jobs.example/{i}", "title": title, "description": description}
+         for i, (title, description) in enumerate(rows)]
+    )
+
+
+def test_title_match_outranks_description_match():
+    jobs = _jobs(
+        ("Backend Developer", "We use python every day."),
+        ("Python Developer", "We build services."),
+        ("Sales Manager", "Nothing technical."),
+    )
+
+    ranked = rank_jobs(jobs, ["python"])
+
+    assert ranked["title"].tolist() == ["Python Developer", "Backend Developer", "Sales Manager"]
+    assert ranked["score"].iloc[-1] == 0
+
+
+def test_rare_term_counts_more_than_a_common_one():
+    index = BM25Index(pd.Series(["python kubernetes", "python", "python", "python"]))
+
+    python = index.score(index.query_vector([("python", 1.0)]))
+    kubernetes = index.score(index.query_vector([("kubernetes", 1.0)]))
+
+    assert kubernetes[0] > python[0]
+
+
+def test_shorter_text_with_the_same_matches_ranks_higher():
+    index = BM25Index(pd.Series(["python", "python and many other words about the team"]))
+
+    score = index.score(index.query_vector([("Python!", 1.0)]))
+
+    assert score[0] > score[1] > 0
+
+
+def test_sample_letter_is_a_weak_hint():
+    jobs = _jobs(
+        ("Developer", "kubernetes kubernetes"),
+        ("Developer", "python"),
+    )
+
+    # the letter alone reorders ties, the keyword still wins over it
+    assert rank_jobs(jobs, ["python"], "I love kubernetes")["job_url"].iloc[0].endswith("/1")
+    assert rank_jobs(jobs, ["java"], "I love kubernetes")["job_url"].iloc[0].endswith("/0")
+
+
+def test_empty_results_get_a_score_column():
+    ranked = rank_jobs(_jobs(), ["python"])
+
+    assert ranked.empty and "score" in ranked
+
+
+def test_failing_rerank_keeps_the_bm25_order(monkeypatch, caplog):
+    def broken(*args):
+        raise RuntimeError("no model")
+
+    monkeypatch.setattr(ranking, "rerank", broken)
+    jobs = _jobs(("Sales", ""), ("Python Developer", ""))
+
+    with caplog.at_level(logging.ERROR, logger=ranking.__name__):
+        ranked = rank_jobs(jobs, ["python"], rerank_model="some-model")
+
+    assert ranked["title"].tolist() == ["Python Developer", "Sales"]
+    assert "Embedding rerank failed" in caplog.text
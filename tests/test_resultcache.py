@@ -0,0 +1,111 @@
+import threading
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from career_finder_app import diskcache
+from career_finder_app.jobspymodule import resultcache
+from career_finder_app.jobspymodule.resultcache import ResultCache, get_jobs_cached
+
+TTL = 60
+MAX_AGE = 600
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(diskcache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(path=str(tmp_path / "searches.sqlite3"), ttl=TTL, max_age=MAX_AGE)
+
+
+@pytest.fixture
+def scrapes(monkeypatch):
+    calls = []
+
+    def scrape(location, keywords, kwargs):
+        calls.append(kwargs)
+        return pd.DataFrame({"job_url": [f"https://jobs.example/{len(calls)}"]})
+
+    monkeypatch.setattr(resultcache, "_scrape", scrape)
+    return calls
+
+
+def _urls(df):
+    return df["job_url"].tolist()
+
+
+def test_results_are_fresh_then_stale_then_gone(cache, clock):
+    cache.store("key", pd.DataFrame({"job_url": ["https://jobs.example/1"]}))
+
+    clock[0] += TTL
+    df, fresh = cache.lookup("key")
+    assert fresh and _urls(df) == ["https://jobs.example/1"]
+
+    clock[0] += 1
+    assert cache.lookup("key")[1] is False
+
+    clock[0] += MAX_AGE
+    assert cache.lookup("key") is None
+    assert cache.lookup("other") is None
+
+
+def test_key_ignores_order_and_case():
+    assert ResultCache.make_key(["Python", "Go"], "Berlin") == ResultCache.make_key(["go ", "python"], "berlin")
+    assert ResultCache.make_key(["Python"], "Berlin") != ResultCache.make_key(["Python"], "Munich")
+    assert ResultCache.make_key(["Python"], "Berlin") != ResultCache.make_key(["Python"], "Berlin", results_wanted=5)
+
+
+def test_miss_scrapes_and_fresh_hit_does_not(cache, clock, scrapes):
+    first = get_jobs_cached("Berlin", ["python"], cache=cache)
+    clock[0] += TTL
+    again = get_jobs_cached("berlin", ["Python"], cache=cache)
+
+    assert _urls(first) == _urls(again) == ["https://jobs.example/1"]
+    assert len(scrapes) == 1
+
+
+def test_stale_hit_is_served_while_one_refresh_runs(cache, clock, scrapes):
+    get_jobs_cached("Berlin", ["python"], cache=cache)
+    clock[0] += TTL + 1
+
+    refreshed = []
+    done = threading.Event()
+
+    def on_refresh(df):
+        refreshed.append(_urls(df))
+        done.set()
+
+    stale = get_jobs_cached("Berlin", ["python"], cache=cache, on_refresh=on_refresh)
+    assert _urls(stale) == ["https://jobs.example/1"]
+    assert done.wait(5)
+
+    assert refreshed == [["https://jobs.example/2"]]
+    assert _urls(get_jobs_cached("Berlin", ["python"], cache=cache)) == ["https://jobs.example/2"]
+    assert len(scrapes) == 2
+
+
+def test_running_refresh_is_not_started_twice(cache, clock, scrapes):
+    get_jobs_cached("Berlin", ["python"], cache=cache)
+    clock[0] += TTL + 1
+    key = cache.make_key(["python"], "Berlin")
+    assert cache.start_refresh(key)
+
+    get_jobs_cached("Berlin", ["python"], cache=cache)
+
+    assert len(scrapes) == 1
+    cache.finish_refresh(key)
+    assert cache.start_refresh(key)
+
+
+def test_later_pages_are_not_cached(cache, clock, scrapes):
+    get_jobs_cached("Berlin", ["python"], cache=cache, offset=25)
+    get_jobs_cached("Berlin", ["python"], cache=cache, offset=25)
+
+    assert len(scrapes) == 2
+    assert cache.lookup(cache.make_key(["python"], "Berlin")) is None
@@ -0,0 +1,15 @@
+from career_finder_app.aiintegration.sampleletter import load_sample_letter, save_sample_letter
+
+
+def test_no_saved_letter_is_empty(tmp_path):
+    assert load_sample_letter(str(tmp_path / "sample_letter.txt")) == ""
+
+
+def test_saved_letter_survives_until_replaced(tmp_path):
+    path = str(tmp_path / "sample_letter.txt")
+    save_sample_letter("Dear team,\nI write Python.", path)
+    assert load_sample_letter(path) == "Dear team,\nI write Python."
+
+    save_sample_letter("Another letter", path)
+    assert load_sample_letter(path) == "Another letter"
+    assert [p.name for p in tmp_path.iterdir()] == ["sample_letter.txt"]
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from career_finder_app.jobspymodule.searchscheduler import SearchScheduler
+
+
+def _run(scheduler, tasks, **kwargs):
+    results, errors = {}, {}
+    started = time.monotonic()
+    scheduler.run(
+        tasks,
+        on_done=results.__setitem__,
+        on_error=errors.__setitem__,
+        **kwargs
+    )
+    return results, errors, time.monotonic() - started
+
+
+def test_results_and_errors_are_reported():
+    def fail():
+        raise ValueError("blocked")
+
+    results, errors, _ = _run(SearchScheduler(), [
+        ("a", "indeed", lambda: 1),
+        ("b", "linkedin", fail),
+    ])
+
+    assert results == {"a": 1}
+    assert isinstance(errors["b"], ValueError)
+
+
+def test_task_past_its_timeout_is_given_up_on():
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "late"
+
+    results, errors, took = _run(
+        SearchScheduler(),
+        [("slow", "linkedin", slow), ("fast", "indeed", lambda: "fast")],
+        timeouts={"linkedin": 0.1},
+        default_timeout=5
+    )
+    release.set()
+
+    assert results == {"fast": "fast"}
+    assert isinstance(errors["slow"], TimeoutError)
+    # not waiting for the slow scrape to finish
+    assert took < 1
+
+
+def test_given_up_task_frees_its_slot():
+    release = threading.Event()
+
+    results, errors, took = _run(
+        SearchScheduler(max_concurrency=1),
+        [("slow", "google", lambda: release.wait(5)), ("next", "indeed", lambda: "next")],
+        timeouts={"google": 0.1}
+    )
+    release.set()
+
+    assert list(errors) == ["slow"]
+    assert results == {"next": "next"}
+    assert took < 1
+
+
+def test_tasks_start_in_order_up_to_the_cap():
+    running = []
+    most = []
+    lock = threading.Lock()
+
+    def task(name):
+        with lock:
+            running.append(name)
+            most.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(name)
+        return name
+
+    results, _, _ = _run(
+        SearchScheduler(max_concurrency=2),
+        [(name, "indeed", lambda name=name: task(name)) for name in "abcde"]
+    )
+
+    assert sorted(results) == list("abcde")
+    assert max(most) == 2
@@ -0,0 +1,53 @@
+import json
+
+import pandas as pd
+import pytest
+
+from career_finder_app.service import FORMATS, read_jobs, write_jobs
+
+
+def _jobs():
+    return pd.DataFrame({
+        "title": ["Python Developer", "Data Engineer"],
+        "company": ["Acme", "Initech"],
+        "job_url": ["https://example.com/jobs/1", "https://example.com/jobs/2"],
+        "description": ["C:\\path/to\\thing", None],
+        "source_urls": [["https://a.example/1", "https://b.example/1"], None],
+    })
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_write_and_read_back(tmp_path, format):
+    if format == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"jobs.{format}"
+
+    write_jobs(_jobs(), str(path))
+    jobs = read_jobs(str(path))
+
+    assert [job["title"] for job in jobs] == ["Python Developer", "Data Engineer"]
+    assert jobs[0]["job_url"] == "https://example.com/jobs/1"
+    assert jobs[0]["description"] == "C:\\path/to\\thing"
+    assert jobs[0]["source_urls"] == "https://a.example/1 https://b.example/1"
+    assert jobs[1]["description"] is None
+
+
+def test_json_keeps_slashes_readable(tmp_path):
+    path = tmp_path / "jobs.json"
+
+    write_jobs(_jobs(), str(path))
+    text = path.read_text(encoding="utf-8")
+
+    assert "https://example.com/jobs/1" in text
+    assert json.loads(text)[0]["description"] == "C:\\path/to\\thing"
+
+
+def test_json_to_stdout(capsys):
+    write_jobs(_jobs(), "-")
+
+    assert json.loads(capsys.readouterr().out)[0]["company"] == "Acme"
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        write_jobs(_jobs(), "jobs.xlsx")
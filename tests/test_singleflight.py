@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from career_finder_app import singleflight
+from career_finder_app.singleflight import SingleFlight
+
+# every caller listens, so the leader can tell when all of them joined
+CALLERS = 4
+
+
+def _wait_for_callers(running, count=CALLERS):
+    deadline = time.monotonic() + 5
+    while len(running.listeners) < count:
+        assert time.monotonic() < deadline, "callers did not join"
+        time.sleep(0.001)
+
+
+def _call_concurrently(flight, function, listeners=None, **kwargs):
+    listeners = listeners or [lambda *event: None] * CALLERS
+    results = [None] * len(listeners)
+
+    def call(index):
+        try:
+            results[index] = flight.do("key", function, listener=listeners[index], **kwargs)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(listeners))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    calls = []
+
+    def function(running):
+        calls.append(1)
+        _wait_for_callers(running)
+        return ["result"]
+
+    results = _call_concurrently(flight, function, share=list)
+
+    assert len(calls) == 1
+    assert results == [["result"]] * CALLERS
+    # every caller got its own copy
+    assert len({id(result) for result in results}) == CALLERS
+    assert not flight.in_flight("key")
+
+
+def test_exception_reaches_every_caller():
+    flight = SingleFlight("test")
+
+    def function(running):
+        _wait_for_callers(running)
+        raise RuntimeError("site down")
+
+    results = _call_concurrently(flight, function)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not flight.in_flight("key")
+    # a later call runs again
+    assert flight.do("key", lambda running: "again") == "again"
+
+
+def test_joined_callers_get_earlier_and_later_events():
+    flight = SingleFlight("test")
+    events = [[], []]
+
+    def function(running):
+        running.publish("error", "linkedin")
+        running.publish("result", 1, slot="result")
+        running.publish("result", 2, slot="result")
+        _wait_for_callers(running, 2)
+        running.publish("result", 3, slot="result")
+        return "done"
+
+    leader = threading.Thread(
+        target=flight.do, args=("key", function), kwargs={"listener": lambda *event: events[0].append(event)}
+    )
+    leader.start()
+    # join once the leader published its first events
+    while len(events[0]) < 3:
+        time.sleep(0.001)
+    assert flight.do("key", function, listener=lambda *event: events[1].append(event)) == "done"
+    leader.join(5)
+
+    assert events[0] == [("error", "linkedin"), ("result", 1), ("result", 2), ("result", 3)]
+    # only the last event of a slot is replayed
+    assert events[1] == [("error", "linkedin"), ("result", 2), ("result", 3)]
+
+
+def test_failing_joined_listener_does_not_stop_the_call(caplog):
+    flight = SingleFlight("test")
+    results = []
+
+    def function(running):
+        _wait_for_callers(running, 2)
+        running.publish("result", 1)
+        return "done"
+
+    def broken(*event):
+        raise ValueError("broken listener")
+
+    leader = threading.Thread(
+        target=lambda: results.append(flight.do("key", function, listener=lambda *event: None))
+    )
+    leader.start()
+    while not flight.in_flight("key"):
+        time.sleep(0.001)
+    with caplog.at_level(logging.ERROR, logger=singleflight.__name__):
+        results.append(flight.do("key", function, listener=broken))
+    leader.join(5)
+
+    assert results == ["done", "done"]
+    assert "Listener of a joined call failed" in caplog.text
+    assert "broken listener" in caplog.text
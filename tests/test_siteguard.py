@@ -0,0 +1,67 @@
+import logging
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from career_finder_app.jobspymodule.siteguard import CLOSED, SiteGuard, SiteUnavailable
+
+
+def test_errors_of_concurrent_scrapes_stay_apart(tmp_path):
+    guard = SiteGuard(path=str(tmp_path / "site_health.json"), rates={"indeed": (100, 10)})
+    logged = threading.Event()
+
+    def failing(sites):
+        # jobspy logs from its own worker threads
+        worker = threading.Thread(target=logging.getLogger("JobSpy:Indeed").error, args=("Indeed: 500 error",))
+        worker.start()
+        worker.join()
+        logged.set()
+        time.sleep(0.05)
+        return pd.DataFrame()
+
+    def no_jobs(sites):
+        return pd.DataFrame()
+
+    thread = threading.Thread(target=guard.call, args=(["indeed"], failing))
+    thread.start()
+    logged.wait(5)
+    # a search without results that logged nothing itself went through
+    guard.call(["indeed"], no_jobs)
+    thread.join(5)
+
+    assert guard._breaker("indeed").failures == 0
+    assert guard.status("indeed")[0] == CLOSED
+
+
+def test_scrape_given_up_on_is_not_sent(tmp_path):
+    guard = SiteGuard(path=str(tmp_path / "site_health.json"), rates={"linkedin": (100, 10)})
+    started = threading.Event()
+    calls = []
+
+    def slow(sites):
+        started.set()
+        time.sleep(0.5)
+        return pd.DataFrame({"site": ["linkedin"]})
+
+    def scrape(sites):
+        calls.append(sites)
+        return pd.DataFrame({"site": ["linkedin"]})
+
+    thread = threading.Thread(target=guard.call, args=(["linkedin"], slow))
+    thread.start()
+    started.wait(5)
+
+    waited = time.monotonic()
+    with pytest.raises(SiteUnavailable):
+        guard.call(["linkedin"], scrape, deadline=time.monotonic() + 0.1)
+    assert time.monotonic() - waited < 0.4
+    thread.join(5)
+
+    with pytest.raises(SiteUnavailable):
+        guard.call(["linkedin"], scrape, deadline=time.monotonic() - 1)
+    assert calls == []
+    # giving up is not the site's fault
+    assert guard.status("linkedin")[0] == CLOSED
+    assert guard.call(["linkedin"], scrape, deadline=time.monotonic() + 1).shape == (1, 1)